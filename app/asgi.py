@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+# Under ASGI the views that wait on upstream APIs run async unless ASYNC_VIEWS=false
+# (or httpx is not installed, see collectibles/urls.py)
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
@@ -1,6 +1,17 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-from .models import ArxivPaper, GithubRepo, Link, TwitterPost, YouTubeVideo
+from .models import (
+    ArxivPaper,
+    ChangeLogEntry,
+    CollectionCount,
+    FetchJob,
+    GithubRepo,
+    Link,
+    ReplicationState,
+    TwitterPost,
+    YouTubeVideo,
+)
+from .refresh import refresh_github_repos, resync_arxiv_papers, resync_twitter_posts
 
 
 # Register your models here.
@@ -15,17 +26,33 @@ class TwitterPostAdmin(admin.ModelAdmin):
     list_display = ("author_name", "author_handle", "post_id", "text_preview")
     search_fields = ("author_name", "author_handle", "text", "post_id")
     list_filter = ("author_handle",)
+    actions = ("resync_from_twitter",)
 
     def text_preview(self, obj):
         return obj.text[:50] + "..." if len(obj.text) > 50 else obj.text
 
     text_preview.short_description = "Text Preview"
 
+    @admin.action(description="Resync selected posts from X/Twitter")
+    def resync_from_twitter(self, request, queryset):
+        updated, missing = resync_twitter_posts(queryset)
+        self.message_user(request, f"Resynced {updated} post(s) from X/Twitter")
+        if missing:
+            self.message_user(request, f"{missing} post(s) could not be fetched", messages.WARNING)
+
 
 @admin.register(ArxivPaper)
 class ArxivPaperAdmin(admin.ModelAdmin):
     list_display = ("arxiv_id", "title", "authors")
     search_fields = ("arxiv_id", "title", "authors")
+    actions = ("resync_from_arxiv",)
+
+    @admin.action(description="Resync selected papers from arXiv")
+    def resync_from_arxiv(self, request, queryset):
+        updated, missing = resync_arxiv_papers(queryset)
+        self.message_user(request, f"Resynced {updated} paper(s) from arXiv")
+        if missing:
+            self.message_user(request, f"{missing} paper(s) were not returned by arXiv", messages.WARNING)
 
 
 @admin.register(GithubRepo)
@@ -33,6 +60,14 @@ class GithubRepoAdmin(admin.ModelAdmin):
     list_display = ("full_name", "stars", "language")
     search_fields = ("full_name", "language")
     list_filter = ("language",)
+    actions = ("refresh_from_github",)
+
+    @admin.action(description="Refresh selected repositories from GitHub")
+    def refresh_from_github(self, request, queryset):
+        updated, missing = refresh_github_repos(queryset)
+        self.message_user(request, f"Refreshed {updated} repositor{'y' if updated == 1 else 'ies'} from GitHub")
+        if missing:
+            self.message_user(request, f"{missing} repositories could not be fetched", messages.WARNING)
 
 
 @admin.register(Link)
@@ -40,3 +75,27 @@ class LinkAdmin(admin.ModelAdmin):
     list_display = ("title", "url", "tags")
     search_fields = ("title", "url", "description", "tags")
     list_filter = ("tags",)
+
+
+@admin.register(FetchJob)
+class FetchJobAdmin(admin.ModelAdmin):
+    list_display = ("collection_type", "object_id", "status", "attempts", "run_after", "locked_by")
+    list_filter = ("status", "collection_type")
+    search_fields = ("object_id", "last_error")
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "collection_type", "object_id", "action", "created_at")
+    list_filter = ("action", "collection_type")
+
+
+@admin.register(ReplicationState)
+class ReplicationStateAdmin(admin.ModelAdmin):
+    list_display = ("source", "last_seq", "updated_at")
+
+
+@admin.register(CollectionCount)
+class CollectionCountAdmin(admin.ModelAdmin):
+    list_display = ("collection_type", "count")
+    readonly_fields = ("collection_type", "count")
@@ -0,0 +1,206 @@
+"""JSON API for reading and bulk-creating collectibles.
+
+``GET /api/<type>`` lists items newest-first with cursor pagination
+(``?after=<id>``), or oldest-first from ``?since_id=<id>`` for incremental
+sync. ``?fields=a,b`` restricts both the response and the SELECT to those
+columns. Rows are serialized straight from ``values()``, without building
+model instances.
+
+``POST /api/<type>`` creates one item or a list of items. Writes are only
+enabled when ``API_TOKEN`` is set, and must send it as a Bearer token.
+"""
+
+import json
+import secrets
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from .jobs import enqueue_fetches
+from .models import COLLECTION_MODELS, DEDUPE_COLUMNS, NATURAL_KEYS, ChangeLogEntry, FetchStatus, duplicates_filter
+from .signals import collection_changed
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_CREATE_ITEMS = 1000
+
+# Internal bookkeeping and derived lookup columns, never exposed or accepted
+HIDDEN_FIELDS = {"http_validators", "last_fetched_at", "full_name_normalized", "url_hash"}
+READ_ONLY_FIELDS = {"id", "fetch_status", "created_at", "updated_at"}
+
+
+def api_fields(model):
+    return [field.name for field in model._meta.concrete_fields if field.name not in HIDDEN_FIELDS]
+
+
+def writable_fields(model):
+    return [name for name in api_fields(model) if name not in READ_ONLY_FIELDS]
+
+
+def error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def parse_int(value, default=None, minimum=0):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number >= minimum else default
+
+
+def parse_fields(value, model):
+    """Parse ``?fields=``; returns ``(fields, unknown)``. ``id`` is always included."""
+    available = api_fields(model)
+    if not value:
+        return available, []
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in available]
+    return ["id", *(name for name in dict.fromkeys(requested) if name != "id")], unknown
+
+
+def authorized_for_writes(request):
+    token = settings.API_TOKEN
+    if not token:
+        return False
+    scheme, _, provided = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and secrets.compare_digest(provided.strip(), token)
+
+
+@require_GET
+def api_index(request):
+    return JsonResponse(
+        {
+            collection_type: request.build_absolute_uri(reverse("api_collection", args=[collection_type]))
+            for collection_type in COLLECTION_MODELS
+        }
+    )
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def api_collection(request, collection_type):
+    model = COLLECTION_MODELS.get(collection_type)
+    if model is None:
+        return error(f"Unknown collection type: {collection_type}", status=404)
+    if request.method == "POST":
+        return create_items(request, collection_type, model)
+    return list_items(request, collection_type, model)
+
+
+def list_items(request, collection_type, model):
+    fields, unknown = parse_fields(request.GET.get("fields"), model)
+    if unknown:
+        return error(f"Unknown field(s): {', '.join(unknown)}")
+    page_size = min(parse_int(request.GET.get("page_size"), DEFAULT_PAGE_SIZE, minimum=1), MAX_PAGE_SIZE)
+
+    queryset = model.objects.values(*fields)
+    since_id = parse_int(request.GET.get("since_id"))
+    if since_id is not None:
+        # Incremental sync: everything added after since_id, oldest first
+        rows = list(queryset.filter(id__gt=since_id).order_by("id")[: page_size + 1])
+        cursor_param = "since_id"
+    else:
+        after = parse_int(request.GET.get("after"), minimum=1)
+        if after is not None:
+            queryset = queryset.filter(id__lt=after)
+        rows = list(queryset.order_by("-id")[: page_size + 1])
+        cursor_param = "after"
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = rows[-1]["id"] if has_more else None
+    next_url = None
+    if next_cursor is not None:
+        params = request.GET.copy()
+        params.pop("after", None)
+        params.pop("since_id", None)
+        params[cursor_param] = next_cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+    return JsonResponse({"type": collection_type, "results": rows, "next_cursor": next_cursor, "next": next_url})
+
+
+@require_GET
+def api_item(request, collection_type, item_id):
+    model = COLLECTION_MODELS.get(collection_type)
+    if model is None:
+        return error(f"Unknown collection type: {collection_type}", status=404)
+    fields, unknown = parse_fields(request.GET.get("fields"), model)
+    if unknown:
+        return error(f"Unknown field(s): {', '.join(unknown)}")
+    row = model.objects.filter(id=item_id).values(*fields).first()
+    if row is None:
+        return error("Not found", status=404)
+    return JsonResponse(row)
+
+
+def create_items(request, collection_type, model):
+    """Bulk-create items from a JSON object or list of objects.
+
+    Items whose natural key already exists are skipped. With ``?fetch=1`` the
+    new items are saved as pending and their metadata fetches are queued.
+    """
+    if not authorized_for_writes(request):
+        return error("Writes need API_TOKEN to be configured and sent as a Bearer token", status=403)
+    try:
+        payload = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return error("Request body must be JSON")
+    entries = payload if isinstance(payload, list) else [payload]
+    if len(entries) > MAX_CREATE_ITEMS:
+        return error(f"At most {MAX_CREATE_ITEMS} items per request")
+
+    key_field = NATURAL_KEYS[collection_type]
+    column, normalize = DEDUPE_COLUMNS[collection_type]
+    allowed = set(writable_fields(model))
+    fetch = request.GET.get("fetch") in ("1", "true")
+    items, errors, seen = [], [], set()
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({"index": index, "error": "Expected an object"})
+            continue
+        unknown = sorted(set(entry) - allowed)
+        if unknown:
+            errors.append({"index": index, "error": f"Unknown or read-only field(s): {', '.join(unknown)}"})
+            continue
+        item = model(**entry)
+        if fetch:
+            item.fetch_status = FetchStatus.PENDING
+        try:
+            # Uniqueness is enforced by bulk_create(ignore_conflicts=True) below
+            item.full_clean(validate_unique=False)
+        except ValidationError as exc:
+            errors.append({"index": index, "error": exc.message_dict})
+            continue
+        key = normalize(getattr(item, key_field))
+        if key not in seen:
+            seen.add(key)
+            items.append(item)
+
+    keys = [getattr(item, key_field) for item in items]
+    existing = set(model.objects.filter(**duplicates_filter(collection_type, keys)).values_list(column, flat=True))
+    new_items = [item for item in items if normalize(getattr(item, key_field)) not in existing]
+    model.objects.bulk_create(new_items, ignore_conflicts=True, batch_size=500)
+    created = model.objects.filter(
+        **duplicates_filter(collection_type, [getattr(item, key_field) for item in new_items])
+    )
+    created_ids = list(created.order_by("id").values_list("id", flat=True))
+    collection_changed.send(sender=model, ids=created_ids, action=ChangeLogEntry.Action.CREATE)
+    if fetch:
+        enqueue_fetches(collection_type, created_ids)
+
+    status = 201 if created_ids else 200
+    return JsonResponse(
+        {
+            "created": len(created_ids),
+            "ids": created_ids,
+            "duplicates": len(entries) - len(errors) - len(new_items),
+            "errors": errors,
+        },
+        status=status,
+    )
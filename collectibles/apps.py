@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CollectiblesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "collectibles"
+
+    def ready(self):
+        from . import signals
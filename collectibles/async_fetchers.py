@@ -0,0 +1,167 @@
+"""Async versions of the single-item fetchers and refreshers, for ``async_views``.
+
+Each fetcher sends the same request as its ``fetchers.py`` namesake through
+``async_http_client`` and hands the response to the same parser, so results,
+response caching and negative caching are identical. Concurrent first
+fetches of one item are coalesced with ``single_flight.acoalesced``.
+
+The response cache is read and written directly from the event loop; its
+SQLite lookups take well under a millisecond.
+"""
+
+import os
+
+import httpx
+
+from . import async_http_client, response_cache
+from .fetchers import (
+    ARXIV_API_URL,
+    GITHUB_REPO_URL,
+    LINK_HEADERS,
+    NOT_MODIFIED,
+    READ_PAGE,
+    TWITTER_TWEETS_URL,
+    YOUTUBE_OEMBED_URL,
+    arxiv_request,
+    check_link_response,
+    check_tweets_response,
+    conditional_headers,
+    github_headers,
+    parse_arxiv_response,
+    parse_link_page,
+    parse_repo_info,
+    parse_tweet,
+    parse_video_title,
+    tweets_request,
+)
+from .html_meta import aread_page_metadata
+from .refresh import apply_link, apply_paper, apply_post, apply_repo, apply_video, repo_ref
+from .single_flight import acoalesced
+
+
+@acoalesced("youtube", lambda args: args["video_id"])
+async def aget_video_title(video_id, validators=None, *, bypass_cache=False):
+    """Async ``fetchers.get_video_title``."""
+    cached = response_cache.lookup("youtube", video_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        url = YOUTUBE_OEMBED_URL.format(video_id=video_id)
+        print(f"Fetching video title from: {url}")
+        response = await async_http_client.get("youtube", url, headers=conditional_headers(validators), timeout=5)
+        return parse_video_title(response, video_id, validators)
+    except httpx.HTTPError as exc:
+        print(f"Network error fetching video title: {exc}")
+    except Exception as exc:
+        print(f"Unexpected error in aget_video_title: {exc}")
+    return None
+
+
+@acoalesced("twitter", lambda args: args["post_id"])
+async def aget_tweet_info(post_id, author_handle, validators=None, *, bypass_cache=False):
+    """Async ``fetchers.get_tweet_info``."""
+    bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
+    if not bearer_token:
+        return None
+    cached = response_cache.lookup("twitter", post_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        params, headers = tweets_request([post_id], bearer_token)
+        response = await async_http_client.get(
+            "twitter", TWITTER_TWEETS_URL, params=params, headers=headers, timeout=10
+        )
+        if check_tweets_response(response, 1) is None:
+            return None
+        return parse_tweet(response, post_id, author_handle, validators)
+    except httpx.HTTPError as exc:
+        print(f"Network error fetching tweet info: {exc}")
+    except Exception as exc:
+        print(f"Error fetching tweet info: {exc}")
+    return None
+
+
+@acoalesced("arxiv", lambda args: args["arxiv_id"])
+async def afetch_arxiv_metadata(arxiv_id, validators=None, *, bypass_cache=False):
+    """Async ``fetchers.fetch_arxiv_metadata``."""
+    cached = response_cache.lookup("arxiv", arxiv_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        params, headers = arxiv_request([arxiv_id], validators)
+        response = await async_http_client.get("arxiv", ARXIV_API_URL, params=params, headers=headers, timeout=30)
+        results = parse_arxiv_response(response, [arxiv_id], validators)
+    except httpx.HTTPError as exc:
+        print(f"❌ Network error fetching arXiv metadata: {exc}")
+        return None
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching arXiv metadata: {exc}")
+        return None
+    if results is NOT_MODIFIED:
+        return NOT_MODIFIED
+    return results.get(arxiv_id)
+
+
+@acoalesced("github", lambda args: f"{args['owner']}/{args['repo']}".lower())
+async def afetch_github_repo_info(owner, repo, validators=None, *, bypass_cache=False):
+    """Async ``fetchers.fetch_github_repo_info``."""
+    cached = response_cache.lookup("github", f"{owner}/{repo}".lower(), validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        api_url = GITHUB_REPO_URL.format(owner=owner, repo=repo)
+        print(f"Fetching GitHub repo info from: {api_url}")
+        response = await async_http_client.get("github", api_url, headers=github_headers(validators), timeout=10)
+        return parse_repo_info(response, owner, repo, validators)
+    except httpx.HTTPError as exc:
+        print(f"❌ Network error fetching GitHub repo info: {exc}")
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching GitHub repo info: {exc}")
+    return None
+
+
+@acoalesced("links", lambda args: args["url"])
+async def afetch_link_metadata(url, validators=None, *, bypass_cache=False):
+    """Async ``fetchers.fetch_link_metadata``."""
+    cached = response_cache.lookup("links", url, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        headers = {**LINK_HEADERS, **conditional_headers(validators)}
+        print(f"Fetching link metadata from: {url}")
+        response = await async_http_client.get("links", url, headers=headers, timeout=10, stream=True)
+        try:
+            result = check_link_response(response, url, validators)
+            if result is not READ_PAGE:
+                return result
+            page = await aread_page_metadata(response)
+        finally:
+            await response.aclose()
+        return parse_link_page(response, url, validators, *page)
+    except httpx.HTTPError as exc:
+        print(f"❌ Network error fetching link metadata: {exc}")
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching link metadata: {exc}")
+    return None
+
+
+async def arefresh_item(collection_type, item, *, bypass_cache=False):
+    """Async ``refresh.refresh_item``; unexpected errors count as a failed fetch."""
+    validators = item.http_validators
+    try:
+        if collection_type == "youtube":
+            return apply_video(item, await aget_video_title(item.video_id, validators, bypass_cache=bypass_cache))
+        if collection_type == "twitter":
+            post_info = await aget_tweet_info(item.post_id, item.author_handle, validators, bypass_cache=bypass_cache)
+            return apply_post(item, post_info)
+        if collection_type == "arxiv":
+            return apply_paper(item, await afetch_arxiv_metadata(item.arxiv_id, validators, bypass_cache=bypass_cache))
+        if collection_type == "github":
+            ref = repo_ref(item)
+            return bool(ref) and apply_repo(
+                item, await afetch_github_repo_info(*ref, validators, bypass_cache=bypass_cache)
+            )
+        return apply_link(item, await afetch_link_metadata(item.url, validators, bypass_cache=bypass_cache))
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching {collection_type} metadata: {exc}")
+        return False
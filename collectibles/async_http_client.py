@@ -0,0 +1,113 @@
+"""Async counterpart of ``http_client`` for the async views, built on ``httpx``.
+
+``get``/``post`` behave like their ``http_client`` namesakes, but waiting for
+the upstream or for a rate limit suspends the coroutine instead of blocking a
+thread:
+
+* each provider has one pooled ``httpx.AsyncClient`` per event loop, so
+  requests to the same host reuse keep-alive connections;
+* rate limits use the token buckets of ``http_client``, so sync workers and
+  async views in one process share each provider's budget; concurrency is
+  capped per provider (per host for links) with an ``asyncio.Semaphore``;
+* 429/5xx responses and connection errors are retried with the same
+  ``retry_delay`` policy;
+* inside an ``http_client.max_wait`` block, waits longer than it allows
+  raise ``RateLimited`` the same way.
+
+Keyword arguments are those of ``requests``, so redirects are followed
+unless ``allow_redirects=False``. With ``stream=True`` the body is not read
+and the caller must ``await response.aclose()``.
+"""
+
+import asyncio
+import ssl
+import weakref
+from urllib.parse import urlparse
+
+import httpx
+
+from .http_client import POOL_HOSTS, RETRY_MAX_SECONDS, RETRY_STATUSES, current_wait_limit, get_provider, retry_delay
+
+
+class AsyncProvider:
+    def __init__(self, provider):
+        self.provider = provider
+        self.client = httpx.AsyncClient(
+            verify=provider.verify_ssl,
+            limits=httpx.Limits(max_keepalive_connections=POOL_HOSTS * provider.concurrency),
+        )
+        self._slots = {}
+
+    def slots(self, url):
+        key = urlparse(url).netloc.lower() if self.provider.per_host else ""
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(max(1, self.provider.concurrency))
+        return self._slots[key]
+
+    async def request(self, method, url, *, stream=False, allow_redirects=True, **kwargs):
+        limiter = self.provider.limiter(url)
+        limit = current_wait_limit()
+        slots = self.slots(url)
+        attempt = 0
+        while True:
+            # Wait for the rate limit before taking a slot, so waiting does not hold one
+            await asyncio.sleep(self.provider.reserve(limiter))
+            try:
+                await asyncio.wait_for(slots.acquire(), None if limit is None else limit.seconds)
+            except TimeoutError:
+                raise limit.refuse(self.provider.label, limit.seconds) from None
+            try:
+                request = self.client.build_request(method, url, **kwargs)
+                response = await self.client.send(request, stream=stream, follow_redirects=allow_redirects)
+            except (httpx.ConnectError, httpx.TimeoutException) as exc:
+                if _is_ssl_error(exc) or attempt >= self.provider.max_retries:
+                    raise
+                response = None
+            finally:
+                slots.release()
+
+            if response is not None and (
+                response.status_code not in RETRY_STATUSES or attempt >= self.provider.max_retries
+            ):
+                return response
+
+            delay = retry_delay(response, attempt)
+            if delay is None or (limit is not None and delay > limit.seconds):
+                # Upstream asked us to wait longer than a retry (or the caller) allows; let the caller handle it
+                if limit is not None and response is not None and response.status_code == 429:
+                    limit.refuse(self.provider.label, delay or RETRY_MAX_SECONDS)
+                return response
+            status = "connection error"
+            if response is not None:
+                status = response.status_code
+                await response.aclose()
+            print(f"⚠️ {self.provider.name} request got {status}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def _is_ssl_error(exc):
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+# Event loop -> provider name -> AsyncProvider; httpx clients cannot be shared between loops
+_providers = weakref.WeakKeyDictionary()
+
+
+def get_async_provider(name):
+    providers = _providers.setdefault(asyncio.get_running_loop(), {})
+    if name not in providers:
+        providers[name] = AsyncProvider(get_provider(name))
+    return providers[name]
+
+
+async def get(provider, url, **kwargs):
+    return await get_async_provider(provider).request("GET", url, **kwargs)
+
+
+async def post(provider, url, **kwargs):
+    return await get_async_provider(provider).request("POST", url, **kwargs)
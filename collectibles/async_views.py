@@ -0,0 +1,387 @@
+"""Async versions of the views that wait on upstream APIs, for serving under ASGI.
+
+With ``settings.ASYNC_VIEWS`` (on by default in ``app/asgi.py``) ``urls.py``
+routes the collection pages, the add form and the resync buttons here. While
+an add or resync waits for YouTube, X, arXiv, GitHub or a website, the view
+is suspended on the event loop instead of holding a thread, so one worker
+can keep hundreds of such requests in flight. Lookups and inserts use the
+async ORM; saving refreshed items, queueing jobs and rendering templates are
+short local work and run through ``sync_to_async``.
+
+Behaviour and messages match the sync views in ``views.py``.
+"""
+
+from urllib.parse import urlparse
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect, render
+from django.utils.cache import get_conditional_response
+
+from .async_fetchers import (
+    afetch_arxiv_metadata,
+    afetch_github_repo_info,
+    afetch_link_metadata,
+    aget_tweet_info,
+    aget_video_title,
+    arefresh_item,
+)
+from .fetchers import (
+    canonical_link_url,
+    extract_arxiv_id,
+    extract_github_repo_ref,
+    extract_tweet_id_and_handle,
+    extract_video_id,
+    normalize_link_url,
+)
+from .jobs import enqueue_fetch
+from .models import (
+    COLLECTION_MODELS,
+    ArxivPaper,
+    FetchStatus,
+    GithubRepo,
+    Link,
+    TwitterPost,
+    YouTubeVideo,
+    acreate_unique,
+    url_hash,
+)
+from .pagination import parse_cursor, parse_page_size
+from .refresh import repo_fields, save_refreshed
+from .render_cache import acollection_state, arender_page, page_etag
+from .views import (
+    COLLECTION_METADATA,
+    COLLECTION_OPTIONS,
+    COLLECTION_TYPES,
+    already_added,
+    interactive_fetch,
+    set_page_validators,
+    state_last_modified,
+)
+
+
+def has_messages(request):
+    # Reading the message storage may load the session, which needs the sync ORM
+    return bool(len(messages.get_messages(request)))
+
+
+@interactive_fetch
+async def collections_list(request, collection_type="youtube"):
+    """Async ``views.collections_list``."""
+    if collection_type not in COLLECTION_TYPES:
+        return redirect("collections_list", collection_type="youtube")
+
+    if request.method == "POST":
+        return await ADD_HANDLERS[collection_type](request)
+
+    # Pages showing flash messages must not be revalidated into a cached copy
+    state = await acollection_state(collection_type)
+    etag = None if await sync_to_async(has_messages)(request) else page_etag(request, collection_type, state)
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag, last_modified=state_last_modified(state))
+        if not_modified is not None:
+            return not_modified
+
+    page_size = parse_page_size(request.GET.get("page_size"))
+    page = await arender_page(
+        request,
+        collection_type,
+        after=parse_cursor(request.GET.get("after")),
+        before=parse_cursor(request.GET.get("before")),
+        page_size=page_size,
+        state=state,
+    )
+
+    context = {
+        "collection_type": collection_type,
+        "items_html": page["items_html"],
+        "total_count": page["total_count"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
+        "page_size": page_size,
+        "collection_types": COLLECTION_TYPES,
+        "collection_metadata": COLLECTION_METADATA,
+        "collection_options": COLLECTION_OPTIONS,
+        "current_meta": COLLECTION_METADATA[collection_type],
+    }
+    response = await sync_to_async(render)(request, "collectibles/collections_list.html", context)
+    if etag:
+        set_page_validators(response, etag, state)
+    return response
+
+
+async def queue_placeholder(request, collection_type, **fields):
+    """Async ``views.queue_placeholder``."""
+    item, created = await acreate_unique(collection_type, fetch_status=FetchStatus.PENDING, **fields)
+    if not created:
+        return already_added(request, collection_type)
+    await sync_to_async(enqueue_fetch)(item)
+    item_label = COLLECTION_METADATA[collection_type]["item_label"]
+    messages.success(request, f"Added {item_label} - fetching details in the background")
+    return redirect("collections_list", collection_type=collection_type)
+
+
+async def handle_youtube_add(request):
+    video_url = request.POST.get("item_url", "").strip()
+    if not video_url:
+        messages.error(request, "Please enter a YouTube URL")
+        return redirect("collections_list", collection_type="youtube")
+
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        messages.error(request, "Invalid YouTube URL")
+        return redirect("collections_list", collection_type="youtube")
+
+    if await YouTubeVideo.objects.filter(video_id=video_id).aexists():
+        return already_added(request, "youtube")
+
+    if settings.ASYNC_FETCH:
+        return await queue_placeholder(request, "youtube", video_id=video_id, title=video_id)
+
+    validators = {}
+    title = await aget_video_title(video_id, validators)
+    if not title:
+        messages.error(request, "Could not fetch video information")
+        return redirect("collections_list", collection_type="youtube")
+
+    if not (await acreate_unique("youtube", video_id=video_id, title=title, http_validators=validators))[1]:
+        return already_added(request, "youtube")
+    messages.success(request, f"Added: {title}")
+    return redirect("collections_list", collection_type="youtube")
+
+
+async def handle_twitter_add(request):
+    post_url = request.POST.get("item_url", "").strip()
+    if not post_url:
+        messages.error(request, "Please enter a Twitter/X URL")
+        return redirect("collections_list", collection_type="twitter")
+
+    result = extract_tweet_id_and_handle(post_url)
+    if not result:
+        messages.error(request, "Invalid Twitter/X URL")
+        return redirect("collections_list", collection_type="twitter")
+
+    author_handle, post_id = result
+    if await TwitterPost.objects.filter(post_id=post_id).aexists():
+        return already_added(request, "twitter")
+
+    placeholder = {"text": TwitterPost.placeholder_text(post_id), "author_name": author_handle}
+    if settings.ASYNC_FETCH:
+        return await queue_placeholder(request, "twitter", post_id=post_id, author_handle=author_handle, **placeholder)
+
+    # Save the post with or without fetched info
+    validators = {}
+    tweet_info = await aget_tweet_info(post_id, author_handle, validators)
+    fields = {"text": tweet_info["text"], "author_name": tweet_info["author_name"]} if tweet_info else placeholder
+    _, created = await acreate_unique(
+        "twitter", post_id=post_id, author_handle=author_handle, http_validators=validators, **fields
+    )
+    if not created:
+        return already_added(request, "twitter")
+    if tweet_info:
+        messages.success(request, f"Added post from @{author_handle}")
+    else:
+        messages.warning(
+            request,
+            f"Added post from @{author_handle} (info fetch failed - post saved with placeholder)",
+        )
+    return redirect("collections_list", collection_type="twitter")
+
+
+async def handle_arxiv_add(request):
+    paper_url = request.POST.get("item_url", "").strip()
+    if not paper_url:
+        messages.error(request, "Please enter an arXiv link or ID")
+        return redirect("collections_list", collection_type="arxiv")
+
+    arxiv_id = extract_arxiv_id(paper_url)
+    if not arxiv_id:
+        messages.error(request, "Invalid arXiv link or ID")
+        return redirect("collections_list", collection_type="arxiv")
+
+    if await ArxivPaper.objects.filter(arxiv_id=arxiv_id).aexists():
+        return already_added(request, "arxiv")
+
+    if settings.ASYNC_FETCH:
+        return await queue_placeholder(request, "arxiv", arxiv_id=arxiv_id, title=f"arXiv:{arxiv_id}")
+
+    validators = {}
+    metadata = await afetch_arxiv_metadata(arxiv_id, validators)
+    if not metadata:
+        messages.error(request, "Could not fetch arXiv metadata")
+        return redirect("collections_list", collection_type="arxiv")
+
+    _, created = await acreate_unique(
+        "arxiv",
+        arxiv_id=arxiv_id,
+        title=metadata["title"],
+        summary=metadata["summary"],
+        authors=metadata["authors"],
+        http_validators=validators,
+    )
+    if not created:
+        return already_added(request, "arxiv")
+    messages.success(request, f"Added arXiv paper {arxiv_id}")
+    return redirect("collections_list", collection_type="arxiv")
+
+
+async def handle_github_add(request):
+    repo_url = request.POST.get("item_url", "").strip()
+    if not repo_url:
+        messages.error(request, "Please enter a GitHub repository link or owner/repo")
+        return redirect("collections_list", collection_type="github")
+
+    repo_ref = extract_github_repo_ref(repo_url)
+    if not repo_ref:
+        messages.error(request, "Invalid GitHub repository reference")
+        return redirect("collections_list", collection_type="github")
+
+    full_name = "/".join(repo_ref)
+    if await GithubRepo.objects.filter(full_name_normalized=full_name.lower()).aexists():
+        return already_added(request, "github")
+
+    if settings.ASYNC_FETCH:
+        return await queue_placeholder(request, "github", full_name=full_name)
+
+    validators = {}
+    repo_info = await afetch_github_repo_info(*repo_ref, validators)
+    if not repo_info:
+        messages.error(request, "Could not fetch repository information")
+        return redirect("collections_list", collection_type="github")
+
+    _, created = await acreate_unique("github", http_validators=validators, **repo_fields(repo_info))
+    if not created:
+        return already_added(request, "github")
+    messages.success(request, f"Added {repo_info['full_name']}")
+    return redirect("collections_list", collection_type="github")
+
+
+async def handle_link_add(request):
+    link_url = request.POST.get("item_url", "").strip()
+    if not link_url:
+        messages.error(request, "Please enter a URL")
+        return redirect("collections_list", collection_type="links")
+
+    link_url = normalize_link_url(link_url)
+    if not link_url:
+        messages.error(request, "Invalid URL format")
+        return redirect("collections_list", collection_type="links")
+
+    if await Link.objects.filter(url_hash=url_hash(link_url)).aexists():
+        return already_added(request, "links")
+
+    default_title = urlparse(link_url).netloc or link_url[:50]
+    if settings.ASYNC_FETCH:
+        return await queue_placeholder(request, "links", url=link_url, title=default_title)
+
+    # Save the link with fetched metadata under its canonical URL, or with its domain as title
+    validators = {}
+    metadata = await afetch_link_metadata(link_url, validators)
+    if metadata:
+        fields = {"title": metadata["title"], "description": metadata["description"]}
+    else:
+        fields = {"title": default_title, "description": ""}
+    _, created = await acreate_unique(
+        "links", url=canonical_link_url(link_url, metadata), http_validators=validators, **fields
+    )
+    if not created:
+        return already_added(request, "links")
+    if metadata:
+        messages.success(request, f"Added: {metadata['title']}")
+    else:
+        messages.warning(
+            request,
+            f"Added link (metadata fetch failed - saved with default title: {default_title})",
+        )
+    return redirect("collections_list", collection_type="links")
+
+
+ADD_HANDLERS = {
+    "youtube": handle_youtube_add,
+    "twitter": handle_twitter_add,
+    "arxiv": handle_arxiv_add,
+    "github": handle_github_add,
+    "links": handle_link_add,
+}
+
+# Collection type -> messages of its resync view: (queued, resynced, (level, failed), not found)
+RESYNC_MESSAGES = {
+    "youtube": (
+        "Resync queued: {item.title}",
+        "Resynced: {item.title}",
+        (messages.ERROR, "Could not fetch updated video information"),
+        "Video not found",
+    ),
+    "twitter": (
+        "Resync queued for post from @{item.author_handle}",
+        "Resynced post from @{item.author_handle}",
+        (
+            messages.WARNING,
+            (
+                "Could not resync post from @{item.author_handle}. "
+                "Check logs for details (API rate limit, SSL issues, etc.)"
+            ),
+        ),
+        "Post not found",
+    ),
+    "arxiv": (
+        "Resync queued for arXiv:{item.arxiv_id}",
+        "Resynced arXiv:{item.arxiv_id}",
+        (messages.ERROR, "Could not fetch arXiv metadata"),
+        "Paper not found",
+    ),
+    "github": (
+        "Resync queued for {item.full_name}",
+        "Resynced {item.full_name}",
+        (messages.ERROR, "Could not fetch repository info"),
+        "Repository not found",
+    ),
+    "links": (
+        "Resync queued: {item.title}",
+        "Resynced: {item.title}",
+        (messages.ERROR, "Could not fetch link metadata"),
+        "Link not found",
+    ),
+}
+
+
+@interactive_fetch
+async def resync(request, collection_type, item_id):
+    """Refresh one item's metadata (or queue it with ``ASYNC_FETCH``) and go back to its list."""
+    model = COLLECTION_MODELS[collection_type]
+    queued, resynced, (failed_level, failed), not_found = RESYNC_MESSAGES[collection_type]
+    try:
+        item = await model.objects.aget(id=item_id)
+    except model.DoesNotExist:
+        messages.error(request, not_found)
+        return redirect("collections_list", collection_type=collection_type)
+
+    if settings.ASYNC_FETCH:
+        await sync_to_async(enqueue_fetch)(item, bypass_cache=True)
+        messages.success(request, queued.format(item=item))
+    elif await sync_to_async(save_refreshed)(item, await arefresh_item(collection_type, item, bypass_cache=True)):
+        messages.success(request, resynced.format(item=item))
+    else:
+        messages.add_message(request, failed_level, failed.format(item=item))
+    return redirect("collections_list", collection_type=collection_type)
+
+
+async def video_resync(request, video_id):
+    return await resync(request, "youtube", video_id)
+
+
+async def twitter_resync(request, post_id):
+    return await resync(request, "twitter", post_id)
+
+
+async def arxiv_resync(request, paper_id):
+    return await resync(request, "arxiv", paper_id)
+
+
+async def github_resync(request, repo_id):
+    return await resync(request, "github", repo_id)
+
+
+async def link_resync(request, link_id):
+    return await resync(request, "links", link_id)
@@ -0,0 +1,56 @@
+"""Delete or resync many items of one collection at once.
+
+The per-item delete and resync views cost a request, a redirect and (for
+resync) a blocking fetch per item. The batch forms take a list of ids:
+deletes run as one ``filter(id__in=...).delete()`` in a single transaction,
+and resyncs fetch concurrently with a bounded thread pool, then save every
+refreshed row with one ``bulk_update``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.db import transaction
+
+from .http_client import in_current_context
+from .models import COLLECTION_MODELS
+from .refresh import refresh_entry, save_refreshed_batch
+
+DEFAULT_WORKERS = 8
+# Largest number of ids one batch request may act on
+MAX_BATCH_SIZE = 500
+
+
+def parse_ids(values):
+    """Parse ids from form values, each an id or a comma-separated list; invalid ids are ignored."""
+    ids = []
+    for value in values:
+        for part in str(value).split(","):
+            if part.strip().isdigit():
+                ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def delete_items(collection_type, ids):
+    """Delete the items ``ids`` of one type in one transaction; returns how many were deleted."""
+    model = COLLECTION_MODELS[collection_type]
+    with transaction.atomic():
+        return model.objects.filter(id__in=ids).delete()[1].get(model._meta.label, 0)
+
+
+def resync_items(collection_type, ids, workers=DEFAULT_WORKERS):
+    """Refresh the items ``ids`` of one type from upstream.
+
+    Fetches run ``workers`` at a time and the results are written with one
+    ``bulk_update`` (see ``refresh.save_refreshed_batch``). Returns
+    ``(updated, unchanged, failed)`` counts.
+    """
+    items = list(COLLECTION_MODELS[collection_type].objects.filter(id__in=ids))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(
+            pool.map(
+                in_current_context(partial(refresh_entry, bypass_cache=True)),
+                [(collection_type, item) for item in items],
+            )
+        )
+    return save_refreshed_batch(collection_type, items, outcomes)
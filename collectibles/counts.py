@@ -0,0 +1,27 @@
+"""Per-collection item counts kept in the ``collection_counts`` table.
+
+``COUNT(*)`` reads every row of a table, so list pages take the total from a
+counter row instead. ``signals.py`` moves the counter inside the transaction
+of each write (``post_save``/``post_delete`` for single rows,
+``collection_changed`` with ``ids`` for bulk creates and deletes), so it
+commits or rolls back together with the rows it counts. A missing counter is
+recounted when ``render_cache.collection_state`` first reads it, and
+``manage.py recount_collections`` resets them all.
+"""
+
+from django.db.models import F
+
+from .models import COLLECTION_MODELS, CollectionCount
+
+
+def adjust(collection_type, delta):
+    """Add ``delta`` to the counter of ``collection_type`` if it exists yet."""
+    if delta:
+        CollectionCount.objects.filter(collection_type=collection_type).update(count=F("count") + delta)
+
+
+def recount(collection_type):
+    """Count the rows of ``collection_type`` and store the result."""
+    count = COLLECTION_MODELS[collection_type].objects.count()
+    CollectionCount.objects.update_or_create(collection_type=collection_type, defaults={"count": count})
+    return count
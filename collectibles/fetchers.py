@@ -0,0 +1,855 @@
+"""Extractors and upstream metadata fetchers for each collection type."""
+
+import hashlib
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlparse
+
+import requests
+
+from . import http_client, response_cache
+from .html_meta import is_html, read_page_metadata
+from .single_flight import coalesced
+
+
+class _NotModified:
+    """Marker returned by fetchers when a conditional refetch found nothing new."""
+
+    def __repr__(self):
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = _NotModified()
+
+
+def conditional_headers(validators):
+    """Request headers that let the upstream answer 304 if nothing changed.
+
+    ``validators`` is the dict stored on an item (``http_validators``) holding
+    the ETag, Last-Modified and content hash of its last successful fetch.
+    """
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def is_not_modified(response, validators, content=None):
+    """True for a 304, or a 200 whose body hashes the same as the last fetch.
+
+    ``content`` overrides the body that is hashed, for streamed responses.
+    """
+    if not validators:
+        return False
+    if response.status_code == 304:
+        return True
+    if response.status_code != 200:
+        return False
+    return validators.get("content_hash") == _content_hash(response.content if content is None else content)
+
+
+def store_validators(response, validators, content=None):
+    """Record the validators of a successfully parsed response in ``validators``."""
+    if validators is None:
+        return
+    validators.update(
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        content_hash=_content_hash(response.content if content is None else content),
+    )
+
+
+def _content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def cached_results(provider, keys, *, bypass_cache=False):
+    """Split ``keys`` into results served from the response cache and keys still to fetch.
+
+    Keys cached as not found are in neither: there is nothing to fetch for them.
+    With ``bypass_cache`` every key is still to fetch.
+    """
+    results = {}
+    remaining = []
+    for key in keys:
+        cached = response_cache.lookup(provider, key, bypass_cache=bypass_cache)
+        if cached is response_cache.MISS:
+            remaining.append(key)
+        elif cached is not None:
+            results[key] = cached
+    return results, remaining
+
+
+def extract_video_id(url):
+    """Extract YouTube video ID from various URL formats."""
+    # Remove whitespace
+    url = url.strip()
+
+    # Pattern for different YouTube URL formats
+    patterns = [
+        r"(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})",
+        r"youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})",
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+
+    # If no pattern matches, check if it's just the video ID
+    if re.match(r"^[a-zA-Z0-9_-]{11}$", url):
+        return url
+
+    return None
+
+
+YOUTUBE_OEMBED_URL = "https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
+
+
+@coalesced("youtube", lambda args: args["video_id"])
+def get_video_title(video_id, validators=None, *, bypass_cache=False):
+    """Fetch video title from YouTube using oEmbed API.
+
+    With ``validators`` the request is conditional: ``NOT_MODIFIED`` is
+    returned when the video is unchanged, and the dict is updated on success.
+    Unless ``bypass_cache`` is set a recent result from the response cache
+    may be returned.
+    """
+    cached = response_cache.lookup("youtube", video_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        url = YOUTUBE_OEMBED_URL.format(video_id=video_id)
+        print(f"Fetching video title from: {url}")
+        response = http_client.get("youtube", url, headers=conditional_headers(validators), timeout=5)
+        return parse_video_title(response, video_id, validators)
+    except requests.exceptions.RequestException as e:
+        print(f"Network error fetching video title: {e}")
+    except Exception as e:
+        print(f"Unexpected error in get_video_title: {e}")
+    return None
+
+
+def parse_video_title(response, video_id, validators):
+    """Turn an oEmbed response into the result of ``get_video_title`` (shared with ``async_fetchers``)."""
+    print(f"YouTube API Response Status: {response.status_code}")
+    if is_not_modified(response, validators):
+        print("✓ Video unchanged since last fetch")
+        return NOT_MODIFIED
+    if response.status_code == 200:
+        data = response.json()
+        title = data.get("title")
+        print(f"✓ Successfully fetched video: {title}")
+        if title:
+            store_validators(response, validators)
+            response_cache.store("youtube", video_id, title, validators)
+        return title
+    if response.status_code == 404:
+        response_cache.store_missing("youtube", video_id)
+    print(f"YouTube API error: Status {response.status_code}, Response: {response.text}")
+    return None
+
+
+def extract_tweet_id_and_handle(url):
+    """Extract tweet ID and author handle from various X/Twitter URL formats."""
+    # Remove whitespace
+    url = url.strip()
+
+    # Pattern for different X/Twitter URL formats
+    # https://x.com/username/status/1234567890
+    # https://twitter.com/username/status/1234567890
+    patterns = [
+        r"(?:x\.com|twitter\.com)/([a-zA-Z0-9_]+)/status/(\d+)",
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1), match.group(2)  # handle, post_id
+
+    return None
+
+
+TWITTER_TWEETS_URL = "https://api.twitter.com/2/tweets"
+# Maximum number of IDs the multi-tweet lookup endpoint accepts per request
+TWITTER_BATCH_SIZE = 100
+
+
+@coalesced("twitter", lambda args: args["post_id"])
+def get_tweet_info(post_id, author_handle, validators=None, *, bypass_cache=False):
+    """Fetch tweet information from Twitter API v2.
+
+    The API does not support conditional requests, but with ``validators`` an
+    unchanged response (same content hash) still returns ``NOT_MODIFIED`` so
+    the caller can skip parsing and saving. Unless ``bypass_cache`` is set a
+    recent result from the response cache may be returned.
+    """
+    bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
+    if not bearer_token:
+        return None
+    cached = response_cache.lookup("twitter", post_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    response = _fetch_tweets_chunk([post_id], bearer_token)
+    if response is None:
+        return None
+    return parse_tweet(response, post_id, author_handle, validators)
+
+
+def parse_tweet(response, post_id, author_handle, validators):
+    """Turn a successful lookup of one post into the result of ``get_tweet_info``."""
+    if is_not_modified(response, validators):
+        print("✅ Post unchanged since last fetch")
+        return NOT_MODIFIED
+    data = response.json()
+    post_info = _parse_tweets(data, {post_id: author_handle}).get(post_id)
+    if post_info:
+        store_validators(response, validators)
+        response_cache.store("twitter", post_id, post_info, validators)
+    elif _tweet_not_found(data, post_id):
+        response_cache.store_missing("twitter", post_id)
+    return post_info
+
+
+def get_tweet_info_batch(posts, batch_size=TWITTER_BATCH_SIZE, *, bypass_cache=False):
+    """Fetch many tweets via the multi-tweet lookup, ``batch_size`` IDs per request.
+
+    ``posts`` maps post IDs to the author handle known from the post URL (used
+    as a fallback author name). Returns a dict mapping each post ID that was
+    found to ``{"author_name", "text"}``. Posts in the response cache are not
+    fetched again unless ``bypass_cache`` is set.
+    """
+    # Get bearer token from environment
+    bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
+
+    if not bearer_token:
+        # No API credentials configured
+        return {}
+
+    results, post_ids = cached_results("twitter", posts, bypass_cache=bypass_cache)
+    for start in range(0, len(post_ids), batch_size):
+        chunk = post_ids[start : start + batch_size]
+        response = _fetch_tweets_chunk(chunk, bearer_token)
+        if response is None:
+            continue
+        data = response.json()
+        fetched = _parse_tweets(data, posts)
+        for post_id in chunk:
+            if post_id in fetched:
+                response_cache.store("twitter", post_id, fetched[post_id])
+            elif _tweet_not_found(data, post_id):
+                response_cache.store_missing("twitter", post_id)
+        results.update(fetched)
+
+    print(f"✅ Successfully fetched {len(results)}/{len(posts)} tweet(s)")
+    return results
+
+
+def _parse_tweets(data, posts):
+    results = {}
+    # Each tweet names its author by ID; match it against the expanded users
+    users = {user.get("id"): user for user in data.get("includes", {}).get("users", [])}
+    for tweet in data.get("data", []):
+        post_id = tweet.get("id")
+        if post_id not in posts:
+            continue
+        text = tweet.get("text", "")
+
+        # Truncate if too long
+        if len(text) > 500:
+            text = text[:497] + "..."
+
+        user = users.get(tweet.get("author_id"), {})
+        results[post_id] = {"author_name": user.get("name", posts[post_id]), "text": text}
+
+    for error in data.get("errors", []):
+        print(f"⚠️ Twitter API could not return post {error.get('resource_id')}: {error.get('detail')}")
+    return results
+
+
+def _tweet_not_found(data, post_id):
+    """Whether a lookup response reports ``post_id`` as deleted or nonexistent."""
+    return any(
+        error.get("resource_id") == post_id and error.get("type", "").endswith("/resource-not-found")
+        for error in data.get("errors", [])
+    )
+
+
+def tweets_request(post_ids, bearer_token):
+    """``(params, headers)`` of a multi-tweet lookup for ``post_ids``."""
+    headers = {
+        "Authorization": f"Bearer {bearer_token}",
+        "User-Agent": "MindTreeLog/1.0",
+    }
+    params = {
+        "ids": ",".join(post_ids),
+        "tweet.fields": "text,author_id",
+        "expansions": "author_id",
+        "user.fields": "name,username",
+    }
+    return params, headers
+
+
+def check_tweets_response(response, count):
+    """Return a multi-tweet lookup response if it succeeded; log why it did not otherwise."""
+    # Debug logging
+    print(f"Twitter API Response Status: {response.status_code} ({count} post(s))")
+
+    if response.status_code == 200:
+        return response
+
+    if response.status_code == 401:
+        print("❌ Twitter API authentication error: Check your bearer token")
+    elif response.status_code == 429:
+        print("⚠️ Twitter API rate limit exceeded (Free tier: 1,500 tweets/month)")
+        print("💡 Tip: Posts are still saved with placeholder text. Edit in admin or wait for limit reset.")
+    elif response.status_code == 403:
+        print("❌ Twitter API Forbidden (403): Your app may not have the required permissions")
+    else:
+        print(f"❌ Twitter API error: Status {response.status_code}")
+    try:
+        error_data = response.json()
+        print(f"Error details: {error_data}")
+    except Exception:
+        print(f"Response text: {response.text[:200]}")
+    return None
+
+
+def _fetch_tweets_chunk(post_ids, bearer_token):
+    """Run one multi-tweet lookup request; returns the 200 response or None."""
+    try:
+        params, headers = tweets_request(post_ids, bearer_token)
+        response = http_client.get("twitter", TWITTER_TWEETS_URL, params=params, headers=headers, timeout=10)
+        return check_tweets_response(response, len(post_ids))
+    except requests.exceptions.SSLError as e:
+        print(f"SSL Error: {e}")
+        print("Try setting TWITTER_VERIFY_SSL=false in .env file (development only)")
+    except requests.exceptions.RequestException as e:
+        print(f"Network error fetching tweet info: {e}")
+    except Exception as e:
+        print(f"Error fetching tweet info: {e}")
+
+    return None
+
+
+def extract_arxiv_id(value):
+    """Extract arXiv ID from various link formats."""
+    value = value.strip()
+    print(f"Attempting to extract arXiv ID from: {value}")
+
+    if not value:
+        print("❌ Empty value provided")
+        return None
+
+    # If it's already an ID
+    if re.match(r"^\d{4}\.\d{4,5}(v\d+)?$", value):
+        print(f"✓ Direct arXiv ID detected: {value}")
+        return value
+
+    parsed = urlparse(value)
+    path_segments = [seg for seg in parsed.path.split("/") if seg]
+    print(f"Parsed URL - netloc: {parsed.netloc}, path segments: {path_segments}")
+
+    if (
+        parsed.netloc
+        and "arxiv.org" in parsed.netloc
+        and path_segments
+        and path_segments[0] in {"abs", "pdf"}
+        and len(path_segments) >= 2
+    ):
+        arxiv_id = path_segments[1]
+        if path_segments[0] == "pdf" and arxiv_id.endswith(".pdf"):
+            arxiv_id = arxiv_id[:-4]
+        arxiv_id = arxiv_id.replace(".pdf", "")
+        if re.match(r"^\d{4}\.\d{4,5}(v\d+)?$", arxiv_id):
+            print(f"✓ Extracted arXiv ID from URL: {arxiv_id}")
+            return arxiv_id
+        print(f"❌ Extracted ID '{arxiv_id}' doesn't match arXiv ID format")
+
+    print("❌ Could not extract valid arXiv ID")
+    return None
+
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_NS = {"atom": "http://www.w3.org/2005/Atom"}
+ARXIV_BATCH_SIZE = 100
+ARXIV_VERSION_RE = re.compile(r"v\d+$")
+
+
+@coalesced("arxiv", lambda args: args["arxiv_id"])
+def fetch_arxiv_metadata(arxiv_id, validators=None, *, bypass_cache=False):
+    """Fetch metadata for an arXiv paper.
+
+    With ``validators`` the request is conditional: ``NOT_MODIFIED`` is
+    returned when the paper is unchanged, and the dict is updated on success.
+    Unless ``bypass_cache`` is set a recent result from the response cache
+    may be returned.
+    """
+    cached = response_cache.lookup("arxiv", arxiv_id, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    results = _fetch_arxiv_chunk([arxiv_id], validators)
+    if results is NOT_MODIFIED:
+        return NOT_MODIFIED
+    return results.get(arxiv_id)
+
+
+def fetch_arxiv_metadata_batch(arxiv_ids, batch_size=ARXIV_BATCH_SIZE, *, bypass_cache=False):
+    """Fetch metadata for many arXiv papers, ``batch_size`` IDs per API request.
+
+    Returns a dict mapping each requested ID to its metadata; IDs arXiv did not
+    return (or whose batch failed) are missing from the result. Requests are
+    paced by the shared HTTP client's arXiv rate limit. Papers in the response
+    cache are not fetched again unless ``bypass_cache`` is set.
+    """
+    results, arxiv_ids = cached_results("arxiv", dict.fromkeys(arxiv_ids), bypass_cache=bypass_cache)
+    for start in range(0, len(arxiv_ids), batch_size):
+        results.update(_fetch_arxiv_chunk(arxiv_ids[start : start + batch_size]))
+    return results
+
+
+def _parse_arxiv_entry(entry):
+    title = entry.findtext("atom:title", default="", namespaces=ARXIV_NS).strip()
+    summary = entry.findtext("atom:summary", default="", namespaces=ARXIV_NS).strip()
+    authors = [author.text.strip() for author in entry.findall("atom:author/atom:name", ARXIV_NS) if author.text]
+    return {"title": title, "summary": summary, "authors": ", ".join(authors)}
+
+
+def arxiv_request(arxiv_ids, validators=None):
+    """``(params, headers)`` of an arXiv API query for ``arxiv_ids``."""
+    params = {"id_list": ",".join(arxiv_ids), "max_results": len(arxiv_ids)}
+    print(f"Fetching arXiv metadata for {len(arxiv_ids)} paper(s) from: {ARXIV_API_URL}")
+    headers = {"User-Agent": "MindTreeLog/1.0 (Django app)"}
+    headers.update(conditional_headers(validators))
+    return params, headers
+
+
+def _fetch_arxiv_chunk(arxiv_ids, validators=None):
+    """Fetch one multi-entry Atom feed and match its entries back to ``arxiv_ids``."""
+    try:
+        params, headers = arxiv_request(arxiv_ids, validators)
+        response = http_client.get("arxiv", ARXIV_API_URL, params=params, headers=headers, timeout=30)
+        return parse_arxiv_response(response, arxiv_ids, validators)
+    except requests.exceptions.SSLError as exc:
+        print(f"❌ SSL Error: {exc}")
+        print("Try setting ARXIV_VERIFY_SSL=false in .env file (development only)")
+        return {}
+    except requests.exceptions.RequestException as exc:
+        print(f"❌ Network error fetching arXiv metadata: {exc}")
+        return {}
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching arXiv metadata: {exc}")
+        return {}
+
+
+def parse_arxiv_response(response, arxiv_ids, validators=None):
+    """Map ``arxiv_ids`` to metadata from an Atom feed response (``NOT_MODIFIED``, or ``{}`` on errors)."""
+    print(f"arXiv API Response Status: {response.status_code}")
+
+    if is_not_modified(response, validators):
+        print("✓ arXiv metadata unchanged since last fetch")
+        return NOT_MODIFIED
+
+    if response.status_code != 200:
+        print(f"❌ arXiv API error {response.status_code}: {response.text[:200]}")
+        return {}
+
+    try:
+        root = ET.fromstring(response.text)
+    except ET.ParseError as exc:
+        print(f"❌ Failed to parse arXiv XML response: {exc}")
+        print(f"Response text: {response.text[:500]}")
+        return {}
+
+    # Entry IDs look like http://arxiv.org/abs/2403.12345v2. Index each entry by
+    # its versioned ID and its base ID so both "2403.12345" and "2403.12345v2"
+    # requests find it.
+    entries = {}
+    for entry in root.findall("atom:entry", ARXIV_NS):
+        entry_url = entry.findtext("atom:id", default="", namespaces=ARXIV_NS).strip()
+        if "/abs/" not in entry_url:
+            # Error entries (e.g. for malformed IDs) have no /abs/ URL
+            continue
+        entry_id = entry_url.split("/abs/", 1)[1]
+        metadata = _parse_arxiv_entry(entry)
+        entries[entry_id] = metadata
+        entries.setdefault(ARXIV_VERSION_RE.sub("", entry_id), metadata)
+
+    results = {}
+    for arxiv_id in arxiv_ids:
+        metadata = entries.get(arxiv_id) or entries.get(ARXIV_VERSION_RE.sub("", arxiv_id))
+        if metadata is None:
+            print(f"❌ arXiv API returned no entry for {arxiv_id}")
+            response_cache.store_missing("arxiv", arxiv_id)
+            continue
+        results[arxiv_id] = {**metadata, "title": metadata["title"] or f"arXiv:{arxiv_id}"}
+    print(f"✓ Successfully fetched {len(results)}/{len(arxiv_ids)} arXiv paper(s)")
+    if results:
+        store_validators(response, validators)
+    for arxiv_id, metadata in results.items():
+        response_cache.store("arxiv", arxiv_id, metadata, validators if len(arxiv_ids) == 1 else None)
+    return results
+
+
+def extract_github_repo_ref(value):
+    """Extract owner and repo from GitHub URLs or refs."""
+    value = value.strip()
+    if not value:
+        return None
+
+    if re.match(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$", value):
+        owner, repo = value.split("/", 1)
+        return owner, repo
+
+    parsed = urlparse(value)
+    if "github.com" in parsed.netloc:
+        parts = [p for p in parsed.path.split("/") if p]
+        if len(parts) >= 2:
+            return parts[0], parts[1]
+    return None
+
+
+GITHUB_REPO_URL = "https://api.github.com/repos/{owner}/{repo}"
+
+
+@coalesced("github", lambda args: f"{args['owner']}/{args['repo']}".lower())
+def fetch_github_repo_info(owner, repo, validators=None, *, bypass_cache=False):
+    """Fetch repository information from GitHub API.
+
+    With ``validators`` the request is conditional: ``NOT_MODIFIED`` is
+    returned when the repository is unchanged (GitHub does not count these
+    304s against the rate limit), and the dict is updated on success.
+    Unless ``bypass_cache`` is set a recent result from the response cache
+    may be returned.
+    """
+    cached = response_cache.lookup("github", f"{owner}/{repo}".lower(), validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        api_url = GITHUB_REPO_URL.format(owner=owner, repo=repo)
+        print(f"Fetching GitHub repo info from: {api_url}")
+        response = http_client.get("github", api_url, headers=github_headers(validators), timeout=10)
+        return parse_repo_info(response, owner, repo, validators)
+    except requests.exceptions.SSLError as exc:
+        print(f"❌ SSL Error: {exc}")
+        print("Try setting GITHUB_VERIFY_SSL=false in .env file (development only)")
+        return None
+    except requests.exceptions.RequestException as exc:
+        print(f"❌ Network error fetching GitHub repo info: {exc}")
+        return None
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching GitHub repo info: {exc}")
+        return None
+
+
+def github_headers(validators=None):
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "MindTreeLog/1.0",
+    }
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+        print("Using GitHub token for authentication")
+    else:
+        print("No GitHub token - using unauthenticated requests (rate limited)")
+    headers.update(conditional_headers(validators))
+    return headers
+
+
+def parse_repo_info(response, owner, repo, validators):
+    """Turn a REST repository response into the result of ``fetch_github_repo_info``."""
+    print(f"GitHub API Response Status: {response.status_code}")
+    _note_github_rate_limit(response)
+
+    if is_not_modified(response, validators):
+        print("✓ GitHub repo unchanged since last fetch")
+        return NOT_MODIFIED
+
+    cache_key = f"{owner}/{repo}".lower()
+    if response.status_code == 404:
+        response_cache.store_missing("github", cache_key)
+    if response.status_code != 200:
+        print(f"❌ GitHub API error {response.status_code}: {response.text[:200]}")
+        return None
+
+    data = response.json()
+    print(f"✓ Successfully fetched GitHub repo: {data.get('full_name')}")
+    store_validators(response, validators)
+    info = {
+        "full_name": data.get("full_name", f"{owner}/{repo}"),
+        "description": data.get("description") or "",
+        "stars": data.get("stargazers_count", 0),
+        "language": data.get("language") or "",
+        "homepage": data.get("homepage") or "",
+    }
+    response_cache.store("github", cache_key, info, validators)
+    return info
+
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+# Repositories per GraphQL query; each aliased repository() field costs little
+# against the GraphQL rate limit, so one request covers a whole batch
+GITHUB_GRAPHQL_BATCH_SIZE = 50
+GITHUB_REPO_FIELDS = "nameWithOwner description stargazerCount homepageUrl primaryLanguage { name }"
+_github_resume_at = 0.0
+
+
+def _note_github_rate_limit(response):
+    """Record when GitHub allows the next request, from the X-RateLimit-* headers.
+
+    Secondary rate limits (403/429 with Retry-After) are honoured as well.
+    """
+    global _github_resume_at
+    retry_after = response.headers.get("Retry-After")
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    try:
+        if retry_after and response.status_code in (403, 429):
+            _github_resume_at = max(_github_resume_at, time.time() + int(retry_after))
+        elif remaining == "0" and reset:
+            _github_resume_at = max(_github_resume_at, float(reset) + 1)
+        else:
+            return
+    except ValueError:
+        return
+    print(f"⚠️ GitHub API rate limit reached; next request allowed at {time.ctime(_github_resume_at)}")
+
+
+def wait_for_github_rate_limit():
+    """Sleep until the GitHub rate limit window recorded by earlier responses resets.
+
+    Inside an ``http_client.max_wait`` block that does not allow the wait,
+    the block records the refusal and False is returned without sleeping.
+    """
+    delay = _github_resume_at - time.time()
+    limit = http_client.current_wait_limit()
+    if limit is not None and delay > limit.seconds:
+        limit.refuse("GitHub", delay)
+        return False
+    if delay > 0:
+        print(f"Waiting {int(delay)}s for the GitHub rate limit to reset...")
+        time.sleep(delay)
+    return True
+
+
+def fetch_github_repos_batch(refs, batch_size=GITHUB_GRAPHQL_BATCH_SIZE, *, bypass_cache=False):
+    """Fetch many repositories through the GraphQL API, ``batch_size`` per query.
+
+    ``refs`` is a list of ``(owner, repo)`` pairs. Returns a dict keyed by the
+    lower-cased ``owner/repo`` of each repository found, with the same fields
+    as ``fetch_github_repo_info``. The GraphQL API requires ``GITHUB_TOKEN``;
+    without one, None is returned so callers can fall back to the REST API.
+    Repositories in the response cache are not fetched again unless
+    ``bypass_cache`` is set.
+    """
+    token = os.getenv("GITHUB_TOKEN")
+    if not token:
+        print("No GitHub token - GraphQL API unavailable")
+        return None
+
+    keys = {f"{owner}/{repo}".lower(): (owner, repo) for owner, repo in refs}
+    results, remaining = cached_results("github", keys, bypass_cache=bypass_cache)
+    refs = [keys[key] for key in remaining]
+    for start in range(0, len(refs), batch_size):
+        if not wait_for_github_rate_limit():
+            break
+        results.update(_fetch_github_graphql_chunk(refs[start : start + batch_size], token))
+    return results
+
+
+def _fetch_github_graphql_chunk(refs, token):
+    """Run one GraphQL query with an aliased ``repository`` field per ref."""
+    try:
+        # Owners and names are passed as variables, never interpolated into the query
+        variables = {}
+        declarations = []
+        fields = []
+        for index, (owner, repo) in enumerate(refs):
+            variables[f"o{index}"] = owner
+            variables[f"n{index}"] = repo
+            declarations.append(f"$o{index}: String!, $n{index}: String!")
+            fields.append(f"r{index}: repository(owner: $o{index}, name: $n{index}) {{ {GITHUB_REPO_FIELDS} }}")
+        query = f"query({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "User-Agent": "MindTreeLog/1.0",
+        }
+        print(f"Fetching {len(refs)} GitHub repo(s) from: {GITHUB_GRAPHQL_URL}")
+        response = http_client.post(
+            "github",
+            GITHUB_GRAPHQL_URL,
+            json={"query": query, "variables": variables},
+            headers=headers,
+            timeout=30,
+        )
+        print(f"GitHub GraphQL Response Status: {response.status_code}")
+        _note_github_rate_limit(response)
+
+        if response.status_code != 200:
+            print(f"❌ GitHub GraphQL error {response.status_code}: {response.text[:200]}")
+            return {}
+
+        payload = response.json()
+    except requests.exceptions.SSLError as exc:
+        print(f"❌ SSL Error: {exc}")
+        print("Try setting GITHUB_VERIFY_SSL=false in .env file (development only)")
+        return {}
+    except requests.exceptions.RequestException as exc:
+        print(f"❌ Network error fetching GitHub repos: {exc}")
+        return {}
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching GitHub repos: {exc}")
+        return {}
+
+    not_found = set()
+    for error in payload.get("errors", []):
+        # e.g. NOT_FOUND for renamed or deleted repositories; other repos still resolve
+        print(f"⚠️ GitHub GraphQL: {error.get('message')}")
+        if error.get("type") == "NOT_FOUND":
+            not_found.update(error.get("path") or [])
+
+    data = payload.get("data") or {}
+    results = {}
+    for index, (owner, repo) in enumerate(refs):
+        node = data.get(f"r{index}")
+        if not node:
+            if f"r{index}" in not_found:
+                response_cache.store_missing("github", f"{owner}/{repo}".lower())
+            continue
+        results[f"{owner}/{repo}".lower()] = {
+            "full_name": node.get("nameWithOwner") or f"{owner}/{repo}",
+            "description": node.get("description") or "",
+            "stars": node.get("stargazerCount") or 0,
+            "language": (node.get("primaryLanguage") or {}).get("name") or "",
+            "homepage": node.get("homepageUrl") or "",
+        }
+    print(f"✓ Successfully fetched {len(results)}/{len(refs)} GitHub repo(s)")
+    for key, info in results.items():
+        response_cache.store("github", key, info)
+    return results
+
+
+def normalize_link_url(value):
+    """Validate a link URL and return it in normalized form, or None if invalid."""
+    link_url = value.strip()
+    parsed = urlparse(link_url)
+    if not parsed.scheme or not parsed.netloc:
+        # Try adding https:// if no scheme
+        if link_url.startswith(("http://", "https://")):
+            return None
+        link_url = "https://" + link_url
+        parsed = urlparse(link_url)
+        if not parsed.netloc:
+            return None
+
+    # Normalize URL (remove trailing slash, etc.)
+    link_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        link_url += "?" + parsed.query
+    if parsed.fragment:
+        link_url += "#" + parsed.fragment
+    return link_url
+
+
+def canonical_link_url(url, metadata):
+    """Return the canonical URL the page at ``url`` declares, if any, else ``url``.
+
+    Links are stored under their canonical URL so the same page added again
+    with tracking parameters or another path alias is a duplicate. Only a
+    canonical URL on the same host is trusted.
+    """
+    canonical = normalize_link_url(metadata.get("canonical_url") or "") if metadata else None
+    if canonical and urlparse(canonical).netloc.lower() == urlparse(url).netloc.lower():
+        return canonical
+    return url
+
+
+LINK_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+}
+# Returned by check_link_response when the page body has to be parsed
+READ_PAGE = object()
+
+
+@coalesced("links", lambda args: args["url"])
+def fetch_link_metadata(url, validators=None, *, bypass_cache=False):
+    """Fetch metadata (title, description and canonical URL) from a webpage.
+
+    Only the start of the page is downloaded: non-HTML responses are not read
+    at all, and HTML is parsed while streaming until the metadata is complete
+    (see ``html_meta``). With ``validators`` the request is conditional:
+    ``NOT_MODIFIED`` is returned when the page is unchanged, and the dict is
+    updated on success. Unless ``bypass_cache`` is set a recent result from
+    the response cache may be returned.
+    """
+    cached = response_cache.lookup("links", url, validators, bypass_cache=bypass_cache)
+    if cached is not response_cache.MISS:
+        return cached
+    try:
+        headers = {**LINK_HEADERS, **conditional_headers(validators)}
+        print(f"Fetching link metadata from: {url}")
+        with http_client.get("links", url, headers=headers, timeout=10, allow_redirects=True, stream=True) as response:
+            result = check_link_response(response, url, validators)
+            if result is not READ_PAGE:
+                return result
+            page = read_page_metadata(response)
+        return parse_link_page(response, url, validators, *page)
+    except requests.exceptions.SSLError as exc:
+        print(f"❌ SSL Error: {exc}")
+        print("Try setting LINK_VERIFY_SSL=false in .env file (development only)")
+        return None
+    except requests.exceptions.RequestException as exc:
+        print(f"❌ Network error fetching link metadata: {exc}")
+        return None
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching link metadata: {exc}")
+        return None
+
+
+def check_link_response(response, url, validators):
+    """Result of a streamed link fetch that the status and content type decide alone, else ``READ_PAGE``."""
+    print(f"Link metadata Response Status: {response.status_code}")
+
+    if response.status_code == 304 and is_not_modified(response, validators):
+        print("✓ Link unchanged since last fetch")
+        return NOT_MODIFIED
+
+    if response.status_code in (404, 410):
+        response_cache.store_missing("links", url)
+    if response.status_code != 200:
+        print(f"❌ Link metadata error {response.status_code}")
+        return None
+
+    content_type = response.headers.get("Content-Type", "")
+    if not is_html(content_type):
+        # If the URL is not a webpage (PDF, image, ...) use the domain as title
+        print(f"✓ Link is {content_type.split(';', 1)[0]}, not HTML; skipping download")
+        metadata = {"title": _link_fallback_title(url), "description": "", "canonical_url": ""}
+        response_cache.store("links", url, metadata)
+        return metadata
+    return READ_PAGE
+
+
+def parse_link_page(response, url, validators, metadata, content):
+    """Finish a link fetch from the metadata and body prefix read by ``read_page_metadata``."""
+    if is_not_modified(response, validators, content):
+        print("✓ Link unchanged since last fetch")
+        return NOT_MODIFIED
+
+    metadata["title"] = metadata["title"] or _link_fallback_title(url)
+    print(f"✓ Successfully fetched link metadata: {metadata['title'][:50]}...")
+    store_validators(response, validators, content)
+    response_cache.store("links", url, metadata, validators)
+    return metadata
+
+
+def _link_fallback_title(url):
+    return urlparse(url).netloc or url[:50]
@@ -0,0 +1,175 @@
+"""Streaming extraction of page metadata for links.
+
+``read_page_metadata`` (``aread_page_metadata`` for async ``httpx``
+responses) feeds a response body through an incremental
+``html.parser`` tokenizer chunk by chunk and stops as soon as the ``<head>``
+and the first paragraph have been seen, or after ``MAX_BYTES``, so memory per
+link stays bounded whatever the size of the page.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 16 * 1024
+MAX_BYTES = 512 * 1024
+# A first paragraph shorter than this is usually a byline or cookie notice
+MIN_PARAGRAPH_LENGTH = 50
+MAX_TITLE_LENGTH = 300
+MAX_DESCRIPTION_LENGTH = 500
+
+WHITESPACE_RE = re.compile(r"\s+")
+# Meta names/properties worth keeping; anything else is ignored
+META_KEYS = frozenset(
+    {
+        "description",
+        "og:title",
+        "og:description",
+        "og:url",
+        "twitter:title",
+        "twitter:description",
+    }
+)
+
+
+def is_html(content_type):
+    """True if a Content-Type header names an HTML document (or is missing)."""
+    if not content_type:
+        return True
+    return content_type.split(";", 1)[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def _clean(text, limit):
+    text = WHITESPACE_RE.sub(" ", text).strip()
+    if len(text) > limit:
+        text = text[: limit - 3] + "..."
+    return text
+
+
+class MetaExtractor(HTMLParser):
+    """Collects ``<title>``, selected ``<meta>`` tags, the canonical link and
+    the first substantial paragraph from HTML fed in arbitrary pieces."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.meta = {}
+        self.canonical = ""
+        self.paragraph = ""
+        self.head_done = False
+        self._in_title = False
+        self._title_parts = []
+        self._paragraph_parts = None
+
+    @property
+    def done(self):
+        """True once nothing later in the document can change the result."""
+        if not self.head_done:
+            return False
+        return bool(self.paragraph or self.meta.get("description") or self.meta.get("og:description"))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        if tag == "title" and not self.title:
+            self._in_title = True
+        elif tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or "").strip().lower()
+            if key in META_KEYS and key not in self.meta and attrs.get("content"):
+                self.meta[key] = attrs["content"]
+        elif tag == "link" and "canonical" in attrs.get("rel", "").lower().split():
+            self.canonical = self.canonical or attrs.get("href", "").strip()
+        elif tag == "body":
+            self.head_done = True
+        elif tag == "p" and not self.paragraph:
+            self.head_done = True
+            self._paragraph_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = _clean("".join(self._title_parts), MAX_TITLE_LENGTH)
+        elif tag == "head":
+            self.head_done = True
+        elif tag == "p" and self._paragraph_parts is not None:
+            text = _clean("".join(self._paragraph_parts), MAX_DESCRIPTION_LENGTH)
+            self._paragraph_parts = None
+            if len(text) >= MIN_PARAGRAPH_LENGTH:
+                self.paragraph = text
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+        elif self._paragraph_parts is not None:
+            self._paragraph_parts.append(data)
+
+    def metadata(self, base_url):
+        """Return ``{"title", "description", "canonical_url"}`` from what was seen.
+
+        Missing values are empty strings; the canonical URL falls back to
+        ``og:url`` and is resolved against ``base_url``.
+        """
+        title = self.title or self.meta.get("og:title") or self.meta.get("twitter:title") or ""
+        description = (
+            self.meta.get("description")
+            or self.meta.get("og:description")
+            or self.meta.get("twitter:description")
+            or self.paragraph
+        )
+        canonical = self.canonical or self.meta.get("og:url") or ""
+        return {
+            "title": _clean(title, MAX_TITLE_LENGTH),
+            "description": _clean(description or "", MAX_DESCRIPTION_LENGTH),
+            "canonical_url": urljoin(base_url, canonical) if canonical else "",
+        }
+
+
+class PageReader:
+    """Feeds the chunks of a response body to ``MetaExtractor`` until the metadata is complete."""
+
+    def __init__(self, encoding, max_bytes=MAX_BYTES):
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.parser = MetaExtractor()
+        self.max_bytes = max_bytes
+        self.chunks = []
+        self.read = 0
+
+    def feed(self, chunk):
+        """Parse ``chunk``; returns True once no more of the body is needed."""
+        self.chunks.append(chunk)
+        self.read += len(chunk)
+        self.parser.feed(self.decoder.decode(chunk))
+        return self.parser.done or self.read >= self.max_bytes
+
+    def result(self, base_url):
+        self.parser.close()
+        return self.parser.metadata(base_url), b"".join(self.chunks)
+
+
+def read_page_metadata(response, max_bytes=MAX_BYTES):
+    """Parse metadata from a streamed (``stream=True``) HTML response.
+
+    Returns ``(metadata, body_prefix)``: the extracted metadata and the raw
+    bytes that were read, which callers can hash to detect unchanged pages.
+    """
+    # requests assumes ISO-8859-1 for text/* without a charset; UTF-8 is far
+    # more likely for HTML today
+    has_charset = "charset" in response.headers.get("Content-Type", "").lower()
+    reader = PageReader(response.encoding if has_charset else None, max_bytes)
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if reader.feed(chunk):
+            break
+    return reader.result(response.url)
+
+
+async def aread_page_metadata(response, max_bytes=MAX_BYTES):
+    """``read_page_metadata`` for a streamed ``httpx`` response."""
+    reader = PageReader(response.charset_encoding, max_bytes)
+    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+        if reader.feed(chunk):
+            break
+    return reader.result(str(response.url))
@@ -0,0 +1,285 @@
+"""Shared HTTP client for upstream metadata fetches.
+
+Every fetcher goes through ``get``/``post`` here instead of calling
+``requests`` directly, which gives them:
+
+* one keep-alive ``requests.Session`` per provider, so repeated calls to the
+  same host reuse TCP/TLS connections;
+* a token bucket and a concurrency cap per provider (per host for arbitrary
+  links), so bulk jobs run at the rate the upstream allows and no faster;
+* retries with jittered exponential backoff on 429/5xx and connection errors,
+  honouring ``Retry-After``.
+
+Waiting for a rate limit blocks the calling thread, which is what commands,
+fetch workers and the refresh daemon want. Web requests run their fetches in
+a ``max_wait`` block instead: a request that would wait longer than that for
+a token, a free slot or a retry raises ``RateLimited`` (a
+``RequestException``, so fetchers treat it as a failed fetch), and the block
+records it so the view can tell the user to try again later.
+
+Limits and SSL verification come from ``settings.HTTP_PROVIDERS`` and are
+resolved once, when the client is first used.
+"""
+
+import contextvars
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_SECONDS = 1
+RETRY_MAX_SECONDS = 30
+# Host pools kept alive per provider session (arbitrary links span many hosts)
+POOL_HOSTS = 50
+
+
+def parse_rate_limit(value):
+    """Parse ``"requests/seconds"`` into ``(rate per second, burst)``."""
+    requests_per, _, seconds = str(value).partition("/")
+    count = float(requests_per)
+    period = float(seconds or 1)
+    if count <= 0 or period <= 0:
+        msg = f"Invalid rate limit {value!r}; expected e.g. '10/1'"
+        raise ValueError(msg)
+    return count / period, max(1, int(count))
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """A request would have waited longer than its ``max_wait`` block allows."""
+
+    def __init__(self, label, retry_after):
+        self.label = label
+        self.retry_after = retry_after
+        super().__init__(f"{label} rate limit reached, try again in {format_wait(retry_after)}")
+
+
+def format_wait(seconds):
+    if seconds < 90:
+        return f"{math.ceil(seconds)}s"
+    return f"{math.ceil(seconds / 60)} min"
+
+
+class WaitLimit:
+    """The wait allowed in a ``max_wait`` block, and the last request it refused."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.refused = None
+
+    def refuse(self, label, retry_after):
+        self.refused = RateLimited(label, retry_after)
+        return self.refused
+
+
+_wait_limit = contextvars.ContextVar("http_wait_limit", default=None)
+
+
+@contextmanager
+def max_wait(seconds):
+    """Fail requests made in this block with ``RateLimited`` instead of waiting over ``seconds``.
+
+    Yields the ``WaitLimit``; its ``refused`` is the last ``RateLimited``
+    raised in the block, if any.
+    """
+    limit = WaitLimit(seconds)
+    token = _wait_limit.set(limit)
+    try:
+        yield limit
+    finally:
+        _wait_limit.reset(token)
+
+
+def current_wait_limit():
+    """The ``WaitLimit`` of the enclosing ``max_wait`` block, or None outside one."""
+    return _wait_limit.get()
+
+
+def in_current_context(function):
+    """Wrap ``function`` to run in a copy of the caller's context, e.g. on a thread pool.
+
+    Pool threads do not inherit context variables, so without this they
+    would ignore an enclosing ``max_wait``.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available.
+
+    Tokens are reserved under the lock and the caller sleeps outside it, so
+    waiting threads are released in arrival order at exactly ``rate``.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """Take a token and return how many seconds to wait before using it.
+
+        A wait longer than ``max_wait`` is returned without taking the token.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            delay = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            if max_wait is None or delay <= max_wait:
+                self.tokens -= 1
+            return delay
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class Limiter:
+    """Rate limit and concurrency cap for one provider (or one link host)."""
+
+    def __init__(self, rate_limit, concurrency):
+        self.bucket = TokenBucket(*parse_rate_limit(rate_limit))
+        self.slots = threading.BoundedSemaphore(max(1, concurrency))
+
+
+class Provider:
+    def __init__(self, name, config, max_retries):
+        self.name = name
+        self.label = config.get("label", name)
+        self.verify_ssl = config.get("verify_ssl", True)
+        self.rate_limit = config["rate_limit"]
+        self.concurrency = config.get("concurrency", 4)
+        self.per_host = config.get("per_host", False)
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=self.concurrency, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+    def limiter(self, url):
+        key = urlparse(url).netloc.lower() if self.per_host else ""
+        with self._limiters_lock:
+            if key not in self._limiters:
+                self._limiters[key] = Limiter(self.rate_limit, self.concurrency)
+            return self._limiters[key]
+
+    def reserve(self, limiter):
+        """Reserve a token for one request and return how long to wait before sending it.
+
+        Inside a ``max_wait`` block a longer wait raises ``RateLimited``.
+        """
+        limit = current_wait_limit()
+        delay = limiter.bucket.reserve(None if limit is None else limit.seconds)
+        if limit is not None and delay > limit.seconds:
+            raise limit.refuse(self.label, delay)
+        return delay
+
+    def request(self, method, url, **kwargs):
+        limiter = self.limiter(url)
+        limit = current_wait_limit()
+        kwargs.setdefault("verify", self.verify_ssl)
+        attempt = 0
+        while True:
+            # Wait for the rate limit before taking a slot, so waiting does not hold one
+            delay = self.reserve(limiter)
+            if delay:
+                time.sleep(delay)
+            if not limiter.slots.acquire(timeout=None if limit is None else limit.seconds):
+                raise limit.refuse(self.label, limit.seconds)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                if isinstance(exc, requests.exceptions.SSLError) or attempt >= self.max_retries:
+                    raise
+                response = None
+            finally:
+                limiter.slots.release()
+
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= self.max_retries):
+                return response
+
+            delay = retry_delay(response, attempt)
+            if delay is None or (limit is not None and delay > limit.seconds):
+                # Upstream asked us to wait longer than a retry (or the caller) allows; let the caller handle it
+                if limit is not None and response is not None and response.status_code == 429:
+                    limit.refuse(self.label, delay or RETRY_MAX_SECONDS)
+                return response
+            status = "connection error"
+            if response is not None:
+                status = response.status_code
+                # Hand a streamed response's connection back to the pool before retrying
+                response.close()
+            print(f"⚠️ {self.name} request got {status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before retry number ``attempt + 1``, or None to give up.
+
+    ``Retry-After`` (seconds or HTTP date) wins when present; otherwise the
+    delay is exponential with full jitter.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return max(0.0, delay) if delay <= RETRY_MAX_SECONDS else None
+    return random.uniform(0, min(RETRY_BASE_SECONDS * 2**attempt, RETRY_MAX_SECONDS))
+
+
+_providers = None
+_providers_lock = threading.Lock()
+
+
+def get_provider(name):
+    """Return the shared ``Provider`` for ``name``, building all of them on first use."""
+    global _providers
+    if _providers is None:
+        with _providers_lock:
+            if _providers is None:
+                _providers = _build_providers()
+    return _providers[name]
+
+
+def _build_providers():
+    providers = {
+        name: Provider(name, config, settings.HTTP_MAX_RETRIES) for name, config in settings.HTTP_PROVIDERS.items()
+    }
+    insecure = [name for name, provider in providers.items() if not provider.verify_ssl]
+    if insecure:
+        import urllib3
+
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        print(f"Warning: SSL verification disabled for {', '.join(insecure)}")
+    return providers
+
+
+def get(provider, url, **kwargs):
+    return get_provider(provider).request("GET", url, **kwargs)
+
+
+def post(provider, url, **kwargs):
+    return get_provider(provider).request("POST", url, **kwargs)
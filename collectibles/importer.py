@@ -0,0 +1,252 @@
+"""Bulk import of mixed collectible URLs.
+
+Each entry is routed to a collection type with the same extractors the add
+form uses, metadata is fetched concurrently with a bounded thread pool, and
+rows are written in chunks with ``bulk_create(ignore_conflicts=True)``.
+Posts, papers and repos are fetched through the multi-item lookups
+(``refresh.refresh_batch``), so a chunk of 500 posts costs five requests.
+"""
+
+import csv
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db.models import Max
+
+from .fetchers import (
+    extract_arxiv_id,
+    extract_github_repo_ref,
+    extract_tweet_id_and_handle,
+    extract_video_id,
+    normalize_link_url,
+)
+from .http_client import in_current_context
+from .jobs import enqueue_fetches
+from .models import COLLECTION_MODELS, NATURAL_KEYS, ChangeLogEntry, FetchStatus, TwitterPost, duplicates_filter
+from .refresh import refresh_batch, refresh_batch_size
+from .signals import collection_changed
+
+DEFAULT_WORKERS = 8
+CHUNK_SIZE = 500
+# Largest upload whose metadata the import endpoint fetches inside the request; larger ones are queued
+INLINE_FETCH_LIMIT = 20
+
+ARXIV_ID_RE = re.compile(r"^\d{4}\.\d{4,5}(v\d+)?$")
+# Bare owner/repo refs; GitHub owners cannot contain dots, which keeps
+# "example.com/page" from being mistaken for a repository
+GITHUB_REF_RE = re.compile(r"^[A-Za-z0-9-]+/[A-Za-z0-9_.-]+$")
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = Counter()
+        self.duplicates = 0
+        self.failed = 0
+        self.queued = 0
+        self.invalid = []
+
+    def summary(self):
+        total = sum(self.created.values())
+        parts = [f"Imported {total} item{'s' if total != 1 else ''}"]
+        if total:
+            parts[0] += " (" + ", ".join(f"{key}: {count}" for key, count in sorted(self.created.items())) + ")"
+        if self.duplicates:
+            parts.append(f"{self.duplicates} duplicate(s) skipped")
+        if self.invalid:
+            parts.append(f"{len(self.invalid)} unrecognized line(s)")
+        if self.failed:
+            parts.append(f"{self.failed} metadata fetch(es) failed")
+        if self.queued:
+            parts.append(f"{self.queued} metadata fetch(es) queued")
+        return "; ".join(parts)
+
+
+def parse_entries(text, fmt="auto"):
+    """Yield ``(value, tags)`` pairs from a newline-delimited or CSV list.
+
+    CSV is recognised by a header row with a ``url`` column (an optional
+    ``tags`` column is applied to links). Anything else is read as one URL per
+    line, so URLs containing commas survive intact.
+    """
+    lines = text.splitlines()
+    first = next((line for line in lines if line.strip()), "")
+    header = [cell.strip().lower() for cell in next(csv.reader([first]))] if first else []
+
+    if fmt == "lines" or (fmt == "auto" and "url" not in header):
+        for line in lines:
+            yield line.strip(), ""
+        return
+
+    url_index, tags_index = 0, None
+    rows = csv.reader(line for line in lines if line.strip())
+    if "url" in header:
+        url_index = header.index("url")
+        tags_index = header.index("tags") if "tags" in header else None
+        next(rows)
+    for row in rows:
+        if len(row) > url_index:
+            tags = row[tags_index].strip() if tags_index is not None and len(row) > tags_index else ""
+            yield row[url_index].strip(), tags
+
+
+def classify(value):
+    """Route a URL (or bare arXiv ID / owner/repo) to ``(collection_type, fields)``.
+
+    ``fields`` are the placeholder values a new row is created with before its
+    metadata is fetched. Returns None for values that cannot be imported.
+    """
+    lowered = value.lower()
+
+    if "x.com/" in lowered or "twitter.com/" in lowered:
+        result = extract_tweet_id_and_handle(value)
+        if result:
+            author_handle, post_id = result
+            return "twitter", {
+                "post_id": post_id,
+                "author_handle": author_handle,
+                "text": TwitterPost.placeholder_text(post_id),
+                "author_name": author_handle,
+            }
+
+    if "youtube.com/" in lowered or "youtu.be/" in lowered:
+        video_id = extract_video_id(value)
+        if video_id:
+            return "youtube", {"video_id": video_id, "title": video_id}
+
+    if "arxiv.org/" in lowered or ARXIV_ID_RE.match(value):
+        arxiv_id = extract_arxiv_id(value)
+        if arxiv_id:
+            return "arxiv", {"arxiv_id": arxiv_id, "title": f"arXiv:{arxiv_id}"}
+
+    if "github.com/" in lowered or GITHUB_REF_RE.match(value):
+        repo_ref = extract_github_repo_ref(value)
+        if repo_ref:
+            return "github", {"full_name": "/".join(repo_ref)}
+
+    link_url = None if any(char.isspace() for char in value) else normalize_link_url(value)
+    if link_url and "." in urlparse(link_url).netloc:
+        return "links", {"url": link_url, "title": urlparse(link_url).netloc}
+    return None
+
+
+def _dedupe_key(collection_type, value):
+    # GitHub names are case-insensitive; everything else matches exactly
+    return value.lower() if collection_type == "github" else value
+
+
+def _existing_keys(collection_type, keys):
+    model = COLLECTION_MODELS[collection_type]
+    field = NATURAL_KEYS[collection_type]
+    existing = model.objects.filter(**duplicates_filter(collection_type, keys)).values_list(field, flat=True)
+    return {_dedupe_key(collection_type, key) for key in existing}
+
+
+def _import_chunk(batch, result, workers, fetch):
+    by_type = defaultdict(list)
+    for collection_type, fields in batch:
+        by_type[collection_type].append(fields)
+
+    entries = []
+    for collection_type, rows in by_type.items():
+        field = NATURAL_KEYS[collection_type]
+        existing = _existing_keys(collection_type, [row[field] for row in rows])
+        model = COLLECTION_MODELS[collection_type]
+        for row in rows:
+            if _dedupe_key(collection_type, row[field]) in existing:
+                result.duplicates += 1
+            else:
+                entries.append((collection_type, model(**row)))
+
+    queue = not fetch or settings.ASYNC_FETCH
+    if queue:
+        for _, item in entries:
+            item.fetch_status = FetchStatus.PENDING
+    else:
+        result.failed += _fetch_metadata(entries, workers)
+
+    for collection_type in by_type:
+        model = COLLECTION_MODELS[collection_type]
+        items = [item for entry_type, item in entries if entry_type == collection_type]
+        if not items:
+            continue
+        field = NATURAL_KEYS[collection_type]
+        keys = [getattr(item, field) for item in items]
+        last_id = model.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        model.objects.bulk_create(items, ignore_conflicts=True, batch_size=CHUNK_SIZE)
+        # Rows skipped as conflicts keep their old (lower) ids
+        matching = model.objects.filter(**duplicates_filter(collection_type, keys))
+        created_ids = list(matching.filter(id__gt=last_id).values_list("id", flat=True))
+        result.created[collection_type] += len(created_ids)
+        collection_changed.send(sender=model, ids=created_ids, action=ChangeLogEntry.Action.CREATE)
+
+        if queue:
+            pending = list(matching.filter(fetch_status=FetchStatus.PENDING).values_list("id", flat=True))
+            enqueue_fetches(collection_type, pending)
+            result.queued += len(pending)
+
+
+def _fetch_metadata(entries, workers):
+    """Fetch metadata for new ``(collection_type, item)`` entries and set their fetch status.
+
+    Each task on the pool is one upstream request: ``refresh_batch_size``
+    posts, papers or repos, or a single video or link. Returns the number of
+    failed fetches.
+    """
+    by_type = defaultdict(list)
+    for collection_type, item in entries:
+        by_type[collection_type].append(item)
+    task_types = []
+    task_items = []
+    for collection_type, items in by_type.items():
+        size = refresh_batch_size(collection_type)
+        for start in range(0, len(items), size):
+            task_types.append(collection_type)
+            task_items.append(items[start : start + size])
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for items, outcomes in zip(
+            task_items, pool.map(in_current_context(refresh_batch), task_types, task_items), strict=True
+        ):
+            for item, ok in zip(items, outcomes, strict=True):
+                item.fetch_status = FetchStatus.OK if ok else FetchStatus.FAILED
+                failed += not ok
+    return failed
+
+
+def import_entries(entries, *, workers=DEFAULT_WORKERS, fetch=True):
+    """Import ``(value, tags)`` entries and return an ``ImportResult``.
+
+    With ``fetch=False`` (or ``ASYNC_FETCH`` enabled) rows are saved as
+    placeholders and their fetches queued for ``run_fetch_workers``.
+    """
+    result = ImportResult()
+    seen = set()
+    batch = []
+    for value, tags in entries:
+        if not value or value.startswith("#"):
+            continue
+        classified = classify(value)
+        if classified is None:
+            result.invalid.append(value)
+            continue
+
+        collection_type, fields = classified
+        if collection_type == "links" and tags:
+            fields["tags"] = tags[:200]
+        key = (collection_type, _dedupe_key(collection_type, fields[NATURAL_KEYS[collection_type]]))
+        if key in seen:
+            result.duplicates += 1
+            continue
+        seen.add(key)
+
+        batch.append((collection_type, fields))
+        if len(batch) >= CHUNK_SIZE:
+            _import_chunk(batch, result, workers, fetch)
+            batch = []
+    if batch:
+        _import_chunk(batch, result, workers, fetch)
+    return result
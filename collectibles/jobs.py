@@ -0,0 +1,167 @@
+"""Database-backed job queue for upstream metadata fetches.
+
+Add and resync views enqueue a ``FetchJob`` instead of calling the upstream
+API inline (when ``ASYNC_FETCH`` is enabled); ``manage.py run_fetch_workers``
+runs a pool of worker processes that claim jobs and fill in the metadata.
+Failed fetches are retried with exponential backoff. Resync jobs are queued
+with ``bypass_cache`` so the worker asks the upstream, not the response cache.
+"""
+
+import random
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import COLLECTION_MODELS, ChangeLogEntry, FetchJob, FetchStatus
+from .refresh import refresh_item, save_refreshed
+from .signals import collection_changed
+
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+# A running job whose worker died is handed to another worker after this long
+LOCK_TIMEOUT = timedelta(minutes=5)
+
+
+def collection_type_for(item):
+    for collection_type, model in COLLECTION_MODELS.items():
+        if isinstance(item, model):
+            return collection_type
+    msg = f"Not a collectible: {item!r}"
+    raise TypeError(msg)
+
+
+def enqueue_fetch(item, *, bypass_cache=False):
+    """Mark ``item`` as pending and queue a metadata fetch for it.
+
+    An item with a fetch already queued or running is not queued twice; a
+    resync (``bypass_cache``) turns a queued fetch into one.
+    """
+    collection_type = collection_type_for(item)
+    type(item).objects.filter(id=item.id).update(fetch_status=FetchStatus.PENDING, updated_at=timezone.now())
+    item.fetch_status = FetchStatus.PENDING
+    collection_changed.send(sender=type(item), ids=[item.id], action=ChangeLogEntry.Action.UPDATE)
+
+    active = FetchJob.objects.filter(
+        collection_type=collection_type,
+        object_id=item.id,
+        status__in=(FetchJob.Status.QUEUED, FetchJob.Status.RUNNING),
+    )
+    if active.exists():
+        if bypass_cache:
+            active.filter(status=FetchJob.Status.QUEUED).update(bypass_cache=True)
+        return None
+    return FetchJob.objects.create(collection_type=collection_type, object_id=item.id, bypass_cache=bypass_cache)
+
+
+def enqueue_resyncs(collection_type, ids):
+    """Mark the items ``ids`` of one type as pending and queue a fetch for each.
+
+    The batch form of ``enqueue_fetch``: items with a fetch already queued or
+    running are not queued twice, though queued ones become resyncs. Returns the
+    number of jobs queued.
+    """
+    model = COLLECTION_MODELS[collection_type]
+    ids = list(model.objects.filter(id__in=ids).values_list("id", flat=True))
+    model.objects.filter(id__in=ids).update(fetch_status=FetchStatus.PENDING, updated_at=timezone.now())
+    collection_changed.send(sender=model, ids=ids, action=ChangeLogEntry.Action.UPDATE)
+
+    active_jobs = FetchJob.objects.filter(
+        collection_type=collection_type,
+        object_id__in=ids,
+        status__in=(FetchJob.Status.QUEUED, FetchJob.Status.RUNNING),
+    )
+    active = set(active_jobs.values_list("object_id", flat=True))
+    active_jobs.filter(status=FetchJob.Status.QUEUED).update(bypass_cache=True)
+    queued = [object_id for object_id in ids if object_id not in active]
+    enqueue_fetches(collection_type, queued, bypass_cache=True)
+    return len(queued)
+
+
+def enqueue_fetches(collection_type, ids, *, bypass_cache=False):
+    """Queue metadata fetches for many already-pending items of one type."""
+    FetchJob.objects.bulk_create(
+        [
+            FetchJob(collection_type=collection_type, object_id=object_id, bypass_cache=bypass_cache)
+            for object_id in ids
+        ],
+        batch_size=500,
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter for the given number of attempts so far."""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+
+def _claimable(now):
+    return Q(status=FetchJob.Status.QUEUED, run_after__lte=now) | Q(
+        status=FetchJob.Status.RUNNING, locked_at__lt=now - LOCK_TIMEOUT
+    )
+
+
+def claim_next_job(worker_id):
+    """Atomically claim the next runnable job for ``worker_id``.
+
+    Claiming is a conditional UPDATE, so concurrent workers never run the same
+    job even on backends without ``SELECT ... FOR UPDATE SKIP LOCKED``.
+    """
+    now = timezone.now()
+    candidates = FetchJob.objects.filter(_claimable(now)).order_by("run_after", "id").values_list("id", flat=True)[:10]
+    for job_id in candidates:
+        claimed = FetchJob.objects.filter(_claimable(now), id=job_id).update(
+            status=FetchJob.Status.RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return FetchJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    """Fetch metadata for the job's item and record the outcome."""
+    model = COLLECTION_MODELS.get(job.collection_type)
+    item = model.objects.filter(id=job.object_id).first() if model else None
+    if item is None:
+        # Item was deleted (or type is unknown) while the job was queued
+        _finish(job, FetchJob.Status.DONE)
+        return True
+
+    error = ""
+    try:
+        ok = refresh_item(job.collection_type, item, bypass_cache=job.bypass_cache)
+    except Exception as exc:
+        ok = False
+        error = f"{type(exc).__name__}: {exc}"
+
+    if ok:
+        save_refreshed(item, ok)
+        _finish(job, FetchJob.Status.DONE)
+        print(f"✓ Fetched {job}")
+        return True
+
+    error = error or "Upstream fetch failed"
+    if job.attempts >= job.max_attempts:
+        model.objects.filter(id=item.id).update(fetch_status=FetchStatus.FAILED, updated_at=timezone.now())
+        collection_changed.send(sender=model, ids=[item.id], action=ChangeLogEntry.Action.UPDATE)
+        _finish(job, FetchJob.Status.FAILED, error)
+        print(f"❌ Giving up on {job} after {job.attempts} attempts: {error}")
+        return False
+
+    delay = backoff_delay(job.attempts)
+    FetchJob.objects.filter(id=job.id).update(
+        status=FetchJob.Status.QUEUED,
+        run_after=timezone.now() + delay,
+        locked_by="",
+        locked_at=None,
+        last_error=error,
+    )
+    print(f"⚠️ {job} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {int(delay.total_seconds())}s")
+    return False
+
+
+def _finish(job, status, error=""):
+    FetchJob.objects.filter(id=job.id).update(status=status, locked_by="", locked_at=None, last_error=error)
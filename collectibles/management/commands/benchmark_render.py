@@ -0,0 +1,93 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import engines
+from django.template.loader import get_template
+
+from collectibles import counts
+from collectibles.management.commands.check_query_plans import REQUIRED_FIELDS, SAMPLE_KEYS
+from collectibles.models import COLLECTION_MODELS, NATURAL_KEYS
+from collectibles.render_cache import collection_state
+from collectibles.rows import ACTION_URLS, ROW_FIELDS, item_rows
+
+
+class Rollback(Exception):
+    pass
+
+
+def instance_template(collection_type):
+    """The item template as it was before ``rows.py``: one ``{% url %}`` per action button."""
+    source = get_template(f"collectibles/items/{collection_type}.html").template.source
+    for key, name in ACTION_URLS[collection_type].items():
+        source = re.sub(r"\{\{ (\w+)\." + key + r" \}\}", r"{% url '" + name + r"' \1.id %}", source)
+    return engines["django"].from_string(source)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time counting and rendering a large list of items with model instances and COUNT(*) "
+        "against precomputed values() rows and the stored counter. Test rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Items to render (default: 10000)")
+        parser.add_argument("--type", default="youtube", choices=list(COLLECTION_MODELS), help="Collection to render")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the fastest is reported")
+
+    def handle(self, *_args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options["type"], options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, collection_type, rows, repeat):
+        model = COLLECTION_MODELS[collection_type]
+        key_field = NATURAL_KEYS[collection_type]
+        model.objects.bulk_create(
+            [
+                model(**{key_field: SAMPLE_KEYS[collection_type].format(n)}, **REQUIRED_FIELDS[collection_type])
+                for n in range(rows)
+            ],
+            batch_size=2000,
+        )
+        counts.recount(collection_type)
+        total = model.objects.count()
+        self.stdout.write(f"Rendering {total} {collection_type} item(s), best of {repeat}:")
+
+        before = instance_template(collection_type)
+        after = get_template(f"collectibles/items/{collection_type}.html")
+
+        def with_instances():
+            model.objects.count()
+            items = list(model.objects.order_by("-id"))
+            return items, lambda: before.render({"items": items, "csrf_token": "x"})
+
+        def with_rows():
+            collection_state(collection_type)
+            items = item_rows(collection_type, model.objects.order_by("-id").values(*ROW_FIELDS[collection_type]))
+            return items, lambda: after.render({"items": items, "csrf_token": "x"})
+
+        results = {}
+        for name, prepare in (("before (instances)", with_instances), ("after (rows)", with_rows)):
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                _items, render = prepare()
+                queried = time.perf_counter()
+                html = render()
+                rendered = time.perf_counter()
+                timing = (queried - started, rendered - queried, len(html))
+                best = timing if best is None or sum(timing[:2]) < sum(best[:2]) else best
+            results[name] = best
+            query, render_time, size = best
+            self.stdout.write(
+                f"  {name:>18}: query {query * 1000:7.1f}ms  render {render_time * 1000:7.1f}ms  "
+                f"total {(query + render_time) * 1000:7.1f}ms  ({size // 1024} KiB)"
+            )
+
+        before_total, after_total = (sum(result[:2]) for result in results.values())
+        self.stdout.write(self.style.SUCCESS(f"Rows render {before_total / after_total:.1f}x faster"))
@@ -0,0 +1,97 @@
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Django's SQLite backend connects with the sqlite3 default timeout
+DEFAULT_TIMEOUT = 5.0
+SEED_ROWS = 10_000
+
+
+def connect(path, profile):
+    connection = sqlite3.connect(path, timeout=DEFAULT_TIMEOUT, isolation_level=None)
+    if profile == "production":
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            connection.execute(f"PRAGMA {name}={value}")
+    return connection
+
+
+def run_worker(args):
+    """Run requests against ``path`` for ``seconds``; returns ``(reads, writes, errors)``.
+
+    Each "request" reads a page of rows; every ``write_every``-th one also
+    updates a row inside a transaction that reads first, like a Django view
+    using ``atomic()``. The default profile opens a connection per request
+    and begins transactions as DEFERRED, as Django does out of the box.
+    """
+    path, profile, seconds, write_every, worker = args
+    begin = "BEGIN IMMEDIATE" if profile == "production" else "BEGIN"
+    persistent = connect(path, profile) if profile == "production" else None
+    reads = writes = errors = 0
+    deadline = time.monotonic() + seconds
+    request = worker
+    while time.monotonic() < deadline:
+        request += 1
+        connection = persistent or connect(path, profile)
+        try:
+            offset = (request * 37) % SEED_ROWS
+            connection.execute("SELECT id, title FROM items ORDER BY id DESC LIMIT 20 OFFSET ?", [offset]).fetchall()
+            reads += 1
+            if request % write_every == 0:
+                connection.execute(begin)
+                try:
+                    connection.execute("SELECT stars FROM items WHERE id = ?", [offset + 1]).fetchone()
+                    connection.execute("UPDATE items SET stars = stars + 1 WHERE id = ?", [offset + 1])
+                    connection.execute("COMMIT")
+                except sqlite3.Error:
+                    connection.execute("ROLLBACK")
+                    raise
+                writes += 1
+        except sqlite3.OperationalError:
+            errors += 1
+        finally:
+            if persistent is None:
+                connection.close()
+    return reads, writes, errors
+
+
+class Command(BaseCommand):
+    help = "Compare SQLite throughput under concurrent processes with the default and production DB profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent processes (default: 8)")
+        parser.add_argument("--seconds", type=float, default=5, help="Duration per profile (default: 5)")
+        parser.add_argument(
+            "--write-every", type=int, default=10, help="One write per this many requests (default: 10)"
+        )
+
+    def handle(self, *_args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in ("default", "production"):
+                path = str(Path(directory) / f"{profile}.sqlite3")
+                self.seed(path, profile)
+                jobs = [
+                    (path, profile, options["seconds"], options["write_every"], worker)
+                    for worker in range(options["workers"])
+                ]
+                with Pool(options["workers"]) as pool:
+                    results = pool.map(run_worker, jobs)
+                reads, writes, errors = (sum(column) for column in zip(*results, strict=True))
+                self.stdout.write(
+                    f"{profile:>10}: {reads / options['seconds']:9.0f} reads/s "
+                    f"{writes / options['seconds']:8.0f} writes/s {errors:6d} 'database is locked' errors"
+                )
+
+    def seed(self, path, profile):
+        connection = connect(path, profile)
+        connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT, stars INTEGER)")
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO items (title, stars) VALUES (?, 0)", ((f"Item {n}",) for n in range(SEED_ROWS))
+        )
+        connection.execute("COMMIT")
+        connection.close()
@@ -0,0 +1,120 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from collectibles.models import COLLECTION_MODELS, NATURAL_KEYS, duplicates_filter
+
+SMALL_ROWS = 1000
+LOOKUPS = 200
+# A lookup on the large table may be at most this many times slower than on the small one
+MAX_SLOWDOWN = 3.0
+
+SAMPLE_KEYS = {
+    "youtube": "vid{:08d}",
+    "twitter": "{:015d}",
+    "arxiv": "2401.{:08d}",
+    "github": "Owner/Repo-{:08d}",
+    "links": "https://example.com/articles/{:08d}?ref=feed",
+}
+REQUIRED_FIELDS = {
+    "youtube": {"title": "Video"},
+    "twitter": {"text": "Post", "author_name": "A", "author_handle": "a"},
+    "arxiv": {"title": "Paper"},
+    "github": {},
+    "links": {"title": "Link"},
+}
+
+
+def uses_index(sqlite_plan):
+    """True if no step of an ``EXPLAIN QUERY PLAN`` scans a table or sorts without an index."""
+    lines = sqlite_plan.splitlines()
+    return not any(("SCAN" in line and "USING" not in line) or "TEMP B-TREE" in line for line in lines)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that duplicate lookups, list ordering and refresh scheduling use indexes: one query each, an index in the "
+        "SQLite plan, and lookup time that stays flat as tables grow. Test rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000, help="Rows per collection for the large-table timing")
+
+    def handle(self, *_args, **options):
+        self.failures = []
+        try:
+            with transaction.atomic():
+                self.run_checks(options["rows"])
+                raise Rollback
+        except Rollback:
+            pass
+        if self.failures:
+            msg = f"{len(self.failures)} check(s) failed: {', '.join(self.failures)}"
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("All query plan checks passed"))
+
+    def check(self, name, ok, detail=""):
+        if ok:
+            self.stdout.write(f"  ✓ {name} {detail}".rstrip())
+        else:
+            self.failures.append(name)
+            self.stdout.write(self.style.ERROR(f"  ✗ {name} {detail}".rstrip()))
+
+    def seed(self, collection_type, start, stop):
+        model = COLLECTION_MODELS[collection_type]
+        key_field = NATURAL_KEYS[collection_type]
+        model.objects.bulk_create(
+            [
+                model(**{key_field: SAMPLE_KEYS[collection_type].format(n)}, **REQUIRED_FIELDS[collection_type])
+                for n in range(start, stop)
+            ],
+            batch_size=2000,
+        )
+
+    def time_lookups(self, collection_type, rows):
+        model = COLLECTION_MODELS[collection_type]
+        started = time.perf_counter()
+        for n in range(LOOKUPS):
+            key = SAMPLE_KEYS[collection_type].format((n * 7919) % rows)
+            model.objects.filter(**duplicates_filter(collection_type, [key])).exists()
+        return (time.perf_counter() - started) / LOOKUPS
+
+    def run_checks(self, rows):
+        for collection_type, model in COLLECTION_MODELS.items():
+            self.stdout.write(f"{collection_type}:")
+            self.seed(collection_type, 0, SMALL_ROWS)
+
+            key = SAMPLE_KEYS[collection_type].format(1)
+            duplicates = model.objects.filter(**duplicates_filter(collection_type, [key]))
+            with CaptureQueriesContext(connection) as queries:
+                duplicates.exists()
+            self.check("duplicate check is one query", len(queries) == 1)
+
+            newest = model.objects.order_by("-created_at", "-id")[:20]
+            stalest = model.objects.filter(last_fetched_at__lt=timezone.now()).order_by("last_fetched_at", "id")[:20]
+            for name, queryset in (
+                ("duplicate check", duplicates),
+                ("newest-first page", newest),
+                ("stalest-first refresh", stalest),
+            ):
+                plan = queryset.explain()
+                if connection.vendor == "sqlite":
+                    self.check(f"{name} uses an index", uses_index(plan))
+                else:
+                    self.stdout.write(f"  {name} plan: {plan}")
+
+            small = self.time_lookups(collection_type, SMALL_ROWS)
+            self.seed(collection_type, SMALL_ROWS, rows)
+            large = self.time_lookups(collection_type, rows)
+            self.check(
+                f"duplicate check stays flat from {SMALL_ROWS} to {rows} rows",
+                large <= small * MAX_SLOWDOWN,
+                f"({small * 1e6:.0f}µs → {large * 1e6:.0f}µs)",
+            )
@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from collectibles.export import EXPORT_FORMATS, iter_export
+from collectibles.models import COLLECTION_MODELS
+
+
+class Command(BaseCommand):
+    help = "Export a collection (or all of them) as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("collection_type", choices=[*COLLECTION_MODELS, "all"])
+        parser.add_argument(
+            "--format", choices=EXPORT_FORMATS, default="ndjson", help="Output format (default: ndjson)"
+        )
+        parser.add_argument("--gzip", action="store_true", help="Compress the output with gzip")
+        parser.add_argument("-o", "--output", default="-", help='Output file, or "-" for stdout (default)')
+
+    def handle(self, *_args, **options):
+        chunks = iter_export(options["collection_type"], options["format"], compress=options["gzip"])
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
@@ -0,0 +1,50 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collectibles.importer import DEFAULT_WORKERS, import_entries, parse_entries
+
+
+class Command(BaseCommand):
+    help = "Import a newline-delimited or CSV list of YouTube, X/Twitter, arXiv, GitHub and other URLs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import ('-' reads from stdin)")
+        parser.add_argument(
+            "--format",
+            choices=("auto", "lines", "csv"),
+            default="auto",
+            help="Input format; 'auto' treats files with a 'url' header column as CSV (default: auto)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f"Concurrent metadata fetches (default: {DEFAULT_WORKERS})",
+        )
+        parser.add_argument(
+            "--no-fetch",
+            action="store_true",
+            help="Save placeholders and queue metadata fetches for run_fetch_workers instead of fetching now",
+        )
+
+    def handle(self, *_args, **options):
+        path = options["path"]
+        try:
+            if path == "-":
+                text = sys.stdin.read()
+            else:
+                with open(path, encoding="utf-8-sig") as handle:
+                    text = handle.read()
+        except OSError as exc:
+            msg = f"Could not read {path}: {exc}"
+            raise CommandError(msg) from exc
+
+        result = import_entries(
+            parse_entries(text, options["format"]),
+            workers=max(1, options["workers"]),
+            fetch=not options["no_fetch"],
+        )
+        for value in result.invalid:
+            self.stderr.write(f"Skipped unrecognized entry: {value}")
+        self.stdout.write(self.style.SUCCESS(result.summary()))
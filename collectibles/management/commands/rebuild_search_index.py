@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from collectibles.search import index_available, rebuild_index, restore_index_triggers
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the collection tables"
+
+    def handle(self, *_args, **_options):
+        if not index_available():
+            msg = "The search index needs SQLite with FTS5; run migrate first"
+            raise CommandError(msg)
+        restored = restore_index_triggers()
+        if restored:
+            self.stdout.write(f"Restored {restored} missing index trigger(s)")
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} item(s)"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from collectibles import counts
+from collectibles.models import COLLECTION_MODELS
+
+
+class Command(BaseCommand):
+    help = "Recount the items of every collection and reset the stored counters"
+
+    def handle(self, *_args, **_options):
+        for collection_type in COLLECTION_MODELS:
+            self.stdout.write(f"{collection_type}: {counts.recount(collection_type)}")
+        self.stdout.write(self.style.SUCCESS("Counters reset"))
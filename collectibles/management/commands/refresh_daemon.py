@@ -0,0 +1,85 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections
+from django.utils import timezone
+
+from collectibles.models import COLLECTION_MODELS
+from collectibles.refresh import refresh_batch, refresh_batch_size, save_refreshed_batch
+from collectibles.refresh_schedule import plan_round, provider_budgets
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep metadata fresh: refresh items whose TTL has run out, stalest and most-viewed first, "
+        "within a share of each provider's rate limit"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent fetches (default: 4)")
+        parser.add_argument("--interval", type=float, default=60, help="Seconds between rounds (default: 60)")
+        parser.add_argument(
+            "--budget",
+            type=float,
+            help="Share of each provider's rate limit to spend, 0-1 (default: settings.REFRESH_BUDGET)",
+        )
+        parser.add_argument("--types", nargs="+", choices=list(COLLECTION_MODELS), help="Only these collections")
+        parser.add_argument("--once", action="store_true", help="Run a single round and exit")
+
+    def handle(self, *_args, **options):
+        workers = max(1, options["workers"])
+        interval = max(1.0, options["interval"])
+        budgets = provider_budgets(options["types"] or list(COLLECTION_MODELS), interval, options["budget"])
+        if options["once"]:
+            # A single round gets a full round's budget instead of waiting for it to refill
+            for budget in budgets.values():
+                budget.tokens = budget.burst
+
+        self.stdout.write(self.style.SUCCESS(f"Refresh daemon started ({workers} worker(s), every {interval:g}s)"))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    started = time.monotonic()
+                    close_old_connections()
+                    try:
+                        self.run_round(pool, budgets, workers)
+                    except OperationalError as exc:
+                        # e.g. "database is locked" under SQLite; try again next round
+                        print(f"⚠️ Refresh round failed: {exc}")
+                    if options["once"]:
+                        return
+                    time.sleep(max(0.0, interval - (time.monotonic() - started)))
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping refresh daemon...")
+
+    def run_round(self, pool, budgets, workers):
+        # Enough requests to keep every worker busy for a few fetches each
+        picked = plan_round(budgets, timezone.now(), workers * 8)
+        if not picked:
+            return
+        by_type = defaultdict(list)
+        for collection_type, item in picked:
+            by_type[collection_type].append(item)
+
+        # One task per upstream request: a batch of posts, papers or repos, or a single video or link
+        task_types = []
+        task_items = []
+        for collection_type, items in by_type.items():
+            size = refresh_batch_size(collection_type)
+            for start in range(0, len(items), size):
+                task_types.append(collection_type)
+                task_items.append(items[start : start + size])
+        outcomes = defaultdict(list)
+        for collection_type, task_outcomes in zip(
+            task_types, pool.map(partial(refresh_batch, bypass_cache=True), task_types, task_items), strict=True
+        ):
+            outcomes[collection_type].extend(task_outcomes)
+
+        for collection_type, items in by_type.items():
+            updated, unchanged, failed = save_refreshed_batch(
+                collection_type, items, outcomes[collection_type], record_failures=True
+            )
+            print(f"🔄 {collection_type}: {updated} updated, {unchanged} unchanged, {failed} failed")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from collectibles.fetchers import GITHUB_GRAPHQL_BATCH_SIZE
+from collectibles.models import GithubRepo
+from collectibles.refresh import refresh_github_repos
+
+
+class Command(BaseCommand):
+    help = "Refresh star counts and details for all GitHub repos using batched GraphQL queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=GITHUB_GRAPHQL_BATCH_SIZE,
+            help=f"Repositories per GraphQL query (default: {GITHUB_GRAPHQL_BATCH_SIZE})",
+        )
+
+    def handle(self, *_args, **options):
+        repos = GithubRepo.objects.all()
+        self.stdout.write(f"Refreshing {repos.count()} GitHub repo(s)...")
+        updated, missing = refresh_github_repos(repos, batch_size=max(1, options["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} repo(s); {missing} could not be fetched"))
@@ -0,0 +1,107 @@
+import json
+import time
+from pathlib import Path
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from collectibles.models import ReplicationState
+from collectibles.sync import DEFAULT_SYNC_PAGE_SIZE, apply_changes
+
+REQUEST_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = "Apply the change log of another instance (a /sync URL) or of a saved /sync dump to this database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="/sync URL of the primary (e.g. https://host/sync), or a JSON/NDJSON file")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_SYNC_PAGE_SIZE,
+            help=f"Changes applied per transaction (default: {DEFAULT_SYNC_PAGE_SIZE})",
+        )
+        parser.add_argument("--reset", action="store_true", help="Start again from the beginning of the change log")
+        parser.add_argument(
+            "--follow",
+            type=float,
+            metavar="SECONDS",
+            help="Keep polling a URL source every SECONDS once caught up, instead of exiting",
+        )
+
+    def handle(self, *_args, **options):
+        source = options["source"]
+        is_url = source.startswith(("http://", "https://"))
+        if not is_url:
+            path = Path(source)
+            if not path.exists():
+                msg = f"No such file: {source}"
+                raise CommandError(msg)
+            source = str(path.resolve())
+        if options["follow"] and not is_url:
+            msg = "--follow needs a URL source"
+            raise CommandError(msg)
+
+        state, _ = ReplicationState.objects.get_or_create(source=source)
+        if options["reset"]:
+            state.last_seq = 0
+            state.save()
+        start = state.last_seq
+
+        batches = self.fetch_batches(source, state, options) if is_url else self.read_batches(source, state, options)
+        upserted = deleted = 0
+        for changes, last_seq in batches:
+            with transaction.atomic():
+                applied = apply_changes(changes)
+                state.last_seq = last_seq
+                state.save()
+            upserted += applied[0]
+            deleted += applied[1]
+            self.stdout.write(f"Applied changes up to #{last_seq} ({applied[0]} upserted, {applied[1]} deleted)")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replicated #{start} → #{state.last_seq} from {source}: {upserted} upserted, {deleted} deleted"
+            )
+        )
+
+    def fetch_batches(self, url, state, options):
+        """Pull pages from a /sync endpoint until caught up (or forever with --follow)."""
+        while True:
+            try:
+                response = requests.get(
+                    url,
+                    params={"after": state.last_seq, "page_size": options["batch_size"]},
+                    timeout=REQUEST_TIMEOUT,
+                )
+                response.raise_for_status()
+                page = response.json()
+            except (requests.RequestException, ValueError) as exc:
+                msg = f"Could not fetch {url}: {exc}"
+                raise CommandError(msg) from exc
+
+            if page["changes"]:
+                yield page["changes"], page["next_after"]
+            if page["has_more"]:
+                continue
+            if not options["follow"]:
+                return
+            time.sleep(options["follow"])
+
+    def read_batches(self, path, state, options):
+        """Read a saved /sync response, or NDJSON with one change per line, in batches."""
+        with open(path, encoding="utf-8") as handle:
+            text = handle.read()
+        try:
+            document = json.loads(text)
+            changes = document["changes"] if isinstance(document, dict) else document
+        except json.JSONDecodeError:
+            changes = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        changes = sorted((change for change in changes if change["seq"] > state.last_seq), key=lambda c: c["seq"])
+        batch_size = options["batch_size"]
+        for start in range(0, len(changes), batch_size):
+            batch = changes[start : start + batch_size]
+            yield batch, batch[-1]["seq"]
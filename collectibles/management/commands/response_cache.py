@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from collectibles import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss statistics of the upstream response cache, or evict or clear it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evict", action="store_true", help="Drop expired entries and trim it to its size limit")
+        parser.add_argument("--clear", action="store_true", help="Remove every entry and reset the statistics")
+
+    def handle(self, *_args, **options):
+        if not response_cache.enabled():
+            self.stdout.write("Response cache is disabled (RESPONSE_CACHE_PATH is empty)")
+            return
+        if options["clear"]:
+            response_cache.clear()
+            self.stdout.write(self.style.SUCCESS("Response cache cleared"))
+            return
+        if options["evict"]:
+            self.stdout.write(self.style.SUCCESS(f"Evicted {response_cache.evict()} entries"))
+
+        stats = response_cache.stats()
+        if not stats:
+            self.stdout.write("Response cache is empty")
+            return
+        self.stdout.write(
+            f"{'provider':<10} {'hits':>8} {'404 hits':>8} {'misses':>8} {'hit rate':>8} {'entries':>8} {'KiB':>8}"
+        )
+        for provider, counters in stats.items():
+            lookups = counters["hits"] + counters["negative_hits"] + counters["misses"]
+            hit_rate = (counters["hits"] + counters["negative_hits"]) / lookups if lookups else 0
+            self.stdout.write(
+                f"{provider:<10} {counters['hits']:>8} {counters['negative_hits']:>8} {counters['misses']:>8} "
+                f"{hit_rate:>8.0%} {counters['entries']:>8} {counters['bytes'] // 1024:>8}"
+            )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from collectibles.fetchers import ARXIV_BATCH_SIZE
+from collectibles.models import ArxivPaper
+from collectibles.refresh import resync_arxiv_papers
+
+
+class Command(BaseCommand):
+    help = "Refresh metadata for all arXiv papers using batched arXiv API requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARXIV_BATCH_SIZE,
+            help=f"Paper IDs per arXiv API request (default: {ARXIV_BATCH_SIZE})",
+        )
+
+    def handle(self, *_args, **options):
+        papers = ArxivPaper.objects.all()
+        self.stdout.write(f"Resyncing {papers.count()} arXiv paper(s)...")
+        updated, missing = resync_arxiv_papers(papers, batch_size=max(1, options["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} paper(s); {missing} not returned by arXiv"))
@@ -0,0 +1,37 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from collectibles.fetchers import TWITTER_BATCH_SIZE
+from collectibles.models import TwitterPost
+from collectibles.refresh import resync_twitter_posts
+
+
+class Command(BaseCommand):
+    help = "Refresh X/Twitter posts using batched multi-tweet API lookups"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--placeholders-only",
+            action="store_true",
+            help="Only backfill posts that still hold placeholder text",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TWITTER_BATCH_SIZE,
+            help=f"Post IDs per API request (max and default: {TWITTER_BATCH_SIZE})",
+        )
+
+    def handle(self, *_args, **options):
+        if not os.getenv("TWITTER_BEARER_TOKEN"):
+            msg = "TWITTER_BEARER_TOKEN is not set"
+            raise CommandError(msg)
+
+        batch_size = max(1, min(options["batch_size"], TWITTER_BATCH_SIZE))
+        updated, missing = resync_twitter_posts(
+            TwitterPost.objects.all(),
+            batch_size=batch_size,
+            placeholders_only=options["placeholders_only"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} post(s); {missing} could not be fetched"))
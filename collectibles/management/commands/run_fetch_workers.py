@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import socket
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connections
+
+
+def worker_loop(worker_id, poll_interval, once):
+    # Needed when the platform starts workers with "spawn" instead of "fork"
+    django.setup()
+    from collectibles.jobs import claim_next_job, run_job
+
+    # Never share the parent's database connections with a forked child
+    connections.close_all()
+    print(f"Worker {worker_id} started")
+    while True:
+        close_old_connections()
+        try:
+            job = claim_next_job(worker_id)
+        except OperationalError as exc:
+            # e.g. "database is locked" under SQLite; back off and try again
+            print(f"⚠️ Worker {worker_id} could not claim a job: {exc}")
+            time.sleep(poll_interval)
+            continue
+
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+
+
+class Command(BaseCommand):
+    help = "Run a pool of worker processes that fetch upstream metadata for queued items"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Number of worker processes (default: 4)")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1)",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue has been drained")
+
+    def handle(self, *_args, **options):
+        workers = max(1, options["workers"])
+        hostname = socket.gethostname()
+        connections.close_all()
+
+        processes = []
+        for index in range(workers):
+            worker_id = f"{hostname}:{os.getpid()}:{index}"
+            process = multiprocessing.Process(
+                target=worker_loop,
+                args=(worker_id, options["poll_interval"], options["once"]),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        self.stdout.write(self.style.SUCCESS(f"Started {workers} fetch worker(s)"))
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping workers...")
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
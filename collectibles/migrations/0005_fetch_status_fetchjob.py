@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0004_link"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="arxivpaper",
+            name="fetch_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ok", "OK"), ("failed", "Failed")], default="ok", max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="githubrepo",
+            name="fetch_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ok", "OK"), ("failed", "Failed")], default="ok", max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="link",
+            name="fetch_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ok", "OK"), ("failed", "Failed")], default="ok", max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="twitterpost",
+            name="fetch_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ok", "OK"), ("failed", "Failed")], default="ok", max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="youtubevideo",
+            name="fetch_status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("ok", "OK"), ("failed", "Failed")], default="ok", max_length=10
+            ),
+        ),
+        migrations.CreateModel(
+            name="FetchJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("collection_type", models.CharField(max_length=20)),
+                ("object_id", models.PositiveBigIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("queued", "Queued"), ("running", "Running"), ("done", "Done"), ("failed", "Failed")],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("max_attempts", models.PositiveSmallIntegerField(default=5)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("locked_by", models.CharField(blank=True, max_length=100)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "fetch_jobs",
+                "indexes": [
+                    models.Index(fields=["status", "run_after"], name="fetch_jobs_status_33dd4f_idx"),
+                    models.Index(fields=["collection_type", "object_id"], name="fetch_jobs_collect_3a4d3b_idx"),
+                ],
+            },
+        ),
+    ]
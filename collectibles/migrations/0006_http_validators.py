@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0005_fetch_status_fetchjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="arxivpaper",
+            name="http_validators",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="githubrepo",
+            name="http_validators",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="link",
+            name="http_validators",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="twitterpost",
+            name="http_validators",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="youtubevideo",
+            name="http_validators",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
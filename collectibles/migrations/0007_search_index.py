@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# Collection type -> (type code, table, indexed columns, title expression, body expression).
+# The index rowid is ``id * 8 + code``, so a hit maps straight back to its row.
+INDEXED_TABLES = {
+    "youtube": (1, "youtube_videos", ("title",), "{row}.title", "''"),
+    "twitter": (
+        2,
+        "twitter_posts",
+        ("text", "author_name", "author_handle"),
+        "{row}.text",
+        "{row}.author_name || ' ' || {row}.author_handle",
+    ),
+    "arxiv": (
+        3,
+        "arxiv_papers",
+        ("title", "summary", "authors"),
+        "{row}.title",
+        "{row}.authors || ' ' || {row}.summary",
+    ),
+    "github": (4, "github_repos", ("full_name", "description"), "{row}.full_name", "{row}.description"),
+    "links": (
+        5,
+        "links",
+        ("title", "description", "tags"),
+        "{row}.title",
+        "{row}.description || ' ' || {row}.tags",
+    ),
+}
+
+
+CREATE_INDEX_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+
+def fts5_available(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+
+
+def index_values(kind, row):
+    """SQL for the (rowid, kind, title, body) values of ``row`` (new/old/alias)."""
+    code, _table, _columns, title, body = INDEXED_TABLES[kind]
+    return f"{row}.id * 8 + {code}, '{kind}', {title.format(row=row)}, {body.format(row=row)}"
+
+
+def trigger_statements(kind):
+    code, table, columns, _title, _body = INDEXED_TABLES[kind]
+    insert = f"INSERT INTO search_index (rowid, kind, title, body) VALUES ({index_values(kind, 'new')});"
+    delete = f"DELETE FROM search_index WHERE rowid = old.id * 8 + {code};"
+    updated_columns = ", ".join(columns)
+    update = f"{delete} {insert}"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {updated_columns} ON {table} BEGIN {update} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if not fts5_available(connection):
+        # Search falls back to LIKE queries (see search.index_available)
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_INDEX_SQL)
+        for kind, (_code, table, *_rest) in INDEXED_TABLES.items():
+            for statement in trigger_statements(kind):
+                cursor.execute(statement)
+            cursor.execute(
+                f"INSERT INTO search_index (rowid, kind, title, body) SELECT {index_values(kind, 'src')} FROM {table} AS src"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for _code, table, *_rest in INDEXED_TABLES.values():
+            for suffix in ("ai", "au", "ad"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+        cursor.execute("DROP TABLE IF EXISTS search_index")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0006_http_validators"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Table -> columns searched with ILIKE by the PostgreSQL search path
+TRIGRAM_COLUMNS = {
+    "youtube_videos": ("title",),
+    "twitter_posts": ("text", "author_name", "author_handle"),
+    "arxiv_papers": ("title", "summary", "authors"),
+    "github_repos": ("full_name", "description"),
+    "links": ("title", "description", "tags"),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0009_change_log"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,221 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:03
+
+import hashlib
+from datetime import timedelta
+
+import django.db.models.functions.text
+import django.utils.timezone
+from django.db import migrations, models
+
+import collectibles.models
+
+COLLECTION_MODEL_NAMES = {
+    "youtube": "YouTubeVideo",
+    "twitter": "TwitterPost",
+    "arxiv": "ArxivPaper",
+    "github": "GithubRepo",
+    "links": "Link",
+}
+
+
+def fill_created_at(apps, schema_editor):
+    """Date existing rows by their change log ``create`` entry, else by ``updated_at``.
+
+    Rows older than the change log (0009) only have ``updated_at``, which is
+    the time of 0008 or of a later edit, so walking down the ids each row is
+    also kept older than the next newer one: ids are assigned in insertion
+    order, and newest-first lists stay in that order.
+    """
+    ChangeLogEntry = apps.get_model("collectibles", "ChangeLogEntry")
+    for collection_type, model_name in COLLECTION_MODEL_NAMES.items():
+        model = apps.get_model("collectibles", model_name)
+        logged = dict(
+            ChangeLogEntry.objects.filter(collection_type=collection_type, action="create")
+            .values("object_id")
+            .annotate(first=models.Min("created_at"))
+            .values_list("object_id", "first")
+        )
+        items = list(model.objects.only("id", "updated_at").order_by("-id"))
+        newer = None
+        for item in items:
+            created_at = min(logged.get(item.id, item.updated_at), item.updated_at)
+            if newer is not None:
+                created_at = min(created_at, newer - timedelta(microseconds=1))
+            item.created_at = newer = created_at
+        model.objects.bulk_update(items, ["created_at"], batch_size=500)
+
+
+REPO_METADATA_FIELDS = ["full_name", "description", "stars", "language", "homepage", "fetch_status", "http_validators"]
+
+
+def merge_case_duplicate_repos(apps, schema_editor):
+    """Merge repos whose names differ only in case before they must be unique case-insensitively.
+
+    The first-added row of each group is kept, with the metadata of the most
+    recently updated one; the others are deleted along with their queued
+    fetches, and logged as deleted so sync clients drop them too.
+    """
+    GithubRepo = apps.get_model("collectibles", "GithubRepo")
+    ChangeLogEntry = apps.get_model("collectibles", "ChangeLogEntry")
+    FetchJob = apps.get_model("collectibles", "FetchJob")
+    groups = {}
+    for repo in GithubRepo.objects.order_by("id"):
+        groups.setdefault(repo.full_name.lower(), []).append(repo)
+
+    removed = []
+    for repos in groups.values():
+        if len(repos) < 2:
+            continue
+        kept, latest = repos[0], max(repos, key=lambda repo: repo.updated_at)
+        removed.extend(repo.id for repo in repos[1:])
+        GithubRepo.objects.filter(id__in=[repo.id for repo in repos[1:]]).delete()
+        if latest is not kept:
+            for name in REPO_METADATA_FIELDS:
+                setattr(kept, name, getattr(latest, name))
+            kept.save(update_fields=REPO_METADATA_FIELDS)
+            ChangeLogEntry.objects.create(collection_type="github", object_id=kept.id, action="update")
+    if removed:
+        FetchJob.objects.filter(collection_type="github", object_id__in=removed).delete()
+        ChangeLogEntry.objects.bulk_create(
+            ChangeLogEntry(collection_type="github", object_id=repo_id, action="delete") for repo_id in removed
+        )
+
+
+def fill_url_hashes(apps, schema_editor):
+    Link = apps.get_model("collectibles", "Link")
+    links = list(Link.objects.only("id", "url"))
+    for link in links:
+        link.url_hash = hashlib.sha256(link.url.encode()).hexdigest()
+    Link.objects.bulk_update(links, ["url_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0010_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="arxivpaper",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="githubrepo",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(merge_case_duplicate_repos, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="githubrepo",
+            name="full_name_normalized",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Lower("full_name"),
+                output_field=models.CharField(max_length=200),
+                unique=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="link",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="link",
+            name="url_hash",
+            field=collectibles.models.URLHashField(null=True),
+        ),
+        migrations.AddField(
+            model_name="twitterpost",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="youtubevideo",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="arxivpaper",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="githubrepo",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="link",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fill_url_hashes, migrations.RunPython.noop),
+        migrations.RunPython(fill_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="link",
+            name="url_hash",
+            field=collectibles.models.URLHashField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name="link",
+            name="url",
+            field=models.URLField(),
+        ),
+        migrations.AlterField(
+            model_name="twitterpost",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name="youtubevideo",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name="arxivpaper",
+            index=models.Index(fields=["created_at", "id"], name="arxiv_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="arxivpaper",
+            index=models.Index(fields=["updated_at", "id"], name="arxiv_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepo",
+            index=models.Index(fields=["created_at", "id"], name="github_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepo",
+            index=models.Index(fields=["updated_at", "id"], name="github_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="link",
+            index=models.Index(fields=["created_at", "id"], name="links_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="link",
+            index=models.Index(fields=["updated_at", "id"], name="links_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="twitterpost",
+            index=models.Index(fields=["created_at", "id"], name="twitter_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="twitterpost",
+            index=models.Index(fields=["updated_at", "id"], name="twitter_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="youtubevideo",
+            index=models.Index(fields=["created_at", "id"], name="youtube_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="youtubevideo",
+            index=models.Index(fields=["updated_at", "id"], name="youtube_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:08
+
+from django.db import migrations, models
+
+COLLECTION_MODEL_NAMES = {
+    "youtube": "YouTubeVideo",
+    "twitter": "TwitterPost",
+    "arxiv": "ArxivPaper",
+    "github": "GithubRepo",
+    "links": "Link",
+}
+
+
+def count_collections(apps, schema_editor):
+    CollectionCount = apps.get_model("collectibles", "CollectionCount")
+    CollectionCount.objects.bulk_create(
+        [
+            CollectionCount(
+                collection_type=collection_type,
+                count=apps.get_model("collectibles", model_name).objects.count(),
+            )
+            for collection_type, model_name in COLLECTION_MODEL_NAMES.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0011_created_at_normalized_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CollectionCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("collection_type", models.CharField(max_length=20, unique=True)),
+                ("count", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "collection_counts",
+            },
+        ),
+        migrations.RunPython(count_collections, migrations.RunPython.noop),
+    ]
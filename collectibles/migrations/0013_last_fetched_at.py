@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:12
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+COLLECTION_MODEL_NAMES = ("YouTubeVideo", "TwitterPost", "ArxivPaper", "GithubRepo", "Link")
+
+
+def backfill_last_fetched_at(apps, schema_editor):
+    # The last metadata write is the best record of when existing items were fetched
+    for model_name in COLLECTION_MODEL_NAMES:
+        apps.get_model("collectibles", model_name).objects.update(last_fetched_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0012_collection_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="arxivpaper",
+            name="last_fetched_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="githubrepo",
+            name="last_fetched_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="link",
+            name="last_fetched_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="twitterpost",
+            name="last_fetched_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="youtubevideo",
+            name="last_fetched_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="arxivpaper",
+            index=models.Index(fields=["last_fetched_at", "id"], name="arxiv_fetched_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="githubrepo",
+            index=models.Index(fields=["last_fetched_at", "id"], name="github_fetched_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="link",
+            index=models.Index(fields=["last_fetched_at", "id"], name="links_fetched_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="twitterpost",
+            index=models.Index(fields=["last_fetched_at", "id"], name="twitter_fetched_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="youtubevideo",
+            index=models.Index(fields=["last_fetched_at", "id"], name="youtube_fetched_idx"),
+        ),
+        migrations.RunPython(backfill_last_fetched_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0013_last_fetched_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fetchjob",
+            name="bypass_cache",
+            field=models.BooleanField(default=False),
+        ),
+    ]
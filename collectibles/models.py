@@ -1,87 +1,359 @@
-from django.db import models
+import hashlib
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+class FetchStatus(models.TextChoices):
+    """State of an item's upstream metadata fetch."""
+
+    PENDING = "pending", "Pending"
+    OK = "ok", "OK"
+    FAILED = "failed", "Failed"
+
+
+def url_hash(url):
+    """Hex SHA-256 of a (normalized) URL, used to look links up by a short fixed-size key."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class URLHashField(models.CharField):
+    """Stores ``url_hash`` of another field of the row.
+
+    The hash is computed in ``pre_save``, so it is kept up to date by
+    ``save()`` and ``bulk_create``. Code that changes the URL with
+    ``bulk_update`` or ``update()`` has to call ``refresh_hash`` first.
+    """
+
+    def __init__(self, *args, source="url", **kwargs):
+        self.source = source
+        kwargs["max_length"] = 64
+        kwargs["editable"] = False
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop("max_length", None)
+        kwargs.pop("editable", None)
+        if self.source != "url":
+            kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def refresh_hash(self, instance):
+        value = url_hash(getattr(instance, self.source))
+        setattr(instance, self.attname, value)
+        return value
+
+    def pre_save(self, model_instance, add):  # noqa: ARG002
+        return self.refresh_hash(model_instance)
+
+
+def timestamp_indexes(prefix):
+    """Composite (timestamp, id) indexes giving every collection the same ordering keys."""
+    return [
+        models.Index(fields=["created_at", "id"], name=f"{prefix}_created_idx"),
+        models.Index(fields=["updated_at", "id"], name=f"{prefix}_updated_idx"),
+        models.Index(fields=["last_fetched_at", "id"], name=f"{prefix}_fetched_idx"),
+    ]
 
 
 class YouTubeVideo(models.Model):
+    # Links shown for an item, formatted from its fields; rows.py precomputes them for list pages
+    URL_FORMATS = {
+        "video_url": "https://www.youtube.com/watch?v={video_id}",
+        "thumbnail_url": "https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
+    }
+
     title = models.CharField(max_length=200)
     video_id = models.CharField(max_length=20, unique=True)
+    fetch_status = models.CharField(max_length=10, choices=FetchStatus.choices, default=FetchStatus.OK)
+    # ETag / Last-Modified / content hash of the last successful fetch
+    http_validators = models.JSONField(default=dict, blank=True)
+    # Last upstream fetch (or attempt by refresh_daemon); the stalest items are refreshed first
+    last_fetched_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "youtube_videos"
+        indexes = timestamp_indexes("youtube")
 
     def __str__(self):
         return self.title
 
     def thumbnail_url(self):
-        return f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg"
+        return self.URL_FORMATS["thumbnail_url"].format(video_id=self.video_id)
 
     def video_url(self):
-        return f"https://www.youtube.com/watch?v={self.video_id}"
+        return self.URL_FORMATS["video_url"].format(video_id=self.video_id)
 
 
 class TwitterPost(models.Model):
+    URL_FORMATS = {"embed_url": "https://twitter.com/{author_handle}/status/{post_id}?ref_src=twsrc%5Etfw"}
+
     text = models.CharField(max_length=500)
     post_id = models.CharField(max_length=30, unique=True)
     author_name = models.CharField(max_length=100)
     author_handle = models.CharField(max_length=50)
+    fetch_status = models.CharField(max_length=10, choices=FetchStatus.choices, default=FetchStatus.OK)
+    # ETag / Last-Modified / content hash of the last successful fetch
+    http_validators = models.JSONField(default=dict, blank=True)
+    # Last upstream fetch (or attempt by refresh_daemon); the stalest items are refreshed first
+    last_fetched_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "twitter_posts"
+        indexes = timestamp_indexes("twitter")
 
     def __str__(self):
         return f"@{self.author_handle}: {self.text[:50]}"
 
+    @staticmethod
+    def placeholder_text(post_id):
+        """Text stored for posts whose details could not be fetched."""
+        return f"Post {post_id[:10]}..."
+
+    def has_placeholder_text(self):
+        return self.text == self.placeholder_text(self.post_id)
+
     def post_url(self):
         return f"https://x.com/{self.author_handle}/status/{self.post_id}"
 
     def embed_url(self):
         """URL format required for Twitter embed widgets"""
-        return f"https://twitter.com/{self.author_handle}/status/{self.post_id}?ref_src=twsrc%5Etfw"
+        return self.URL_FORMATS["embed_url"].format(author_handle=self.author_handle, post_id=self.post_id)
 
 
 class ArxivPaper(models.Model):
+    URL_FORMATS = {"paper_url": "https://arxiv.org/abs/{arxiv_id}"}
+
     title = models.CharField(max_length=300)
     arxiv_id = models.CharField(max_length=50, unique=True)
     summary = models.TextField(blank=True)
     authors = models.CharField(max_length=300, blank=True)
+    fetch_status = models.CharField(max_length=10, choices=FetchStatus.choices, default=FetchStatus.OK)
+    # ETag / Last-Modified / content hash of the last successful fetch
+    http_validators = models.JSONField(default=dict, blank=True)
+    # Last upstream fetch (or attempt by refresh_daemon); the stalest items are refreshed first
+    last_fetched_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "arxiv_papers"
+        indexes = timestamp_indexes("arxiv")
 
     def __str__(self):
         return f"{self.arxiv_id}: {self.title[:50]}"
 
     def paper_url(self):
-        return f"https://arxiv.org/abs/{self.arxiv_id}"
+        return self.URL_FORMATS["paper_url"].format(arxiv_id=self.arxiv_id)
 
 
 class GithubRepo(models.Model):
+    URL_FORMATS = {"repo_url": "https://github.com/{full_name}"}
+
     full_name = models.CharField(max_length=200, unique=True)
+    # GitHub names are case-insensitive; duplicates are checked against this column
+    full_name_normalized = models.GeneratedField(
+        expression=Lower("full_name"),
+        output_field=models.CharField(max_length=200),
+        db_persist=True,
+        unique=True,
+    )
     description = models.CharField(max_length=500, blank=True)
     stars = models.PositiveIntegerField(default=0)
     language = models.CharField(max_length=50, blank=True)
     homepage = models.URLField(blank=True)
+    fetch_status = models.CharField(max_length=10, choices=FetchStatus.choices, default=FetchStatus.OK)
+    # ETag / Last-Modified / content hash of the last successful fetch
+    http_validators = models.JSONField(default=dict, blank=True)
+    # Last upstream fetch (or attempt by refresh_daemon); the stalest items are refreshed first
+    last_fetched_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "github_repos"
+        indexes = timestamp_indexes("github")
 
     def __str__(self):
         return self.full_name
 
     def repo_url(self):
-        return f"https://github.com/{self.full_name}"
+        return self.URL_FORMATS["repo_url"].format(full_name=self.full_name)
 
 
 class Link(models.Model):
-    url = models.URLField(unique=True)
+    URL_FORMATS = {"link_url": "{url}"}
+
+    url = models.URLField()
+    # Uniqueness is enforced on the hash: a 64-character index instead of one over full URLs
+    url_hash = URLHashField(unique=True)
     title = models.CharField(max_length=300)
     description = models.TextField(blank=True)
     tags = models.CharField(max_length=200, blank=True)
+    fetch_status = models.CharField(max_length=10, choices=FetchStatus.choices, default=FetchStatus.OK)
+    # ETag / Last-Modified / content hash of the last successful fetch
+    http_validators = models.JSONField(default=dict, blank=True)
+    # Last upstream fetch (or attempt by refresh_daemon); the stalest items are refreshed first
+    last_fetched_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "links"
+        indexes = timestamp_indexes("links")
 
     def __str__(self):
         return f"{self.title[:50]}: {self.url[:50]}"
 
     def link_url(self):
-        return self.url
+        return self.URL_FORMATS["link_url"].format(url=self.url)
+
+
+class FetchJob(models.Model):
+    """A queued metadata fetch for one collectible, processed by ``run_fetch_workers``."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    collection_type = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    # Resyncs ask the upstream even when the response cache has the item
+    bypass_cache = models.BooleanField(default=False)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "fetch_jobs"
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["collection_type", "object_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.collection_type}#{self.object_id} ({self.status})"
+
+
+class ChangeLogEntry(models.Model):
+    """Append-only record of a create, update or delete of one collectible.
+
+    The auto-incrementing ``id`` is the sequence number clients pass to
+    ``/sync?after=`` to pull only the changes they have not seen.
+    """
+
+    class Action(models.TextChoices):
+        CREATE = "create", "Create"
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+
+    collection_type = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=Action.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "change_log"
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.collection_type}#{self.object_id}"
+
+
+class ReplicationState(models.Model):
+    """How far ``replicate_from`` has applied the change log of one source."""
+
+    source = models.CharField(max_length=500, unique=True)
+    last_seq = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "replication_state"
+
+    def __str__(self):
+        return f"{self.source} @ {self.last_seq}"
+
+
+class CollectionCount(models.Model):
+    """Number of items in one collection, kept current by ``signals.py`` (see ``counts.py``)."""
+
+    collection_type = models.CharField(max_length=20, unique=True)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = "collection_counts"
+
+    def __str__(self):
+        return f"{self.collection_type}: {self.count}"
+
+
+# Collection type (as used in URLs) -> model
+COLLECTION_MODELS = {
+    "youtube": YouTubeVideo,
+    "twitter": TwitterPost,
+    "arxiv": ArxivPaper,
+    "github": GithubRepo,
+    "links": Link,
+}
+
+# Collection type -> unique field identifying an item upstream
+NATURAL_KEYS = {
+    "youtube": "video_id",
+    "twitter": "post_id",
+    "arxiv": "arxiv_id",
+    "github": "full_name",
+    "links": "url",
+}
+
+# Collection type -> (indexed column duplicates are looked up by, natural key -> column value)
+DEDUPE_COLUMNS = {
+    "youtube": ("video_id", str),
+    "twitter": ("post_id", str),
+    "arxiv": ("arxiv_id", str),
+    "github": ("full_name_normalized", str.lower),
+    "links": ("url_hash", url_hash),
+}
+
+
+def duplicates_filter(collection_type, keys):
+    """Filter kwargs matching rows whose natural key is one of ``keys``, using the dedupe column's index."""
+    column, normalize = DEDUPE_COLUMNS[collection_type]
+    return {f"{column}__in": {normalize(key) for key in keys}}
+
+
+def create_unique(collection_type, **fields):
+    """Insert an item unless one with the same natural key exists; returns ``(item, created)``.
+
+    Like ``get_or_create``, but the unique constraint of the dedupe column
+    decides, so two concurrent adds of the same item (including GitHub names
+    differing only in case) yield one row and the loser gets the winner's.
+    """
+    model = COLLECTION_MODELS[collection_type]
+    try:
+        with transaction.atomic():
+            return model.objects.create(**fields), True
+    except IntegrityError:
+        existing = model.objects.filter(**duplicates_filter(collection_type, [fields[NATURAL_KEYS[collection_type]]]))
+        return existing.get(), False
+
+
+async def acreate_unique(collection_type, **fields):
+    """Async ``create_unique``; async views run in autocommit, so the insert needs no savepoint."""
+    model = COLLECTION_MODELS[collection_type]
+    try:
+        return await model.objects.acreate(**fields), True
+    except IntegrityError:
+        existing = model.objects.filter(**duplicates_filter(collection_type, [fields[NATURAL_KEYS[collection_type]]]))
+        return await existing.aget(), False
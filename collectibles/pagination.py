@@ -0,0 +1,78 @@
+"""Keyset (cursor) pagination for querysets listed newest-first by ``id``.
+
+Pages are fetched with ``WHERE id < cursor ORDER BY id DESC LIMIT n`` rather
+than OFFSET, so the cost of a page does not grow with how deep the reader has
+scrolled or with the size of the table.
+"""
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Parse a ``page_size`` query parameter, clamped to ``1..MAX_PAGE_SIZE``."""
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def parse_cursor(value):
+    """Parse an ``after``/``before`` cursor; invalid values are ignored."""
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor > 0 else None
+
+
+class KeysetPage:
+    """One page of rows plus the cursors needed to reach its neighbours."""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _row_id(row):
+    return row["id"] if isinstance(row, dict) else row.id
+
+
+def keyset_paginate(queryset, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    """Return a ``KeysetPage`` of ``queryset`` ordered by ``-id``.
+
+    ``queryset`` may yield model instances or ``values()`` dicts including ``id``.
+
+    ``after`` returns the rows older than that id (the "next" page), ``before``
+    returns the rows newer than it (the "previous" page). With neither, the
+    newest rows are returned.
+    """
+    if before is not None:
+        # Walk forwards from the cursor, then flip back to newest-first.
+        rows = list(queryset.filter(id__gt=before).order_by("id")[: page_size + 1])
+        has_prev = len(rows) > page_size
+        rows = rows[:page_size]
+        rows.reverse()
+        has_next = bool(rows) and queryset.filter(id__lt=_row_id(rows[-1])).exists()
+    else:
+        ordered = queryset.order_by("-id")
+        if after is not None:
+            ordered = ordered.filter(id__lt=after)
+        rows = list(ordered[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = after is not None and bool(rows) and queryset.filter(id__gt=_row_id(rows[0])).exists()
+
+    return KeysetPage(
+        rows,
+        next_cursor=_row_id(rows[-1]) if has_next else None,
+        prev_cursor=_row_id(rows[0]) if has_prev else None,
+    )
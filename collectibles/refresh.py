@@ -0,0 +1,374 @@
+"""Apply freshly fetched upstream metadata to collectible instances.
+
+Each refresher fetches metadata for one item and copies it onto the instance
+(with the matching ``apply_*`` function, shared with ``async_fetchers``)
+without saving, returning ``True`` on success. Callers decide how to persist
+(``save()`` for single items, ``bulk_update`` for batches; ``bulk_update``
+and ``update()`` skip ``auto_now``, so those paths set ``updated_at``
+themselves). Providers with
+multi-item APIs also get batch resync helpers here.
+
+Single-item refreshes are conditional on the item's ``http_validators``: when
+the upstream reports the resource unchanged the refresher returns
+``NOT_MODIFIED`` (which is truthy) and leaves the instance untouched, so
+callers can skip the write entirely.
+
+The refreshers also fill in items that were never fetched (imports and
+queued adds), which may be served from the response cache. Resyncs pass
+``bypass_cache=True`` so they always reach the upstream, and so does the
+refresh daemon's ``refresh_batch``; the batch resync helpers here always do.
+
+``refresh_batch`` refreshes posts, papers and repos through the multi-item
+lookups instead, one upstream request per ``refresh_batch_size`` items.
+Those lookups are not conditional; an item whose fields come back
+unchanged is reported ``NOT_MODIFIED`` all the same.
+"""
+
+import os
+
+from django.db import transaction
+from django.utils import timezone
+
+from .fetchers import (
+    ARXIV_BATCH_SIZE,
+    GITHUB_GRAPHQL_BATCH_SIZE,
+    NOT_MODIFIED,
+    TWITTER_BATCH_SIZE,
+    fetch_arxiv_metadata,
+    fetch_arxiv_metadata_batch,
+    fetch_github_repo_info,
+    fetch_github_repos_batch,
+    fetch_link_metadata,
+    get_tweet_info,
+    get_tweet_info_batch,
+    get_video_title,
+    wait_for_github_rate_limit,
+)
+from .models import COLLECTION_MODELS, ChangeLogEntry, FetchStatus, TwitterPost
+from .signals import collection_changed
+
+
+def refresh_video(video, *, bypass_cache=False):
+    return apply_video(video, get_video_title(video.video_id, video.http_validators, bypass_cache=bypass_cache))
+
+
+def apply_video(video, title):
+    if title is NOT_MODIFIED or not title:
+        return title or False
+    video.title = title
+    return True
+
+
+def refresh_post(post, *, bypass_cache=False):
+    post_info = get_tweet_info(post.post_id, post.author_handle, post.http_validators, bypass_cache=bypass_cache)
+    return apply_post(post, post_info)
+
+
+def apply_post(post, post_info):
+    if post_info is NOT_MODIFIED or not post_info:
+        return post_info or False
+    post.author_name = post_info["author_name"]
+    post.text = post_info["text"]
+    return True
+
+
+def refresh_paper(paper, *, bypass_cache=False):
+    return apply_paper(paper, fetch_arxiv_metadata(paper.arxiv_id, paper.http_validators, bypass_cache=bypass_cache))
+
+
+def apply_paper(paper, metadata):
+    if metadata is NOT_MODIFIED or not metadata:
+        return metadata or False
+    paper.title = metadata["title"]
+    paper.summary = metadata["summary"]
+    paper.authors = metadata["authors"]
+    return True
+
+
+def repo_ref(repo):
+    """``(owner, name)`` of a repo, or None for a malformed ``full_name``."""
+    owner, _, name = repo.full_name.partition("/")
+    return (owner, name) if name else None
+
+
+def refresh_repo(repo, *, bypass_cache=False):
+    ref = repo_ref(repo)
+    if ref is None:
+        return False
+    return apply_repo(repo, fetch_github_repo_info(*ref, repo.http_validators, bypass_cache=bypass_cache))
+
+
+def repo_fields(repo_info):
+    """``GithubRepo`` field values for a fetched repo, cut to the column sizes."""
+    return {
+        "full_name": repo_info["full_name"],
+        "description": repo_info["description"],
+        "stars": repo_info["stars"],
+        "language": repo_info["language"][:50],
+        "homepage": repo_info["homepage"][:200],
+    }
+
+
+def apply_repo(repo, repo_info):
+    if repo_info is NOT_MODIFIED or not repo_info:
+        return repo_info or False
+    for name, value in repo_fields(repo_info).items():
+        setattr(repo, name, value)
+    return True
+
+
+def refresh_link(link, *, bypass_cache=False):
+    return apply_link(link, fetch_link_metadata(link.url, link.http_validators, bypass_cache=bypass_cache))
+
+
+def apply_link(link, metadata):
+    if metadata is NOT_MODIFIED or not metadata:
+        return metadata or False
+    link.title = metadata["title"]
+    link.description = metadata["description"]
+    return True
+
+
+REFRESHERS = {
+    "youtube": refresh_video,
+    "twitter": refresh_post,
+    "arxiv": refresh_paper,
+    "github": refresh_repo,
+    "links": refresh_link,
+}
+
+# Fields each refresher may change, for callers saving refreshed items with ``bulk_update``
+REFRESHED_FIELDS = {
+    "youtube": ["title"],
+    "twitter": ["author_name", "text"],
+    "arxiv": ["title", "summary", "authors"],
+    "github": ["full_name", "description", "stars", "language", "homepage"],
+    "links": ["title", "description"],
+}
+# Bookkeeping fields written with every refreshed item
+FETCH_FIELDS = ["fetch_status", "http_validators", "last_fetched_at", "updated_at"]
+
+
+def refresh_item(collection_type, item, *, bypass_cache=False):
+    """Fetch and apply metadata for ``item``.
+
+    Returns ``True`` on success, ``NOT_MODIFIED`` if the item is unchanged
+    upstream and ``False`` on failure. Resyncs pass ``bypass_cache`` so the
+    upstream is asked even when the response cache has the item.
+    """
+    return REFRESHERS[collection_type](item, bypass_cache=bypass_cache)
+
+
+# Items per upstream request for the collections ``refresh_batch`` fetches with multi-item lookups
+REFRESH_BATCH_SIZES = {
+    "twitter": TWITTER_BATCH_SIZE,
+    "arxiv": ARXIV_BATCH_SIZE,
+    "github": GITHUB_GRAPHQL_BATCH_SIZE,
+}
+
+
+def refresh_batch_size(collection_type):
+    """How many items of ``collection_type`` ``refresh_batch`` fetches with one upstream request."""
+    if collection_type == "github" and not os.getenv("GITHUB_TOKEN"):
+        # Without a token GitHub repos fall back to one REST call each
+        return 1
+    return REFRESH_BATCH_SIZES.get(collection_type, 1)
+
+
+def refresh_batch(collection_type, items, *, bypass_cache=False):
+    """Fetch and apply metadata for ``items`` of one type; returns one ``refresh_item`` outcome per item.
+
+    Posts, papers and repos go through the multi-item lookups, the others
+    are refreshed one by one. Refreshes pass ``bypass_cache``; imports leave
+    it off so items in the response cache cost no request. Items the
+    upstream did not return count as failed, and so do all of them if the
+    fetch raises.
+    """
+    try:
+        if collection_type == "twitter":
+            results = get_tweet_info_batch(
+                {post.post_id: post.author_handle for post in items}, bypass_cache=bypass_cache
+            )
+            return [_apply_if_changed("twitter", apply_post, post, results.get(post.post_id)) for post in items]
+        if collection_type == "arxiv":
+            results = fetch_arxiv_metadata_batch([paper.arxiv_id for paper in items], bypass_cache=bypass_cache)
+            return [_apply_if_changed("arxiv", apply_paper, paper, results.get(paper.arxiv_id)) for paper in items]
+        if collection_type == "github":
+            refs = {repo.id: repo_ref(repo) for repo in items}
+            results = fetch_github_repos_batch([ref for ref in refs.values() if ref], bypass_cache=bypass_cache)
+            if results is None:
+                return _refresh_repos_paced(items, bypass_cache=bypass_cache)
+            return [
+                _apply_if_changed(
+                    "github", apply_repo, repo, refs[repo.id] and results.get("/".join(refs[repo.id]).lower())
+                )
+                for repo in items
+            ]
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching {collection_type} metadata: {exc}")
+        return [False] * len(items)
+    return [refresh_entry((collection_type, item), bypass_cache=bypass_cache) for item in items]
+
+
+def _refresh_repos_paced(repos, *, bypass_cache=False):
+    """``refresh_repo`` for each of ``repos`` over the REST API, waiting out an exhausted rate limit first.
+
+    Repos the wait is not allowed for (see ``wait_for_github_rate_limit``) count as failed.
+    """
+    outcomes = []
+    for repo in repos:
+        if not wait_for_github_rate_limit():
+            outcomes.append(False)
+            continue
+        outcomes.append(refresh_repo(repo, bypass_cache=bypass_cache))
+    return outcomes
+
+
+def _apply_if_changed(collection_type, apply, item, result):
+    """``apply(item, result)``, reporting ``NOT_MODIFIED`` if no refreshed field changed."""
+    before = [getattr(item, name) for name in REFRESHED_FIELDS[collection_type]]
+    outcome = apply(item, result)
+    if outcome is True and before == [getattr(item, name) for name in REFRESHED_FIELDS[collection_type]]:
+        return NOT_MODIFIED
+    return outcome
+
+
+def refresh_entry(entry, *, bypass_cache=False):
+    """``refresh_item`` for a ``(collection_type, item)`` pair, for thread pool maps.
+
+    Unexpected errors count as a failed fetch instead of aborting the pool.
+    """
+    collection_type, item = entry
+    try:
+        return refresh_item(collection_type, item, bypass_cache=bypass_cache)
+    except Exception as exc:
+        print(f"❌ Unexpected error fetching {collection_type} metadata: {exc}")
+        return False
+
+
+def save_refreshed(item, refreshed):
+    """Persist the outcome of a single-item refresh and return ``refreshed``.
+
+    Unchanged items are not rewritten; only a stale fetch status is cleared
+    and the fetch time recorded.
+    """
+    now = timezone.now()
+    if refreshed is NOT_MODIFIED:
+        item.last_fetched_at = now
+        if item.fetch_status != FetchStatus.OK:
+            type(item).objects.filter(id=item.id).update(
+                fetch_status=FetchStatus.OK, last_fetched_at=now, updated_at=now
+            )
+            item.fetch_status = FetchStatus.OK
+            collection_changed.send(sender=type(item), ids=[item.id], action=ChangeLogEntry.Action.UPDATE)
+        else:
+            mark_fetched(type(item), [item.id], now)
+    elif refreshed:
+        item.fetch_status = FetchStatus.OK
+        item.last_fetched_at = now
+        item.save()
+    return refreshed
+
+
+def mark_fetched(model, ids, now):
+    """Record a fetch of ``ids`` that changed nothing visible, so no change signal is sent."""
+    if ids:
+        model.objects.filter(id__in=ids).update(last_fetched_at=now)
+
+
+def save_refreshed_batch(collection_type, items, outcomes, *, record_failures=False):
+    """Persist ``refresh_item`` outcomes for many items of one type with one ``bulk_update``.
+
+    Items the upstream reports unchanged are only rewritten to clear a stale
+    fetch status. Failed fetches are left as they were, except that
+    ``record_failures`` stamps their ``last_fetched_at`` so a scheduler does
+    not retry them straight away. Returns ``(updated, unchanged, failed)``.
+    """
+    model = COLLECTION_MODELS[collection_type]
+    now = timezone.now()
+    changed = []
+    unchanged = []
+    failed = []
+    for item, outcome in zip(items, outcomes, strict=True):
+        if not outcome:
+            failed.append(item.id)
+        elif outcome is NOT_MODIFIED and item.fetch_status == FetchStatus.OK:
+            unchanged.append(item.id)
+        else:
+            item.fetch_status = FetchStatus.OK
+            item.last_fetched_at = now
+            item.updated_at = now
+            changed.append(item)
+
+    with transaction.atomic():
+        model.objects.bulk_update(changed, [*REFRESHED_FIELDS[collection_type], *FETCH_FIELDS], batch_size=500)
+        mark_fetched(model, unchanged + failed if record_failures else unchanged, now)
+        collection_changed.send(sender=model, ids=[item.id for item in changed], action=ChangeLogEntry.Action.UPDATE)
+    return len(changed), len(unchanged), len(failed)
+
+
+def iter_batches(queryset, batch_size):
+    """Yield lists of up to ``batch_size`` rows from ``queryset`` in id order."""
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def refresh_in_batches(collection_type, queryset, batch_size, select=None):
+    """Refresh every row of ``queryset`` from the upstream, ``batch_size`` rows at a time.
+
+    Each batch (narrowed by ``select``, a predicate on rows, when given) goes
+    through ``refresh_batch`` and is saved with ``save_refreshed_batch``.
+    Returns ``(updated, missing)`` counts, where items the upstream reports
+    unchanged count as updated.
+    """
+    updated = missing = 0
+    for rows in iter_batches(queryset, batch_size):
+        batch = [row for row in rows if select(row)] if select else rows
+        if not batch:
+            continue
+        outcomes = refresh_batch(collection_type, batch, bypass_cache=True)
+        changed, unchanged, failed = save_refreshed_batch(collection_type, batch, outcomes)
+        updated += changed + unchanged
+        missing += failed
+    return updated, missing
+
+
+def resync_arxiv_papers(papers, batch_size=ARXIV_BATCH_SIZE):
+    """Refresh many papers using one arXiv API request per ``batch_size`` papers.
+
+    ``papers`` is a queryset; it is walked in id order one batch at a time and
+    each batch is saved with a single ``bulk_update``. Returns
+    ``(updated, missing)`` counts.
+    """
+    return refresh_in_batches("arxiv", papers, batch_size)
+
+
+def resync_twitter_posts(posts, batch_size=TWITTER_BATCH_SIZE, *, placeholders_only=False):
+    """Refresh many posts using one multi-tweet API lookup per ``batch_size`` posts.
+
+    With ``placeholders_only`` only posts still holding placeholder text are
+    looked up, which backfills failed adds without spending quota on the rest.
+    Returns ``(updated, missing)`` counts.
+    """
+    if placeholders_only:
+        posts = posts.filter(text__startswith="Post ", text__endswith="...")
+        return refresh_in_batches("twitter", posts, batch_size, select=TwitterPost.has_placeholder_text)
+    return refresh_in_batches("twitter", posts, batch_size)
+
+
+def refresh_github_repos(repos, batch_size=GITHUB_GRAPHQL_BATCH_SIZE):
+    """Refresh star counts and details for many repositories.
+
+    Uses one GraphQL query per ``batch_size`` repositories when ``GITHUB_TOKEN``
+    is set, falling back to one conditional REST call per repository otherwise
+    (unchanged repositories answer 304, which GitHub does not count against the
+    rate limit, and are not rewritten). Both paths wait out the
+    ``X-RateLimit-*`` window when it is exhausted. Returns ``(updated, missing)``
+    counts.
+    """
+    return refresh_in_batches("github", repos, batch_size)
@@ -0,0 +1,119 @@
+"""Staleness-driven scheduling for ``manage.py refresh_daemon``.
+
+An item is due once its ``last_fetched_at`` is older than its collection's TTL
+(``settings.REFRESH_TTL_HOURS``). Each round reads the stalest due items of
+every collection from the ``(last_fetched_at, id)`` index, scores them and
+pops them off one heap, highest score first, while their provider still has
+budget. Budgets refill continuously at ``REFRESH_BUDGET`` times the
+provider's rate limit from ``settings.HTTP_PROVIDERS`` and cannot build up
+beyond one round's worth, so an idle daemon does not burst when work arrives.
+Budgets count upstream requests: posts, papers and repos are refreshed with
+multi-item lookups (``refresh.refresh_batch``), so one token pays for a whole
+batch of them.
+
+The score is how many TTLs an item is overdue, boosted for items people are
+likely to look at. The app does not record views, so "popular or recently
+viewed" is approximated by GitHub stars (log scale) and by items added
+recently, which are the ones on the first page of every list.
+"""
+
+import heapq
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+
+from .http_client import parse_rate_limit
+from .models import COLLECTION_MODELS
+from .refresh import refresh_batch_size
+
+RECENT = timedelta(days=7)
+RECENT_BOOST = 2.0
+# Due items read per collection and round, as a multiple of what its budget allows
+CANDIDATE_FACTOR = 4
+# Upper bound on due items read per collection and round
+MAX_CANDIDATES = 2000
+
+
+class Budget:
+    """Requests one provider may spend; refills at ``rate`` per second up to ``burst``."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self):
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def ttl(collection_type):
+    return timedelta(hours=settings.REFRESH_TTL_HOURS[collection_type])
+
+
+def provider_budgets(collection_types, interval, share=None):
+    """Return a ``Budget`` per collection type for rounds every ``interval`` seconds."""
+    share = settings.REFRESH_BUDGET if share is None else share
+    budgets = {}
+    for collection_type in collection_types:
+        rate = parse_rate_limit(settings.HTTP_PROVIDERS[collection_type]["rate_limit"])[0] * share
+        budgets[collection_type] = Budget(rate, max(1.0, rate * interval))
+    return budgets
+
+
+def due_items(collection_type, now, limit):
+    """The ``limit`` stalest items of ``collection_type`` whose TTL has run out."""
+    model = COLLECTION_MODELS[collection_type]
+    stale = model.objects.filter(last_fetched_at__lt=now - ttl(collection_type))
+    return list(stale.order_by("last_fetched_at", "id")[:limit])
+
+
+def priority(collection_type, item, now):
+    """Higher for items further past their TTL, recently added items and well-starred repos."""
+    score = (now - item.last_fetched_at) / ttl(collection_type)
+    if now - item.created_at < RECENT:
+        score *= RECENT_BOOST
+    if collection_type == "github":
+        score *= 1 + math.log10(1 + item.stars)
+    return score
+
+
+def plan_round(budgets, now, limit):
+    """Pick ``(collection_type, item)`` pairs to refresh with up to ``limit`` requests, most urgent first.
+
+    The first item of each batch takes a request from its provider's budget;
+    the rest of the batch rides along with it.
+    """
+    batch_sizes = {collection_type: refresh_batch_size(collection_type) for collection_type in budgets}
+    heap = []
+    for collection_type, budget in budgets.items():
+        available = budget.refill()
+        if available < 1:
+            continue
+        candidates = min(available, limit) * batch_sizes[collection_type] * CANDIDATE_FACTOR
+        for item in due_items(collection_type, now, min(candidates, MAX_CANDIDATES)):
+            heapq.heappush(heap, (-priority(collection_type, item, now), collection_type, item.id, item))
+
+    picked = []
+    counts = dict.fromkeys(budgets, 0)
+    requests = 0
+    while heap:
+        _, collection_type, _, item = heapq.heappop(heap)
+        if counts[collection_type] % batch_sizes[collection_type] == 0:
+            if requests >= limit or not budgets[collection_type].take():
+                continue
+            requests += 1
+        counts[collection_type] += 1
+        picked.append((collection_type, item))
+    return picked
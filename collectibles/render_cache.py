@@ -0,0 +1,175 @@
+"""Cached rendering of collection item pages.
+
+Rendering a page of items (SVG icons and a CSRF form per item) costs time
+proportional to the page, even with the precomputed rows from ``rows.py``.
+The rendered HTML of each page is cached under a key built from the
+collection type, the cursor, the page size, the collection's state (newest
+id, item count from ``counts.py`` and ``updated_at`` watermark) and a
+per-collection version marker; the marker is bumped by ``signals.py``
+whenever an item of that type is written, which orphans every cached page of
+the collection at once.
+
+Pages are rendered with a placeholder CSRF token that is swapped for the
+requesting user's token on every response, so cached HTML is never shared
+with a stale or foreign token.
+
+The same state also yields an ``ETag``/``Last-Modified`` pair, so browsers
+revisiting an unchanged page get a 304 before anything is rendered.
+"""
+
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Subquery
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import counts
+from .models import COLLECTION_MODELS, CollectionCount
+from .pagination import keyset_paginate
+from .rows import ROW_FIELDS, item_rows
+
+CSRF_PLACEHOLDER = "__collectibles_csrf_token__"
+PAGE_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(collection_type):
+    return f"collectibles:render-version:{collection_type}"
+
+
+def collection_version(collection_type):
+    """Return the last-modified marker of ``collection_type``'s cached pages."""
+    return cache.get_or_set(_version_key(collection_type), time.time_ns, timeout=None)
+
+
+def invalidate(collection_type):
+    """Drop every cached page of ``collection_type`` by moving its marker on."""
+    cache.set(_version_key(collection_type), time.time_ns(), timeout=None)
+
+
+class CollectionState:
+    """Cheap summary of a collection that changes whenever any of its rows do."""
+
+    def __init__(self, max_id, count, last_modified):
+        self.max_id = max_id or 0
+        self.count = count
+        self.last_modified = last_modified
+
+    @property
+    def token(self):
+        updated = self.last_modified.timestamp() if self.last_modified else 0
+        return f"{self.max_id}.{self.count}.{updated}"
+
+
+def collection_state(collection_type):
+    """Read the newest id, the item count and the newest ``updated_at`` in one query.
+
+    The count comes from the ``collection_counts`` row and the other two from
+    index lookups, so the cost does not grow with the table.
+    """
+    state = _state_query(collection_type).first()
+    if state is None:
+        counts.recount(collection_type)
+        return collection_state(collection_type)
+    return CollectionState(**state)
+
+
+async def acollection_state(collection_type):
+    """Async ``collection_state``."""
+    state = await _state_query(collection_type).afirst()
+    if state is None:
+        await sync_to_async(counts.recount)(collection_type)
+        return await acollection_state(collection_type)
+    return CollectionState(**state)
+
+
+def _state_query(collection_type):
+    model = COLLECTION_MODELS[collection_type]
+    return (
+        CollectionCount.objects.filter(collection_type=collection_type)
+        .values("count")
+        .annotate(
+            max_id=Subquery(model.objects.order_by("-id").values("id")[:1]),
+            last_modified=Subquery(model.objects.order_by("-updated_at", "-id").values("updated_at")[:1]),
+        )
+    )
+
+
+def page_etag(request, collection_type, state):
+    """ETag for the page ``request`` asks for, given the collection's ``state``.
+
+    The query string selects the page, and the CSRF cookie is included because
+    the page embeds a token derived from it.
+    """
+    parts = (
+        collection_type,
+        state.token,
+        request.GET.urlencode(),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+    )
+    return '"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+def render_page(request, collection_type, *, after=None, before=None, page_size, state=None):
+    """Return the rendered items and cursors for one page of a collection.
+
+    The result is a dict with ``items_html`` (CSRF token already filled in for
+    ``request``), ``next_cursor``, ``prev_cursor`` and ``total_count``. Pass the
+    ``state`` from ``collection_state`` if the caller already has it.
+    """
+    state = state or collection_state(collection_type)
+    key = _page_key(collection_type, collection_version(collection_type), state, after, before, page_size)
+    page = cache.get(key)
+    if page is None:
+        page = _build_page(collection_type, state, after, before, page_size)
+        cache.set(key, page, PAGE_TIMEOUT)
+    return _with_csrf_token(request, page)
+
+
+async def arender_page(request, collection_type, *, after=None, before=None, page_size, state=None):
+    """Async ``render_page``; only a cache miss is rendered, in a worker thread."""
+    state = state or await acollection_state(collection_type)
+    version = await cache.aget_or_set(_version_key(collection_type), time.time_ns, timeout=None)
+    key = _page_key(collection_type, version, state, after, before, page_size)
+    page = await cache.aget(key)
+    if page is None:
+        page = await sync_to_async(_build_page)(collection_type, state, after, before, page_size)
+        await cache.aset(key, page, PAGE_TIMEOUT)
+    return _with_csrf_token(request, page)
+
+
+def _page_key(collection_type, version, state, after, before, page_size):
+    parts = ("collectibles:page", collection_type, version, state.token, after or "", before or "", page_size)
+    return ":".join(str(part) for part in parts)
+
+
+def _build_page(collection_type, state, after, before, page_size):
+    rows = COLLECTION_MODELS[collection_type].objects.values(*ROW_FIELDS[collection_type])
+    keyset_page = keyset_paginate(rows, after=after, before=before, page_size=page_size)
+    items_html = ""
+    if keyset_page.items:
+        items_html = render_to_string(
+            f"collectibles/items/{collection_type}.html",
+            {
+                "collection_type": collection_type,
+                "items": item_rows(collection_type, keyset_page.items),
+                "selectable": True,
+                "csrf_token": CSRF_PLACEHOLDER,
+            },
+        )
+    return {
+        "items_html": items_html,
+        "next_cursor": keyset_page.next_cursor,
+        "prev_cursor": keyset_page.prev_cursor,
+        "total_count": state.count,
+    }
+
+
+def _with_csrf_token(request, page):
+    # The cached HTML was rendered by our own templates, so it is still safe after the swap
+    items_html = mark_safe(page["items_html"].replace(CSRF_PLACEHOLDER, get_token(request)))
+    return {**page, "items_html": items_html}
@@ -0,0 +1,203 @@
+"""Disk-backed cache of parsed upstream metadata, shared by every process on a host.
+
+Fetchers look an item up here by provider and canonical id (video id, post
+id, arXiv id, lowercased ``owner/repo``, normalized URL) before going to the
+network, so re-adding a deleted item, re-importing a list or two workers
+racing on the same import cost no upstream requests. Entries are:
+
+* stored with a per-provider TTL (``settings.RESPONSE_CACHE_TTLS``), along
+  with the HTTP validators of the response, which are handed to the caller on
+  a hit so later refreshes can still be conditional;
+* negative for items the upstream reported as not found (404), kept for
+  ``RESPONSE_CACHE_NEGATIVE_TTL`` so typos and deleted items are not
+  re-fetched on every retry;
+* evicted least recently used first once the cache outgrows
+  ``RESPONSE_CACHE_MAX_MB``.
+
+Only adds and imports read the cache. Resyncs and scheduled refreshes pass
+``bypass_cache=True`` and always reach the upstream (conditionally when they
+have the item's validators), though the fresh result is written back. Hits, misses and
+negative hits are counted per provider for ``manage.py response_cache``.
+
+The cache is a standalone SQLite file (``RESPONSE_CACHE_PATH``; empty
+disables it) with one connection per thread, so it works the same whichever
+database the app itself uses.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+MISS = object()
+# Stores between checks of the total size
+EVICT_CHECK_EVERY = 50
+# Eviction trims the cache to this share of the limit, so it does not run on every store
+EVICT_TARGET = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    negative INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (provider, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_idx ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    provider TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    negative_hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_local = threading.local()
+_stores = 0
+_stores_lock = threading.Lock()
+
+
+def enabled():
+    return bool(settings.RESPONSE_CACHE_PATH)
+
+
+def _connection():
+    path = settings.RESPONSE_CACHE_PATH
+    connection = getattr(_local, "connection", None)
+    if connection is None or _local.path != path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        _local.connection = connection
+        _local.path = path
+    return connection
+
+
+def _count(connection, provider, column):
+    connection.execute(
+        f"INSERT INTO stats (provider, {column}) VALUES (?, 1) "
+        f"ON CONFLICT (provider) DO UPDATE SET {column} = {column} + 1",
+        [provider],
+    )
+
+
+def lookup(provider, key, validators=None, *, bypass_cache=False):
+    """Return the cached result for ``key``, ``None`` if it is cached as not found, or ``MISS``.
+
+    Callers refreshing an item (``bypass_cache``) always get ``MISS``. On a
+    hit the validators of the cached response are copied into ``validators``
+    when it is a dict.
+    """
+    if not enabled() or bypass_cache:
+        return MISS
+    try:
+        connection = _connection()
+        row = connection.execute(
+            "SELECT payload, negative FROM entries WHERE provider = ? AND key = ? AND expires_at > ?",
+            [provider, key, time.time()],
+        ).fetchone()
+        if row is None:
+            _count(connection, provider, "misses")
+            return MISS
+        connection.execute(
+            "UPDATE entries SET accessed_at = ? WHERE provider = ? AND key = ?", [time.time(), provider, key]
+        )
+        _count(connection, provider, "negative_hits" if row[1] else "hits")
+    except sqlite3.Error as exc:
+        print(f"⚠️ Response cache unavailable: {exc}")
+        return MISS
+
+    payload = json.loads(row[0])
+    if validators is not None:
+        validators.update(payload["validators"])
+    return payload["value"]
+
+
+def store(provider, key, value, validators=None):
+    """Cache ``value`` (JSON-serializable) as the current upstream result for ``key``."""
+    _write(provider, key, {"value": value, "validators": validators or {}}, settings.RESPONSE_CACHE_TTLS[provider])
+
+
+def store_missing(provider, key):
+    """Cache that the upstream has no item ``key`` (a 404)."""
+    _write(provider, key, {"value": None, "validators": {}}, settings.RESPONSE_CACHE_NEGATIVE_TTL, negative=True)
+
+
+def _write(provider, key, payload, ttl, *, negative=False):
+    global _stores
+    if not enabled():
+        return
+    data = json.dumps(payload)
+    now = time.time()
+    try:
+        connection = _connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (provider, key, payload, negative, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [provider, key, data, int(negative), len(data) + len(key), now + ttl, now],
+        )
+        with _stores_lock:
+            _stores += 1
+            check = _stores % EVICT_CHECK_EVERY == 0
+        if check:
+            evict(connection)
+    except sqlite3.Error as exc:
+        print(f"⚠️ Response cache unavailable: {exc}")
+
+
+def evict(connection=None):
+    """Drop expired entries, then the least recently used ones until the cache fits its limit.
+
+    Returns the number of entries removed.
+    """
+    connection = connection or _connection()
+    removed = connection.execute("DELETE FROM entries WHERE expires_at <= ?", [time.time()]).rowcount
+    limit = settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= limit:
+        return removed
+
+    excess = total - limit * EVICT_TARGET
+    freed = 0
+    oldest = []
+    for rowid, size in connection.execute("SELECT rowid, size FROM entries ORDER BY accessed_at"):
+        oldest.append((rowid,))
+        freed += size
+        if freed >= excess:
+            break
+    connection.executemany("DELETE FROM entries WHERE rowid = ?", oldest)
+    return removed + len(oldest)
+
+
+def stats():
+    """Per-provider hit/miss counters plus entry counts and sizes."""
+    if not enabled():
+        return {}
+    connection = _connection()
+    result = {}
+    for provider, hits, negative_hits, misses in connection.execute(
+        "SELECT provider, hits, negative_hits, misses FROM stats ORDER BY provider"
+    ):
+        result[provider] = {"hits": hits, "negative_hits": negative_hits, "misses": misses, "entries": 0, "bytes": 0}
+    for provider, entries, size in connection.execute(
+        "SELECT provider, COUNT(*), SUM(size) FROM entries WHERE expires_at > ? GROUP BY provider", [time.time()]
+    ):
+        counters = result.setdefault(provider, {"hits": 0, "negative_hits": 0, "misses": 0})
+        counters.update(entries=entries, bytes=size)
+    return result
+
+
+def clear():
+    """Remove every entry and reset the counters."""
+    if enabled():
+        connection = _connection()
+        connection.execute("DELETE FROM entries")
+        connection.execute("DELETE FROM stats")
@@ -0,0 +1,244 @@
+"""Full-text search across every collection.
+
+On SQLite the ``search_index`` FTS5 table (migration 0007) holds one row per
+item with its type, a title column and a body column. Triggers on the
+collection tables keep it in sync, so ``bulk_create``, ``bulk_update`` and
+queryset ``update()`` are indexed as well as ``save()``. SQLite drops them
+when a migration rebuilds a table, so they are recreated after ``migrate``.
+The index rowid is ``id * 8 + type code``, which maps each hit straight back
+to its row.
+
+Hits are ranked with ``bm25`` (title matches weigh more than body matches).
+
+On PostgreSQL every term is matched with ``ILIKE`` against the search
+columns, which the ``pg_trgm`` GIN indexes of migration 0010 serve, and hits
+are ranked by ``word_similarity`` of the query to the title. Other databases
+fall back to ``icontains`` filters.
+"""
+
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+from .models import COLLECTION_MODELS
+
+SEARCH_PAGE_SIZE = 20
+MAX_QUERY_TERMS = 16
+# bm25 column weights for (kind, title, body)
+RANK_WEIGHTS = (0.0, 10.0, 1.0)
+
+TYPE_CODES = {"youtube": 1, "twitter": 2, "arxiv": 3, "github": 4, "links": 5}
+CODE_TYPES = {code: collection_type for collection_type, code in TYPE_CODES.items()}
+
+# Title and body expressions per collection, mirroring the index triggers
+INDEX_SOURCES = {
+    "youtube": ("title", "''"),
+    "twitter": ("text", "author_name || ' ' || author_handle"),
+    "arxiv": ("title", "authors || ' ' || summary"),
+    "github": ("full_name", "description"),
+    "links": ("title", "description || ' ' || tags"),
+}
+SEARCH_FIELDS = {
+    "youtube": ("title",),
+    "twitter": ("text", "author_name", "author_handle"),
+    "arxiv": ("title", "summary", "authors"),
+    "github": ("full_name", "description"),
+    "links": ("title", "description", "tags"),
+}
+
+TERM_RE = re.compile(r"\w+")
+
+_index_available = None
+
+
+def index_available():
+    """True if the FTS5 ``search_index`` table exists in the default database."""
+    global _index_available
+    if _index_available is None:
+        _index_available = connection.vendor == "sqlite" and "search_index" in connection.introspection.table_names()
+    return _index_available
+
+
+def match_expression(query):
+    """Turn free text into an FTS5 query over the title and body columns.
+
+    Every word must match (the last one as a prefix, for search-as-you-type);
+    FTS5 operators and punctuation in the input are ignored. Returns None when
+    the query has no searchable words.
+    """
+    terms = TERM_RE.findall(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return f"{{title body}} : ({' '.join(quoted)})"
+
+
+class SearchResults:
+    """One page of hits, grouped by collection type in rank order."""
+
+    def __init__(self, hits, page, has_next):
+        self.hits = hits
+        self.page = page
+        self.has_next = has_next
+
+    @property
+    def groups(self):
+        grouped = {}
+        for collection_type, item in self.hits:
+            grouped.setdefault(collection_type, []).append(item)
+        return list(grouped.items())
+
+    def __len__(self):
+        return len(self.hits)
+
+
+def search(query, collection_type=None, page=1, page_size=SEARCH_PAGE_SIZE):
+    """Return a ``SearchResults`` page for ``query``, optionally within one collection type."""
+    offset = (page - 1) * page_size
+    if index_available():
+        keys = _search_index(query, collection_type, offset, page_size + 1)
+    elif connection.vendor == "postgresql":
+        keys = _search_trigram(query, collection_type, offset, page_size + 1)
+    else:
+        keys = _search_fallback(query, collection_type, offset, page_size + 1)
+    has_next = len(keys) > page_size
+    return SearchResults(_load(keys[:page_size]), page, has_next)
+
+
+def _search_index(query, collection_type, offset, limit):
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    if collection_type:
+        expression = f'kind : "{collection_type}" AND {expression}'
+    weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM search_index WHERE search_index MATCH %s "
+            f"ORDER BY bm25(search_index, {weights}) LIMIT %s OFFSET %s",
+            [expression, limit, offset],
+        )
+        return [(CODE_TYPES[rowid % 8], rowid // 8) for (rowid,) in cursor.fetchall()]
+
+
+def _like_pattern(term):
+    # Terms are \w+ runs, so "_" is the only LIKE wildcard they can contain
+    return "%" + term.replace("_", "\\_") + "%"
+
+
+def _search_trigram(query, collection_type, offset, limit):
+    terms = TERM_RE.findall(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    selects, params = [], []
+    for search_type in [collection_type] if collection_type else COLLECTION_MODELS:
+        fields = SEARCH_FIELDS[search_type]
+        title = INDEX_SOURCES[search_type][0]
+        any_field = "(" + " OR ".join(f"{field} ILIKE %s" for field in fields) + ")"
+        selects.append(
+            f"SELECT id, '{search_type}' AS kind, word_similarity(%s, {title}) AS score "
+            f"FROM {COLLECTION_MODELS[search_type]._meta.db_table} WHERE {' AND '.join([any_field] * len(terms))}"
+        )
+        params.append(" ".join(terms))
+        for term in terms:
+            params += [_like_pattern(term)] * len(fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"{' UNION ALL '.join(selects)} ORDER BY score DESC, id DESC LIMIT %s OFFSET %s",
+            [*params, limit, offset],
+        )
+        return [(kind, object_id) for object_id, kind, _score in cursor.fetchall()]
+
+
+def _search_fallback(query, collection_type, offset, limit):
+    terms = TERM_RE.findall(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    keys = []
+    for search_type in [collection_type] if collection_type else COLLECTION_MODELS:
+        fields = SEARCH_FIELDS[search_type]
+        condition = Q()
+        for term in terms:
+            condition &= reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields))
+        ids = COLLECTION_MODELS[search_type].objects.filter(condition).order_by("-id").values_list("id", flat=True)
+        keys += [(search_type, object_id) for object_id in ids[: offset + limit]]
+    return keys[offset : offset + limit]
+
+
+def _load(keys):
+    """Fetch the rows behind ``(collection_type, id)`` keys, keeping their order."""
+    ids_by_type = {}
+    for collection_type, object_id in keys:
+        ids_by_type.setdefault(collection_type, []).append(object_id)
+    rows = {
+        collection_type: COLLECTION_MODELS[collection_type].objects.in_bulk(ids)
+        for collection_type, ids in ids_by_type.items()
+    }
+    # Rows deleted since they were indexed are skipped
+    return [
+        (collection_type, rows[collection_type][object_id])
+        for collection_type, object_id in keys
+        if object_id in rows[collection_type]
+    ]
+
+
+def trigger_statements(collection_type):
+    """Trigger name -> ``CREATE TRIGGER`` statement keeping ``search_index`` in step with one table."""
+    code = TYPE_CODES[collection_type]
+    table = COLLECTION_MODELS[collection_type]._meta.db_table
+    title, body = INDEX_SOURCES[collection_type]
+    insert = (
+        f"INSERT INTO search_index (rowid, kind, title, body) "
+        f"SELECT id * 8 + {code}, '{collection_type}', {title}, {body} FROM {table} WHERE id = new.id;"
+    )
+    delete = f"DELETE FROM search_index WHERE rowid = old.id * 8 + {code};"
+    columns = ", ".join(SEARCH_FIELDS[collection_type])
+    return {
+        f"{table}_search_ai": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"{table}_search_au": f"AFTER UPDATE OF {columns} ON {table} BEGIN {delete} {insert} END",
+        f"{table}_search_ad": f"AFTER DELETE ON {table} BEGIN {delete} END",
+    }
+
+
+def restore_index_triggers(using=DEFAULT_DB_ALIAS):
+    """Recreate any missing index triggers, reindexing if there were some; returns how many.
+
+    SQLite drops a table's triggers when a migration rebuilds the table (as
+    adding or altering a column does), so this runs after every ``migrate``.
+    """
+    db = connections[using]
+    if db.vendor != "sqlite" or "search_index" not in db.introspection.table_names():
+        return 0
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+        missing = {
+            name: statement
+            for collection_type in INDEX_SOURCES
+            for name, statement in trigger_statements(collection_type).items()
+            if name not in existing
+        }
+        for name, statement in missing.items():
+            cursor.execute(f"CREATE TRIGGER {name} {statement}")
+    if missing:
+        rebuild_index(using)
+    return len(missing)
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """Repopulate ``search_index`` from the collection tables; returns the row count."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("DELETE FROM search_index")
+        for collection_type, (title, body) in INDEX_SOURCES.items():
+            table = COLLECTION_MODELS[collection_type]._meta.db_table
+            cursor.execute(
+                f"INSERT INTO search_index (rowid, kind, title, body) "
+                f"SELECT id * 8 + {TYPE_CODES[collection_type]}, '{collection_type}', {title}, {body} FROM {table}"
+            )
+        cursor.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+        cursor.execute("SELECT count(*) FROM search_index")
+        return cursor.fetchone()[0]
@@ -0,0 +1,92 @@
+"""Signal handlers that keep derived data in step with the collection tables.
+
+``post_save``/``post_delete`` cover single-row writes. Bulk writes
+(``bulk_create``, ``bulk_update``, queryset ``update()``) send no model
+signals, so code doing them sends ``collection_changed`` with the model as
+sender instead, passing ``ids`` and ``action`` so the change log and the item
+counters see them too. Queryset ``delete()`` does send ``post_delete`` per
+row, so it needs no extra signal.
+"""
+
+import sys
+
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import Signal, receiver
+
+from . import counts, render_cache, search
+from .models import COLLECTION_MODELS, ChangeLogEntry
+
+collection_changed = Signal()
+
+COLLECTION_TYPES_BY_MODEL = {model: collection_type for collection_type, model in COLLECTION_MODELS.items()}
+
+
+@receiver(collection_changed)
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_rendered_pages(sender, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None:
+        render_cache.invalidate(collection_type)
+
+
+def record_changes(collection_type, ids, action):
+    """Append one change log entry per id."""
+    ChangeLogEntry.objects.bulk_create(
+        [ChangeLogEntry(collection_type=collection_type, object_id=object_id, action=action) for object_id in ids],
+        batch_size=500,
+    )
+
+
+@receiver(post_save)
+def log_saved(sender, instance, created, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None:
+        action = ChangeLogEntry.Action.CREATE if created else ChangeLogEntry.Action.UPDATE
+        record_changes(collection_type, [instance.id], action)
+
+
+@receiver(post_delete)
+def log_deleted(sender, instance, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None:
+        record_changes(collection_type, [instance.id], ChangeLogEntry.Action.DELETE)
+
+
+@receiver(collection_changed)
+def log_bulk_changes(sender, ids=None, action=None, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None and ids and action:
+        record_changes(collection_type, ids, action)
+
+
+@receiver(post_save)
+def count_created(sender, created, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None and created:
+        counts.adjust(collection_type, 1)
+
+
+@receiver(post_delete)
+def count_deleted(sender, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None:
+        counts.adjust(collection_type, -1)
+
+
+@receiver(collection_changed)
+def count_bulk_changes(sender, ids=None, action=None, **_kwargs):
+    collection_type = COLLECTION_TYPES_BY_MODEL.get(sender)
+    if collection_type is not None and ids:
+        if action == ChangeLogEntry.Action.CREATE:
+            counts.adjust(collection_type, len(ids))
+        elif action == ChangeLogEntry.Action.DELETE:
+            counts.adjust(collection_type, -len(ids))
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, verbosity=1, stdout=None, **_kwargs):
+    if sender.name == "collectibles":
+        restored = search.restore_index_triggers(using)
+        if restored and verbosity >= 1:
+            (stdout or sys.stdout).write(f"  Restored {restored} search index trigger(s) and rebuilt the index\n")
@@ -0,0 +1,246 @@
+"""Run at most one upstream fetch per item at a time (single-flight).
+
+Two users adding the same video, or two import workers reaching the same
+repo, would otherwise both call the upstream. Fetchers decorated with
+``coalesced`` share one fetch per ``(provider, key)``:
+
+* within a process, the first caller (the leader) fetches while later callers
+  wait for it and receive a copy of its result and validators;
+* across processes, the leader also holds an exclusive ``flock`` on a lock
+  file under ``settings.FETCH_LOCK_DIR``. A leader in another process waits for
+  it and then finds the result in the shared response cache
+  (``response_cache.py``), so its own fetch never reaches the network.
+
+Each key has its own lock file, which its holder deletes when done, so the
+directory only holds the fetches in progress. Waiting for another process
+gives up after ``LOCK_TIMEOUT`` seconds and fetches anyway. Without ``fcntl``
+(Windows) or with an empty ``FETCH_LOCK_DIR`` only the in-process coalescing
+applies.
+
+Refreshes (``bypass_cache=True``) are not coalesced: they ask whether the
+item changed since their own last fetch.
+
+``acoalesced`` does the same for the async fetchers: callers on one event
+loop await a single task, and the lock file is polled without blocking the
+loop. Sync and async callers in one process only meet through the lock file.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.05
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.validators = {}
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _lock_path(provider, key):
+    """The lock file of ``key``, or None without cross-process locking."""
+    if fcntl is None or not settings.FETCH_LOCK_DIR:
+        return None
+    path = Path(settings.FETCH_LOCK_DIR) / f"{provider}-{hashlib.sha256(key.encode()).hexdigest()[:32]}.lock"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _try_lock(path):
+    """Lock ``path`` without blocking; returns the open lock file, or None while another process holds it."""
+    lock_file = path.open("a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # The previous holder may have deleted the file after we opened it
+        if os.fstat(lock_file.fileno()).st_ino == path.stat().st_ino:
+            return lock_file
+    except (BlockingIOError, FileNotFoundError):
+        pass
+    lock_file.close()
+    return None
+
+
+def _unlock(path, lock_file):
+    # Delete before unlocking, so a waiter never locks a file that is about to disappear unnoticed
+    path.unlink(missing_ok=True)
+    lock_file.close()
+
+
+def _waited_too_long(deadline, provider, key):
+    if time.monotonic() < deadline:
+        return False
+    print(f"⚠️ Timed out waiting for another process to fetch {provider} {key}; fetching anyway")
+    return True
+
+
+@contextmanager
+def _file_lock(provider, key):
+    """Hold the cross-process lock of ``key``, waiting up to ``LOCK_TIMEOUT``."""
+    path = _lock_path(provider, key)
+    lock_file = None
+    if path is not None:
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while (lock_file := _try_lock(path)) is None and not _waited_too_long(deadline, provider, key):
+            time.sleep(LOCK_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        if lock_file is not None:
+            _unlock(path, lock_file)
+
+
+@asynccontextmanager
+async def _afile_lock(provider, key):
+    """``_file_lock`` that waits with ``asyncio.sleep``."""
+    path = _lock_path(provider, key)
+    lock_file = None
+    if path is not None:
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while (lock_file := _try_lock(path)) is None and not _waited_too_long(deadline, provider, key):
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        if lock_file is not None:
+            _unlock(path, lock_file)
+
+
+def run(provider, key, fetch):
+    """Call ``fetch(validators)`` unless a fetch of ``key`` is already running; share its result.
+
+    Returns ``(value, validators)``; every caller gets its own copy.
+    """
+    flight_key = (provider, key)
+    with _flights_lock:
+        flight = _flights.get(flight_key)
+        leader = flight is None
+        if leader:
+            flight = _flights[flight_key] = _Flight()
+
+    if leader:
+        try:
+            with _file_lock(provider, key):
+                flight.value = fetch(flight.validators)
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with _flights_lock:
+                del _flights[flight_key]
+            flight.done.set()
+    else:
+        print(f"⏳ Waiting for a running fetch of {provider} {key}")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+    return copy.deepcopy(flight.value), dict(flight.validators)
+
+
+def coalesced(provider, key):
+    """Decorate a fetcher taking ``validators`` and ``bypass_cache`` so concurrent first fetches share one call.
+
+    ``key`` maps the fetcher's bound arguments (a dict) to the item's canonical id.
+    """
+
+    def decorator(fetch):
+        signature = inspect.signature(fetch)
+
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            validators = bound.arguments["validators"]
+            if bound.arguments["bypass_cache"]:
+                return fetch(*bound.args, **bound.kwargs)
+
+            def leader_fetch(fresh):
+                bound.arguments["validators"] = fresh
+                return fetch(*bound.args, **bound.kwargs)
+
+            value, fetched_validators = run(provider, key(bound.arguments), leader_fetch)
+            if validators is not None:
+                validators.update(fetched_validators)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# (event loop, provider, key) -> task running the fetch
+_async_flights = {}
+
+
+async def _alead(provider, key, fetch):
+    validators = {}
+    async with _afile_lock(provider, key):
+        value = await fetch(validators)
+    return value, validators
+
+
+async def arun(provider, key, fetch):
+    """Async ``run``: await ``fetch(validators)`` unless a fetch of ``key`` is already running.
+
+    The fetch runs as its own task, so a caller that is cancelled (e.g. a
+    client that disconnects) does not cancel it for the others.
+    """
+    flight_key = (asyncio.get_running_loop(), provider, key)
+    task = _async_flights.get(flight_key)
+    if task is None:
+        task = asyncio.create_task(_alead(provider, key, fetch))
+        _async_flights[flight_key] = task
+        task.add_done_callback(lambda _: _async_flights.pop(flight_key, None))
+    else:
+        print(f"⏳ Waiting for a running fetch of {provider} {key}")
+    value, validators = await asyncio.shield(task)
+    return copy.deepcopy(value), dict(validators)
+
+
+def acoalesced(provider, key):
+    """``coalesced`` for async fetchers."""
+
+    def decorator(fetch):
+        signature = inspect.signature(fetch)
+
+        @functools.wraps(fetch)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            validators = bound.arguments["validators"]
+            if bound.arguments["bypass_cache"]:
+                return await fetch(*bound.args, **bound.kwargs)
+
+            async def leader_fetch(fresh):
+                bound.arguments["validators"] = fresh
+                return await fetch(*bound.args, **bound.kwargs)
+
+            value, fetched_validators = await arun(provider, key(bound.arguments), leader_fetch)
+            if validators is not None:
+                validators.update(fetched_validators)
+            return value
+
+        return wrapper
+
+    return decorator
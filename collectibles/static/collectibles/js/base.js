@@ -10,6 +10,9 @@ function setView(view) {
     const videoList = document.getElementById('videoList');
     const cardBtn = document.getElementById('cardViewBtn');
     const listBtn = document.getElementById('listViewBtn');
+    if (!videoList || !cardBtn || !listBtn) {
+        return;
+    }
     const collectionType = videoList.dataset.collectionType;
 
     if (view === 'card') {
@@ -49,9 +52,19 @@ function closeModal() {
     document.getElementById('item_url').value = '';
 }
 
+function openImportModal() {
+    document.getElementById('importModal').classList.add('show');
+}
+
+function closeImportModal() {
+    document.getElementById('importModal').classList.remove('show');
+}
+
 function closeModalOnOutsideClick(event) {
     if (event.target.id === 'addVideoModal') {
         closeModal();
+    } else if (event.target.id === 'importModal') {
+        closeImportModal();
     }
 }
 
@@ -60,6 +73,7 @@ document.addEventListener('keydown', function(e) {
     // Escape key to close modal
     if (e.key === 'Escape') {
         closeModal();
+        closeImportModal();
     }
     // Ctrl/Cmd + K to open modal
     if ((e.ctrlKey || e.metaKey) && e.key === 'k') {
@@ -68,9 +82,94 @@ document.addEventListener('keydown', function(e) {
     }
 });
 
+// Batch actions: show the batch bar while any item is selected
+function selectedItems() {
+    return document.querySelectorAll('.select-item input:checked');
+}
+
+function updateBatchBar() {
+    const bar = document.getElementById('batchForm');
+    if (!bar) {
+        return;
+    }
+    const count = selectedItems().length;
+    document.getElementById('batchCount').textContent = `${count} selected`;
+    bar.classList.toggle('show', count > 0);
+}
+
+function selectAllItems(selected) {
+    document.querySelectorAll('.select-item input').forEach(checkbox => {
+        checkbox.checked = selected;
+    });
+    updateBatchBar();
+}
+
+function confirmBatch(action) {
+    const count = selectedItems().length;
+    return confirm(`${action} ${count} selected item${count === 1 ? '' : 's'}?`);
+}
+
+document.addEventListener('change', function(e) {
+    if (e.target.closest('.select-item')) {
+        updateBatchBar();
+    }
+});
+
+// Infinite scroll: fetch the next page fragment when the sentinel comes into view
+function setupInfiniteScroll() {
+    const sentinel = document.getElementById('loadMoreSentinel');
+    if (!sentinel || !('IntersectionObserver' in window)) {
+        return;
+    }
+
+    // The "Older" link is only a fallback for browsers without JavaScript
+    document.querySelectorAll('.pagination-older').forEach(link => {
+        link.style.display = 'none';
+    });
+
+    let loading = false;
+    const observer = new IntersectionObserver(async function(entries) {
+        const cursor = sentinel.dataset.nextCursor;
+        if (!entries.some(entry => entry.isIntersecting) || loading || !cursor) {
+            return;
+        }
+
+        loading = true;
+        try {
+            const params = new URLSearchParams({after: cursor, page_size: sentinel.dataset.pageSize});
+            const response = await fetch(`${sentinel.dataset.fragmentUrl}?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const videoList = document.getElementById('videoList');
+            videoList.insertAdjacentHTML('beforeend', await response.text());
+            sentinel.dataset.nextCursor = response.headers.get('X-Next-Cursor') || '';
+
+            if (videoList.dataset.collectionType === 'twitter' && typeof twttr !== 'undefined' && twttr.widgets) {
+                twttr.widgets.load(videoList);
+            }
+        } catch (error) {
+            console.error('Failed to load more items:', error);
+        } finally {
+            loading = false;
+        }
+
+        if (sentinel.dataset.nextCursor) {
+            // Re-observe so a sentinel that is still on screen triggers another load
+            observer.unobserve(sentinel);
+            observer.observe(sentinel);
+        } else {
+            observer.disconnect();
+        }
+    }, {rootMargin: '400px'});
+
+    observer.observe(sentinel);
+}
+
 // Auto-dismiss messages after 5 seconds
 document.addEventListener('DOMContentLoaded', function() {
     loadViewPreference();
+    setupInfiniteScroll();
 
     const messages = document.querySelectorAll('.message');
     messages.forEach(message => {
@@ -0,0 +1,147 @@
+"""Incremental sync from the change log.
+
+Every create, update and delete of a collectible appends a ``ChangeLogEntry``
+(see ``signals.py``), whose id is a sequence number. ``GET /sync?after=<seq>``
+returns the changes after ``seq`` together with the current state of each
+changed row, so clients and replicas pull only what they have not seen yet.
+
+Within one page only the latest entry per item is returned. ``data`` is null
+when the row no longer exists; consumers treat that as a delete.
+
+``apply_changes`` is the consumer side, used by ``manage.py replicate_from``.
+"""
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .api import api_fields, error, parse_int
+from .models import COLLECTION_MODELS, ChangeLogEntry, URLHashField
+from .signals import collection_changed
+
+DEFAULT_SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 5000
+
+
+def changes_after(after, limit=DEFAULT_SYNC_PAGE_SIZE):
+    """Return ``(changes, next_after, has_more)`` for log entries after ``after``."""
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=after)
+        .order_by("id")
+        .values_list("id", "collection_type", "object_id", "action")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return [], after, False
+
+    # Keep the latest entry per item, in log order
+    latest = {}
+    for seq, collection_type, object_id, action in entries:
+        latest.pop((collection_type, object_id), None)
+        latest[collection_type, object_id] = (seq, action)
+
+    ids_by_type = {}
+    for collection_type, object_id in latest:
+        ids_by_type.setdefault(collection_type, []).append(object_id)
+    rows = {}
+    for collection_type, ids in ids_by_type.items():
+        model = COLLECTION_MODELS.get(collection_type)
+        if model is None:
+            continue
+        for row in model.objects.filter(id__in=ids).values(*api_fields(model)):
+            rows[collection_type, row["id"]] = row
+
+    changes = [
+        {"seq": seq, "type": key[0], "id": key[1], "action": action, "data": rows.get(key)}
+        for key, (seq, action) in latest.items()
+    ]
+    return changes, entries[-1][0], has_more
+
+
+@require_GET
+def sync_changes(request):
+    after = parse_int(request.GET.get("after", 0))
+    if after is None:
+        return error("after must be a non-negative integer")
+    page_size = min(parse_int(request.GET.get("page_size"), DEFAULT_SYNC_PAGE_SIZE, minimum=1), MAX_SYNC_PAGE_SIZE)
+    changes, next_after, has_more = changes_after(after, page_size)
+    return JsonResponse(
+        {"changes": changes, "next_after": next_after, "has_more": has_more},
+        encoder=DjangoJSONEncoder,
+    )
+
+
+def apply_changes(changes):
+    """Apply a batch of ``/sync`` changes to the local tables, upserting by id.
+
+    Rows are written with ``bulk_create``/``bulk_update`` and removed with one
+    delete per type, all in one transaction. Returns ``(upserted, deleted)``
+    counts.
+    """
+    upserts = {}
+    deletes = {}
+    for change in changes:
+        collection_type = change["type"]
+        if collection_type not in COLLECTION_MODELS:
+            continue
+        data = change.get("data")
+        if change["action"] == ChangeLogEntry.Action.DELETE or data is None:
+            upserts.get(collection_type, {}).pop(change["id"], None)
+            deletes.setdefault(collection_type, set()).add(change["id"])
+        else:
+            deletes.get(collection_type, set()).discard(change["id"])
+            upserts.setdefault(collection_type, {})[change["id"]] = data
+
+    upserted = deleted = 0
+    inserted_models = []
+    with transaction.atomic():
+        for collection_type, rows in upserts.items():
+            model = COLLECTION_MODELS[collection_type]
+            fields = [name for name in api_fields(model) if name != "id"]
+            existing = set(model.objects.filter(id__in=rows).values_list("id", flat=True))
+            items = [model(**{name: row[name] for name in api_fields(model) if name in row}) for row in rows.values()]
+            # Derived lookup columns are not part of the payload; bulk_update skips pre_save
+            hash_fields = [field for field in model._meta.concrete_fields if isinstance(field, URLHashField)]
+            for item in items:
+                for field in hash_fields:
+                    field.refresh_hash(item)
+            fields += [field.name for field in hash_fields]
+            model.objects.bulk_update([item for item in items if item.id in existing], fields, batch_size=500)
+            # New rows keep the source's ids, so later changes to them line up
+            new_items = [item for item in items if item.id not in existing]
+            model.objects.bulk_create(new_items, batch_size=500)
+            if new_items:
+                inserted_models.append(model)
+            # Inserting stamps auto_now/auto_now_add fields with local time; put the source's values back
+            stamped = [
+                field.name
+                for field in model._meta.concrete_fields
+                if (getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)) and field.name in fields
+            ]
+            for item in new_items:
+                for name in stamped:
+                    setattr(item, name, rows[item.id].get(name, getattr(item, name)))
+            if new_items and stamped:
+                model.objects.bulk_update(new_items, stamped, batch_size=500)
+            if existing:
+                collection_changed.send(sender=model, ids=sorted(existing), action=ChangeLogEntry.Action.UPDATE)
+            if len(existing) < len(items):
+                created = sorted(set(rows) - existing)
+                collection_changed.send(sender=model, ids=created, action=ChangeLogEntry.Action.CREATE)
+            upserted += len(items)
+
+        for collection_type, ids in deletes.items():
+            model = COLLECTION_MODELS[collection_type]
+            count = model.objects.filter(id__in=ids).delete()[1].get(model._meta.label, 0)
+            deleted += count
+
+        # Explicit ids do not advance PostgreSQL's id sequences; move them past the copied rows
+        # so local inserts do not collide with them (SQLite always continues from the max id)
+        if inserted_models and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), inserted_models):
+                    cursor.execute(sql)
+    return upserted, deleted
@@ -1,3 +1,359 @@
-from django.test import TestCase
+import json
+import tempfile
+import uuid
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import requests
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import http_client
+from .fetchers import get_video_title
+from .importer import INLINE_FETCH_LIMIT
+from .jobs import enqueue_fetch
+from .models import (
+    COLLECTION_MODELS,
+    DEDUPE_COLUMNS,
+    NATURAL_KEYS,
+    ArxivPaper,
+    ChangeLogEntry,
+    FetchJob,
+    FetchStatus,
+    GithubRepo,
+    Link,
+    TwitterPost,
+    YouTubeVideo,
+    create_unique,
+    duplicates_filter,
+)
+from .pagination import keyset_paginate
+from .refresh import refresh_github_repos, refresh_item, resync_arxiv_papers, resync_twitter_posts
+from .search import search
+from .signals import collection_changed
+from .sync import apply_changes, changes_after
+
+# Collection type -> (fields of a new item, the same item's natural key as a user might type it again)
+DEDUPE_SAMPLES = {
+    "youtube": ({"video_id": "dQw4w9WgXcQ", "title": "Video"}, "dQw4w9WgXcQ"),
+    "twitter": ({"post_id": "1234567890", "text": "Post", "author_name": "A", "author_handle": "a"}, "1234567890"),
+    "arxiv": ({"arxiv_id": "2401.00001", "title": "Paper"}, "2401.00001"),
+    "github": ({"full_name": "Octo/Repo"}, "octo/REPO"),
+    "links": ({"url": "https://example.com/post", "title": "Link"}, "https://example.com/post"),
+}
+
+
+@skipUnless(connection.vendor == "postgresql", "set DATABASE_URL to a PostgreSQL database")
+class PostgresCompatibilityTests(TestCase):
+    """What the app relies on from PostgreSQL: bulk upserts, trigram search and the change log."""
+
+    def setUp(self):
+        self.token = f"zq{uuid.uuid4().hex[:10]}"
+        self.seq = ChangeLogEntry.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        self.samples = {
+            "youtube": {"video_id": self.token[:11], "title": f"Talk about {self.token}"},
+            "twitter": {
+                "post_id": self.token,
+                "text": f"Thread on {self.token}",
+                "author_name": "A",
+                "author_handle": "a",
+            },
+            "arxiv": {"arxiv_id": self.token, "title": f"On {self.token}", "summary": "", "authors": ""},
+            "github": {"full_name": f"octo/{self.token}", "description": f"{self.token} tools"},
+            "links": {"url": f"https://example.com/{self.token}", "title": f"Notes on {self.token}"},
+        }
+        self.created = {}
+        for collection_type, fields in self.samples.items():
+            model = COLLECTION_MODELS[collection_type]
+            model.objects.bulk_create([model(**fields), model(**fields)], ignore_conflicts=True)
+            key_field = NATURAL_KEYS[collection_type]
+            ids = list(model.objects.filter(**{key_field: fields[key_field]}).values_list("id", flat=True))
+            collection_changed.send(sender=model, ids=ids, action=ChangeLogEntry.Action.CREATE)
+            self.created[collection_type] = ids
+
+    def test_bulk_create_ignores_duplicates(self):
+        for collection_type, ids in self.created.items():
+            with self.subTest(collection_type):
+                self.assertEqual(len(ids), 1)
+
+    def test_trigram_indexes_exist(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_indexes WHERE indexdef LIKE %s", ["%gin_trgm_ops%"])
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_search_finds_new_items(self):
+        found = {(collection_type, row.id) for collection_type, row in search(self.token, page_size=50).hits}
+        expected = {(collection_type, ids[0]) for collection_type, ids in self.created.items()}
+        self.assertLessEqual(expected, found)
+
+    def test_search_matches_a_prefix_within_one_collection(self):
+        hits = search(self.token[:-2], "links").hits
+        self.assertEqual({collection_type for collection_type, _ in hits}, {"links"})
+
+    def test_change_log_records_bulk_writes_and_saves(self):
+        link = COLLECTION_MODELS["links"].objects.get(id=self.created["links"][0])
+        link.title = f"Updated notes on {self.token}"
+        link.save()
+
+        changes, next_after, _ = changes_after(self.seq, 100)
+        logged = {(change["type"], change["id"]) for change in changes}
+        self.assertLessEqual({(collection_type, ids[0]) for collection_type, ids in self.created.items()}, logged)
+        self.assertGreater(next_after, self.seq)
+        link_change = next(change for change in changes if change["type"] == "links")
+        self.assertEqual(link_change["data"]["title"], link.title)
+
+    def test_apply_changes_upserts_and_deletes_by_id(self):
+        changes, _, _ = changes_after(self.seq, 100)
+        change = next(change for change in changes if change["type"] == "youtube")
+        model = COLLECTION_MODELS["youtube"]
+
+        upserted, _ = apply_changes([{**change, "data": {**change["data"], "title": "Replicated"}}])
+        self.assertEqual(upserted, 1)
+        self.assertEqual(model.objects.get(id=change["id"]).title, "Replicated")
+
+        _, deleted = apply_changes([{**change, "action": ChangeLogEntry.Action.DELETE}])
+        self.assertEqual(deleted, 1)
+        self.assertFalse(model.objects.filter(id=change["id"]).exists())
+
+    def test_apply_changes_moves_the_id_sequence_past_copied_rows(self):
+        model = COLLECTION_MODELS["youtube"]
+        copied_id = (model.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 10
+        data = {"id": copied_id, "video_id": "copied00001", "title": "Copied"}
+        apply_changes([{"seq": 1, "type": "youtube", "id": copied_id, "action": "create", "data": data}])
+        video, created = create_unique("youtube", video_id="local000001", title="Local")
+        self.assertTrue(created)
+        self.assertGreater(video.id, copied_id)
+
+
+class DedupeQueryTests(TestCase):
+    """Adding an item and checking for duplicates take a fixed number of queries."""
+
+    def test_create_unique_query_count(self):
+        for collection_type, (fields, _) in DEDUPE_SAMPLES.items():
+            # Savepoint, insert, change log entry, item counter, release
+            with self.subTest(collection_type), self.assertNumQueries(5):
+                _, created = create_unique(collection_type, **fields)
+            self.assertTrue(created)
+
+    def test_create_unique_returns_the_existing_item_by_dedupe_column(self):
+        for collection_type, (fields, key) in DEDUPE_SAMPLES.items():
+            with self.subTest(collection_type):
+                original, _ = create_unique(collection_type, **fields)
+                # Savepoint, failing insert, rollback, release, then one lookup of the existing row
+                with CaptureQueriesContext(connection) as queries:
+                    item, created = create_unique(collection_type, **{**fields, NATURAL_KEYS[collection_type]: key})
+                self.assertEqual(len(queries), 5)
+                self.assertFalse(created)
+                self.assertEqual(item.id, original.id)
+                table, column = item._meta.db_table, DEDUPE_COLUMNS[collection_type][0]
+                self.assertIn(f'WHERE "{table}"."{column}" IN', queries[-1]["sql"])
+
+    def test_duplicate_check_is_one_query(self):
+        for collection_type, (fields, key) in DEDUPE_SAMPLES.items():
+            model = COLLECTION_MODELS[collection_type]
+            create_unique(collection_type, **fields)
+            with self.subTest(collection_type), self.assertNumQueries(1):
+                self.assertTrue(model.objects.filter(**duplicates_filter(collection_type, [key])).exists())
+
+    def test_keyset_pages_take_one_query_plus_one_probe(self):
+        model = COLLECTION_MODELS["links"]
+        model.objects.bulk_create([model(url=f"https://example.com/{n}", title=f"Link {n}") for n in range(30)])
+        with self.assertNumQueries(1):
+            first = keyset_paginate(model.objects.all(), page_size=20)
+        # Pages after the first also probe for a previous page
+        with self.assertNumQueries(2):
+            second = keyset_paginate(model.objects.all(), after=first.next_cursor, page_size=20)
+        self.assertEqual(len(first) + len(second), 30)
+        self.assertIsNone(second.next_cursor)
+
+
+@skipUnless(connection.vendor == "sqlite", "asserts on SQLite query plans")
+class QueryPlanTests(TestCase):
+    """Duplicate checks and list pages are index lookups, not table scans or sorts."""
+
+    def assert_indexed(self, queryset, detail):
+        plan = queryset.explain()
+        self.assertIn(f"SEARCH {queryset.model._meta.db_table} USING", plan)
+        self.assertIn(detail, plan)
+        self.assertNotIn("SCAN", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_duplicate_check_uses_the_unique_index(self):
+        for collection_type, (_, key) in DEDUPE_SAMPLES.items():
+            column = DEDUPE_COLUMNS[collection_type][0]
+            queryset = COLLECTION_MODELS[collection_type].objects.filter(**duplicates_filter(collection_type, [key]))
+            with self.subTest(collection_type):
+                self.assert_indexed(queryset, f"INDEX sqlite_autoindex_{queryset.model._meta.db_table}_")
+                self.assertIn(f"({column}=?)", queryset.explain())
+
+    def test_keyset_page_walks_the_primary_key(self):
+        for model in COLLECTION_MODELS.values():
+            with self.subTest(model.__name__):
+                self.assert_indexed(model.objects.order_by("-id").filter(id__lt=100)[:20], "INTEGER PRIMARY KEY")
+
+
+def oembed_response(title):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"title": title}).encode()
+    return response
+
+
+class ResponseCacheTests(TestCase):
+    """Adds may be served from the response cache; resyncs always reach the upstream."""
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings = override_settings(RESPONSE_CACHE_PATH=str(Path(cache_dir.name) / "cache.sqlite3"), FETCH_LOCK_DIR="")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.video, _ = create_unique("youtube", video_id="dQw4w9WgXcQ", title="Video")
+
+    def test_resync_bypasses_the_cache(self):
+        with mock.patch("collectibles.http_client.get", return_value=oembed_response("Cached")) as get:
+            self.assertEqual(get_video_title(self.video.video_id, {}), "Cached")
+            self.assertTrue(refresh_item("youtube", self.video))
+            self.assertEqual(get.call_count, 1)
+            get.return_value = oembed_response("Fresh")
+            self.assertTrue(refresh_item("youtube", self.video, bypass_cache=True))
+            self.assertEqual(get.call_count, 2)
+        self.assertEqual(self.video.title, "Fresh")
+
+    def test_resync_turns_a_queued_fetch_into_a_resync(self):
+        enqueue_fetch(self.video)
+        self.assertFalse(FetchJob.objects.get().bypass_cache)
+        enqueue_fetch(self.video, bypass_cache=True)
+        self.assertTrue(FetchJob.objects.get().bypass_cache)
+
+
+@override_settings(RESPONSE_CACHE_PATH="", FETCH_LOCK_DIR="", ASYNC_FETCH=False)
+class ImportEndpointTests(TestCase):
+    """Small uploads are fetched inline, batched per provider; larger ones are queued."""
+
+    def upload(self, lines):
+        return self.client.post(reverse("import_collectibles"), {"import_text": "\n".join(lines)})
+
+    def test_small_upload_fetches_papers_with_one_batch_request(self):
+        papers = [f"2401.{n:05d}" for n in range(1, 6)]
+        metadata = {arxiv_id: {"title": f"Paper {arxiv_id}", "summary": "", "authors": "A"} for arxiv_id in papers}
+        with mock.patch("collectibles.refresh.fetch_arxiv_metadata_batch", return_value=metadata) as fetch:
+            response = self.upload(papers)
+        self.assertEqual(response.status_code, 302)
+        fetch.assert_called_once()
+        self.assertEqual(sorted(fetch.call_args.args[0]), papers)
+        self.assertEqual(
+            set(ArxivPaper.objects.values_list("title", "fetch_status")),
+            {(f"Paper {arxiv_id}", FetchStatus.OK) for arxiv_id in papers},
+        )
+
+    def test_large_upload_queues_fetches(self):
+        videos = [f"https://youtu.be/video{n:06d}" for n in range(INLINE_FETCH_LIMIT + 1)]
+        with mock.patch("collectibles.http_client.get") as get:
+            response = self.upload(videos)
+        self.assertEqual(response.status_code, 302)
+        get.assert_not_called()
+        self.assertEqual(YouTubeVideo.objects.filter(fetch_status=FetchStatus.PENDING).count(), len(videos))
+        self.assertEqual(FetchJob.objects.count(), len(videos))
+
+
+class BatchRefreshTests(TestCase):
+    """The bulk resync helpers refresh through ``refresh_batch`` and save with one ``bulk_update``."""
+
+    def test_refresh_github_repos_fits_long_values_to_the_columns(self):
+        repos = [GithubRepo.objects.create(full_name=f"octo/repo{n}") for n in range(3)]
+        results = {
+            repo.full_name: {
+                "full_name": repo.full_name,
+                "description": "Tools",
+                "stars": 7,
+                "language": "L" * 80,
+                "homepage": "https://example.com/" + "a" * 300,
+            }
+            for repo in repos[:2]
+        }
+        with mock.patch("collectibles.refresh.fetch_github_repos_batch", return_value=results) as fetch:
+            self.assertEqual(refresh_github_repos(GithubRepo.objects.all()), (2, 1))
+        fetch.assert_called_once()
+        repo = GithubRepo.objects.get(id=repos[0].id)
+        self.assertEqual((repo.stars, len(repo.language), len(repo.homepage)), (7, 50, 200))
+        self.assertEqual(GithubRepo.objects.get(id=repos[2].id).stars, 0)
+
+    def test_resync_arxiv_papers_skips_writing_unchanged_papers(self):
+        papers = [ArxivPaper.objects.create(arxiv_id=f"2401.0000{n}", title=f"Paper {n}") for n in range(3)]
+        metadata = {paper.arxiv_id: {"title": paper.title, "summary": "", "authors": ""} for paper in papers}
+        metadata[papers[0].arxiv_id] = {"title": "Revised", "summary": "S", "authors": "A"}
+        seq = ChangeLogEntry.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        with mock.patch("collectibles.refresh.fetch_arxiv_metadata_batch", return_value=metadata) as fetch:
+            self.assertEqual(resync_arxiv_papers(ArxivPaper.objects.all()), (3, 0))
+        fetch.assert_called_once()
+        self.assertEqual(ArxivPaper.objects.get(id=papers[0].id).title, "Revised")
+        changed = ChangeLogEntry.objects.filter(id__gt=seq).values_list("object_id", flat=True)
+        self.assertEqual(list(changed), [papers[0].id])
+
+    def test_resync_twitter_posts_backfills_placeholders_only(self):
+        posts = [
+            TwitterPost.objects.create(
+                post_id=post_id, author_handle="a", author_name="a", text=TwitterPost.placeholder_text(post_id)
+            )
+            for post_id in ("101", "102")
+        ]
+        TwitterPost.objects.filter(id=posts[1].id).update(text="Fetched already")
+
+        def lookup(batch, *_args, **_kwargs):
+            return {post_id: {"author_name": "Ada", "text": f"Post text {post_id}"} for post_id in batch}
+
+        with mock.patch("collectibles.refresh.get_tweet_info_batch", side_effect=lookup) as fetch:
+            self.assertEqual(resync_twitter_posts(TwitterPost.objects.all(), placeholders_only=True), (1, 0))
+        self.assertEqual(list(fetch.call_args.args[0]), ["101"])
+        self.assertEqual(TwitterPost.objects.get(id=posts[0].id).text, "Post text 101")
+        self.assertEqual(TwitterPost.objects.get(id=posts[1].id).text, "Fetched already")
+
+
+class InteractiveRateLimitTests(TestCase):
+    """Inside ``http_client.max_wait`` requests fail fast instead of sleeping out a rate limit."""
+
+    def test_request_over_the_limit_raises_without_waiting(self):
+        provider = http_client.Provider("arxiv", {"label": "arXiv", "rate_limit": "1/60", "concurrency": 1}, 0)
+        ok = mock.Mock(status_code=200)
+        with mock.patch.object(provider.session, "request", return_value=ok) as send:
+            self.assertIs(provider.request("GET", "https://export.arxiv.org/api/query"), ok)
+            with http_client.max_wait(1) as limit, self.assertRaises(http_client.RateLimited):
+                provider.request("GET", "https://export.arxiv.org/api/query")
+        send.assert_called_once()
+        self.assertGreater(limit.refused.retry_after, 50)
+        self.assertIn("arXiv rate limit reached", str(limit.refused))
+
+    @override_settings(RESPONSE_CACHE_PATH="", FETCH_LOCK_DIR="", ASYNC_FETCH=False, HTTP_INTERACTIVE_MAX_WAIT=1)
+    def test_resync_view_tells_the_user_to_try_later(self):
+        video, _ = create_unique("youtube", video_id="dQw4w9WgXcQ", title="Video")
+        with (
+            mock.patch.object(http_client.TokenBucket, "reserve", return_value=600),
+            mock.patch("requests.Session.request") as send,
+        ):
+            response = self.client.post(reverse("video_resync", args=[video.id]))
+        send.assert_not_called()
+        notes = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertIn("YouTube rate limit reached, try again in 10 min", notes)
+
+
+@override_settings(RESPONSE_CACHE_PATH="", FETCH_LOCK_DIR="", ASYNC_FETCH=False)
+class LinkCanonicalUrlTests(TestCase):
+    """Links are stored under the canonical URL their page declares, so its variants are duplicates."""
+
+    def add(self, url, canonical_url):
+        metadata = {"title": "Post", "description": "", "canonical_url": canonical_url}
+        with mock.patch("collectibles.views.fetch_link_metadata", return_value=metadata):
+            self.client.post(reverse("collections_list", args=["links"]), {"item_url": url})
+
+    def test_variants_of_a_page_are_one_link(self):
+        self.add("https://example.com/post?utm_source=feed", "https://example.com/post")
+        self.add("https://example.com/post?ref=home", "https://example.com/post")
+        self.assertEqual(list(Link.objects.values_list("url", flat=True)), ["https://example.com/post"])
+
+    def test_canonical_url_on_another_host_is_ignored(self):
+        self.add("https://example.com/post", "https://elsewhere.example/post")
+        self.assertEqual(list(Link.objects.values_list("url", flat=True)), ["https://example.com/post"])
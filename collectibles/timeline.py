@@ -0,0 +1,99 @@
+"""Newest-first feed of items from every collection.
+
+Each collection is read with the same keyset query a single-collection page
+uses, ordered by the ``(created_at, id)`` index, and ``heapq.merge`` interleaves
+the five sorted streams. A page therefore reads at most ``page_size + 1`` rows
+per collection however large the tables are or however deep the reader has
+scrolled.
+
+Items are ordered by ``(created_at, collection, id)``, so rows created in the
+same instant still have a total order, and the cursor for the next page is
+the key of the last item shown: ``<created_at µs>-<collection>-<id>``.
+"""
+
+import heapq
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+
+from django.db.models import Q
+
+from .models import COLLECTION_MODELS
+from .pagination import DEFAULT_PAGE_SIZE
+
+# Position of each collection in the tie-break on equal created_at
+TYPE_ORDER = {collection_type: position for position, collection_type in enumerate(COLLECTION_MODELS)}
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+class TimelinePage:
+    """One page of ``(collection_type, item)`` entries, newest first."""
+
+    def __init__(self, entries, next_cursor=None):
+        self.entries = entries
+        self.next_cursor = next_cursor
+
+    @property
+    def runs(self):
+        """Consecutive entries of the same type, as ``(collection_type, items)`` pairs."""
+        runs = []
+        for collection_type, item in self.entries:
+            if runs and runs[-1][0] == collection_type:
+                runs[-1][1].append(item)
+            else:
+                runs.append((collection_type, [item]))
+        return runs
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def _micros(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def sort_key(collection_type, item):
+    return (_micros(item.created_at), TYPE_ORDER[collection_type], item.id)
+
+
+def format_cursor(key):
+    return "-".join(str(part) for part in key)
+
+
+def parse_timeline_cursor(value):
+    """Parse a cursor made by ``format_cursor``; invalid values are ignored."""
+    try:
+        micros, position, item_id = (int(part) for part in str(value).split("-"))
+    except (TypeError, ValueError):
+        return None
+    if position not in TYPE_ORDER.values():
+        return None
+    return micros, position, item_id
+
+
+def _older_than(collection_type, cursor):
+    """Filter for rows of ``collection_type`` that sort after ``cursor`` (i.e. are older)."""
+    micros, position, item_id = cursor
+    created_at = EPOCH + timedelta(microseconds=micros)
+    older = Q(created_at__lt=created_at)
+    own_position = TYPE_ORDER[collection_type]
+    if own_position < position:
+        older |= Q(created_at=created_at)
+    elif own_position == position:
+        older |= Q(created_at=created_at, id__lt=item_id)
+    return older
+
+
+def _stream(collection_type, cursor, limit):
+    queryset = COLLECTION_MODELS[collection_type].objects.order_by("-created_at", "-id")
+    if cursor is not None:
+        queryset = queryset.filter(_older_than(collection_type, cursor))
+    return ((sort_key(collection_type, item), collection_type, item) for item in queryset[:limit])
+
+
+def timeline_page(after=None, page_size=DEFAULT_PAGE_SIZE, collection_types=None):
+    """Return the ``TimelinePage`` of items older than cursor ``after`` (newest first)."""
+    streams = [_stream(collection_type, after, page_size + 1) for collection_type in collection_types or TYPE_ORDER]
+    merged = list(islice(heapq.merge(*streams, key=lambda entry: entry[0], reverse=True), page_size + 1))
+    entries = [(collection_type, item) for _key, collection_type, item in merged[:page_size]]
+    next_cursor = format_cursor(merged[page_size - 1][0]) if len(merged) > page_size else None
+    return TimelinePage(entries, next_cursor)
@@ -1,21 +1,48 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 
-from collectibles import views
+from collectibles import api, sync, views
+
+fetch_views = views
+if settings.ASYNC_VIEWS:
+    # Views that wait on upstream APIs, async under ASGI (see async_views.py)
+    try:
+        from collectibles import async_views as fetch_views
+    except ModuleNotFoundError as exc:
+        if exc.name != "httpx":
+            raise
+        # httpx comes with the asgi extra; without it the sync views serve these pages
+        print("⚠️ ASYNC_VIEWS is on but httpx is not installed (uv sync --extra asgi); using the sync views")
 
 urlpatterns = [
     # Unified collections view
-    path("collections/<str:collection_type>", views.collections_list, name="collections_list"),
+    path("collections/all", views.timeline, name="timeline"),
+    path("collections/<str:collection_type>", fetch_views.collections_list, name="collections_list"),
+    path("collections/<str:collection_type>/items", views.collection_items, name="collection_items"),
+    path("collections/<str:collection_type>/batch", views.batch_action, name="batch_action"),
+    path("search", views.search_collectibles, name="search_collectibles"),
     # Action endpoints
+    path("import", views.import_collectibles, name="import_collectibles"),
     path("video/<int:video_id>/delete", views.video_delete, name="video_delete"),
-    path("video/<int:video_id>/resync", views.video_resync, name="video_resync"),
+    path("video/<int:video_id>/resync", fetch_views.video_resync, name="video_resync"),
     path("post/<int:post_id>/delete", views.twitter_delete, name="twitter_delete"),
-    path("post/<int:post_id>/resync", views.twitter_resync, name="twitter_resync"),
+    path("post/<int:post_id>/resync", fetch_views.twitter_resync, name="twitter_resync"),
     path("paper/<int:paper_id>/delete", views.arxiv_delete, name="arxiv_delete"),
-    path("paper/<int:paper_id>/resync", views.arxiv_resync, name="arxiv_resync"),
+    path("paper/<int:paper_id>/resync", fetch_views.arxiv_resync, name="arxiv_resync"),
     path("repo/<int:repo_id>/delete", views.github_delete, name="github_delete"),
-    path("repo/<int:repo_id>/resync", views.github_resync, name="github_resync"),
+    path("repo/<int:repo_id>/resync", fetch_views.github_resync, name="github_resync"),
     path("link/<int:link_id>/delete", views.link_delete, name="link_delete"),
-    path("link/<int:link_id>/resync", views.link_resync, name="link_resync"),
+    path("link/<int:link_id>/resync", fetch_views.link_resync, name="link_resync"),
+    re_path(
+        r"^export/(?P<collection_type>\w+)\.(?P<fmt>ndjson|csv)(?P<compressed>\.gz)?$",
+        views.export_collection,
+        name="export_collection",
+    ),
+    # JSON API
+    path("api/", api.api_index, name="api_index"),
+    path("api/<str:collection_type>", api.api_collection, name="api_collection"),
+    path("api/<str:collection_type>/<int:item_id>", api.api_item, name="api_item"),
+    path("sync", sync.sync_changes, name="sync_changes"),
     # Legacy redirects (for backward compatibility)
     path("list", views.video_list, name="list"),
     path("xlist", views.twitter_list, name="xlist"),
@@ -1,11 +1,15 @@
-import os
-import re
-import xml.etree.ElementTree as ET
+from functools import wraps
 from urllib.parse import urlparse
 
-import requests
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
 from django.contrib import messages
+from django.http import HttpResponse, HttpResponseNotFound, StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.template.defaultfilters import pluralize
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_POST
 
 COLLECTION_TYPES = ("youtube", "twitter", "arxiv", "github", "links")
 COLLECTION_METADATA = {
@@ -63,13 +67,89 @@ COLLECTION_METADATA = {
 
 COLLECTION_OPTIONS = [{"value": key, "label": meta["option_label"]} for key, meta in COLLECTION_METADATA.items()]
 
-from .models import ArxivPaper, GithubRepo, Link, TwitterPost, YouTubeVideo
+
+from . import http_client
+from .batch import MAX_BATCH_SIZE, delete_items, parse_ids, resync_items
+from .export import CONTENT_TYPES, export_filename, iter_export
+from .fetchers import (
+    canonical_link_url,
+    extract_arxiv_id,
+    extract_github_repo_ref,
+    extract_tweet_id_and_handle,
+    extract_video_id,
+    fetch_arxiv_metadata,
+    fetch_github_repo_info,
+    fetch_link_metadata,
+    get_tweet_info,
+    get_video_title,
+    normalize_link_url,
+)
+from .importer import INLINE_FETCH_LIMIT, import_entries, parse_entries
+from .jobs import enqueue_fetch, enqueue_resyncs
+from .models import (
+    COLLECTION_MODELS,
+    ArxivPaper,
+    FetchStatus,
+    GithubRepo,
+    Link,
+    TwitterPost,
+    YouTubeVideo,
+    create_unique,
+    url_hash,
+)
+from .pagination import parse_cursor, parse_page_size
+from .refresh import (
+    refresh_link,
+    refresh_paper,
+    refresh_post,
+    refresh_repo,
+    refresh_video,
+    repo_fields,
+    save_refreshed,
+)
+from .render_cache import collection_state, page_etag, render_page
+from .rows import item_rows
+from .search import search
+from .timeline import parse_timeline_cursor, timeline_page
+
+
+def interactive_fetch(view):
+    """Let ``view`` wait at most ``HTTP_INTERACTIVE_MAX_WAIT`` seconds for upstream rate limits.
+
+    Fetches that would wait longer fail instead, and the user is told which
+    provider is rate limited and when to try again. Works on sync and async views.
+    """
+
+    def warn(request, limit):
+        if limit.refused is not None:
+            messages.warning(request, str(limit.refused))
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with http_client.max_wait(settings.HTTP_INTERACTIVE_MAX_WAIT) as limit:
+                response = await view(request, *args, **kwargs)
+            warn(request, limit)
+            return response
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with http_client.max_wait(settings.HTTP_INTERACTIVE_MAX_WAIT) as limit:
+            response = view(request, *args, **kwargs)
+        warn(request, limit)
+        return response
+
+    return wrapper
 
 
 def home(request):
     return redirect("collections_list", collection_type="youtube")
 
 
+@interactive_fetch
 def collections_list(request, collection_type="youtube"):
     """Unified view for all collection types."""
     if collection_type not in COLLECTION_TYPES:
@@ -88,25 +168,234 @@ def collections_list(request, collection_type="youtube"):
         if handler:
             return handler(request)
 
-    query_map = {
-        "youtube": YouTubeVideo.objects.order_by("-id"),
-        "twitter": TwitterPost.objects.order_by("-id"),
-        "arxiv": ArxivPaper.objects.order_by("-id"),
-        "github": GithubRepo.objects.order_by("-id"),
-        "links": Link.objects.order_by("-id"),
-    }
-
-    items = query_map.get(collection_type, YouTubeVideo.objects.none())
+    # Pages showing flash messages must not be revalidated into a cached copy
+    state = collection_state(collection_type)
+    etag = None if len(messages.get_messages(request)) else page_etag(request, collection_type, state)
+    if etag:
+        not_modified = get_conditional_response(request, etag=etag, last_modified=state_last_modified(state))
+        if not_modified is not None:
+            return not_modified
+
+    page_size = parse_page_size(request.GET.get("page_size"))
+    page = render_page(
+        request,
+        collection_type,
+        after=parse_cursor(request.GET.get("after")),
+        before=parse_cursor(request.GET.get("before")),
+        page_size=page_size,
+        state=state,
+    )
 
     context = {
         "collection_type": collection_type,
-        "items": items,
+        "items_html": page["items_html"],
+        "total_count": page["total_count"],
+        "next_cursor": page["next_cursor"],
+        "prev_cursor": page["prev_cursor"],
+        "page_size": page_size,
         "collection_types": COLLECTION_TYPES,
         "collection_metadata": COLLECTION_METADATA,
         "collection_options": COLLECTION_OPTIONS,
         "current_meta": COLLECTION_METADATA[collection_type],
     }
-    return render(request, "collectibles/collections_list.html", context)
+    response = render(request, "collectibles/collections_list.html", context)
+    if etag:
+        set_page_validators(response, etag, state)
+    return response
+
+
+def timeline(request):
+    """Newest items from every collection in one feed."""
+    page_size = parse_page_size(request.GET.get("page_size"))
+    page = timeline_page(parse_timeline_cursor(request.GET.get("after")), page_size)
+    runs = [
+        {
+            "collection_type": run_type,
+            "meta": COLLECTION_METADATA[run_type],
+            "item_template": f"collectibles/items/{run_type}.html",
+            "items": item_rows(run_type, items),
+        }
+        for run_type, items in page.runs
+    ]
+    context = {
+        "page": page,
+        "runs": runs,
+        "page_size": page_size,
+        "is_first_page": "after" not in request.GET,
+        "collection_options": COLLECTION_OPTIONS,
+    }
+    return render(request, "collectibles/timeline.html", context)
+
+
+def state_last_modified(state):
+    return int(state.last_modified.timestamp()) if state.last_modified else None
+
+
+def set_page_validators(response, etag, state):
+    """Let the browser cache the page but revalidate it on every visit."""
+    response["ETag"] = etag
+    last_modified = state_last_modified(state)
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+
+
+def collection_items(request, collection_type):
+    """Render one page of items as an HTML fragment for infinite scrolling.
+
+    The cursor for the following page is returned in the ``X-Next-Cursor``
+    header (empty when there are no older items).
+    """
+    if collection_type not in COLLECTION_TYPES:
+        return HttpResponseNotFound()
+
+    state = collection_state(collection_type)
+    etag = page_etag(request, collection_type, state)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=state_last_modified(state))
+    if not_modified is not None:
+        return not_modified
+
+    page = render_page(
+        request,
+        collection_type,
+        after=parse_cursor(request.GET.get("after")),
+        before=parse_cursor(request.GET.get("before")),
+        page_size=parse_page_size(request.GET.get("page_size")),
+        state=state,
+    )
+    response = HttpResponse(page["items_html"])
+    response["X-Next-Cursor"] = page["next_cursor"] or ""
+    set_page_validators(response, etag, state)
+    return response
+
+
+def search_collectibles(request):
+    """Ranked full-text search across all collections, optionally filtered by type."""
+    query = request.GET.get("q", "").strip()
+    collection_type = request.GET.get("type", "")
+    if collection_type not in COLLECTION_TYPES:
+        collection_type = ""
+    try:
+        page = max(1, int(request.GET.get("page", 1)))
+    except ValueError:
+        page = 1
+
+    results = search(query, collection_type or None, page=page) if query else None
+    groups = [
+        {
+            "collection_type": group_type,
+            "meta": COLLECTION_METADATA[group_type],
+            "item_template": f"collectibles/items/{group_type}.html",
+            "items": item_rows(group_type, items),
+        }
+        for group_type, items in (results.groups if results else [])
+    ]
+    context = {
+        "query": query,
+        "collection_type": collection_type,
+        "results": results,
+        "groups": groups,
+        "collection_options": COLLECTION_OPTIONS,
+    }
+    return render(request, "collectibles/search.html", context)
+
+
+def export_collection(request, collection_type, fmt, compressed=None):
+    """Stream a collection (or ``all`` of them) as NDJSON or CSV, optionally gzipped."""
+    if collection_type != "all" and collection_type not in COLLECTION_TYPES:
+        return HttpResponseNotFound()
+
+    compress = bool(compressed)
+    response = StreamingHttpResponse(
+        iter_export(collection_type, fmt, compress=compress),
+        content_type="application/gzip" if compress else f"{CONTENT_TYPES[fmt]}; charset=utf-8",
+    )
+    filename = export_filename(collection_type, fmt, compress=compress)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@require_POST
+@interactive_fetch
+def import_collectibles(request):
+    """Import an uploaded (or pasted) list of mixed URLs into their collections.
+
+    Metadata for small lists is fetched inline; larger ones are saved as
+    placeholders and their fetches queued for ``run_fetch_workers``, so the
+    request does not wait on upstream rate limits.
+    """
+    collection_type = request.POST.get("collection_type", "youtube")
+    if collection_type not in COLLECTION_TYPES:
+        collection_type = "youtube"
+
+    upload = request.FILES.get("import_file")
+    text = upload.read().decode("utf-8-sig", errors="replace") if upload else request.POST.get("import_text", "")
+    if not text.strip():
+        messages.error(request, "Please choose a file or paste some URLs to import")
+        return redirect("collections_list", collection_type=collection_type)
+
+    entries = [entry for entry in parse_entries(text) if entry[0]]
+    result = import_entries(entries, fetch=len(entries) <= INLINE_FETCH_LIMIT)
+    if sum(result.created.values()):
+        messages.success(request, result.summary())
+    else:
+        messages.warning(request, result.summary())
+    return redirect("collections_list", collection_type=collection_type)
+
+
+@require_POST
+@interactive_fetch
+def batch_action(request, collection_type):
+    """Delete or resync the items selected on a collection page.
+
+    Takes ``action`` (``delete`` or ``resync``) and the selected ``ids``,
+    either repeated or comma-separated.
+    """
+    if collection_type not in COLLECTION_TYPES:
+        return HttpResponseNotFound()
+
+    ids = parse_ids(request.POST.getlist("ids"))
+    action = request.POST.get("action")
+    item_label = COLLECTION_METADATA[collection_type]["item_label"]
+    if not ids:
+        messages.error(request, "No items selected")
+    elif len(ids) > MAX_BATCH_SIZE:
+        messages.error(request, f"Select at most {MAX_BATCH_SIZE} items at a time")
+    elif action == "delete":
+        deleted = delete_items(collection_type, ids)
+        messages.success(request, f"Deleted {deleted} {item_label}{pluralize(deleted)}")
+    elif action == "resync" and settings.ASYNC_FETCH:
+        queued = enqueue_resyncs(collection_type, ids)
+        messages.success(request, f"Resync queued for {queued} {item_label}{pluralize(queued)}")
+    elif action == "resync":
+        updated, unchanged, failed = resync_items(collection_type, ids)
+        summary = f"Resynced {updated} {item_label}{pluralize(updated)}"
+        if unchanged:
+            summary += f"; {unchanged} unchanged"
+        if failed:
+            messages.warning(request, f"{summary}; {failed} could not be fetched")
+        else:
+            messages.success(request, summary)
+    else:
+        messages.error(request, "Unknown batch action")
+    return redirect("collections_list", collection_type=collection_type)
+
+
+def already_added(request, collection_type):
+    item_label = COLLECTION_METADATA[collection_type]["item_label"]
+    messages.warning(request, f"This {item_label} is already in your list")
+    return redirect("collections_list", collection_type=collection_type)
+
+
+def queue_placeholder(request, collection_type, **fields):
+    """Save a placeholder item and queue its metadata fetch (``ASYNC_FETCH`` mode)."""
+    item, created = create_unique(collection_type, fetch_status=FetchStatus.PENDING, **fields)
+    if not created:
+        return already_added(request, collection_type)
+    enqueue_fetch(item)
+    item_label = COLLECTION_METADATA[collection_type]["item_label"]
+    messages.success(request, f"Added {item_label} - fetching details in the background")
+    return redirect("collections_list", collection_type=collection_type)
 
 
 def handle_youtube_add(request):
@@ -125,17 +414,21 @@ def handle_youtube_add(request):
 
     # Check if video already exists
     if YouTubeVideo.objects.filter(video_id=video_id).exists():
-        messages.warning(request, "This video is already in your list")
-        return redirect("collections_list", collection_type="youtube")
+        return already_added(request, "youtube")
 
-    # Fetch video title
-    title = get_video_title(video_id)
+    if settings.ASYNC_FETCH:
+        return queue_placeholder(request, "youtube", video_id=video_id, title=video_id)
+
+    # Fetch video title, keeping the response's validators so the first resync is conditional
+    validators = {}
+    title = get_video_title(video_id, validators)
     if not title:
         messages.error(request, "Could not fetch video information")
         return redirect("collections_list", collection_type="youtube")
 
-    # Save video
-    YouTubeVideo.objects.create(video_id=video_id, title=title)
+    # Save video; a concurrent add of the same video may have saved it meanwhile
+    if not create_unique("youtube", video_id=video_id, title=title, http_validators=validators)[1]:
+        return already_added(request, "youtube")
     messages.success(request, f"Added: {title}")
     return redirect("collections_list", collection_type="youtube")
 
@@ -158,29 +451,46 @@ def handle_twitter_add(request):
 
     # Check if post already exists
     if TwitterPost.objects.filter(post_id=post_id).exists():
-        messages.warning(request, "This post is already in your list")
-        return redirect("collections_list", collection_type="twitter")
+        return already_added(request, "twitter")
+
+    if settings.ASYNC_FETCH:
+        return queue_placeholder(
+            request,
+            "twitter",
+            post_id=post_id,
+            author_handle=author_handle,
+            text=TwitterPost.placeholder_text(post_id),
+            author_name=author_handle,
+        )
 
     # Fetch tweet info
-    tweet_info = get_tweet_info(post_id, author_handle)
+    validators = {}
+    tweet_info = get_tweet_info(post_id, author_handle, validators)
 
     # Create post (with or without fetched info)
     if tweet_info:
-        TwitterPost.objects.create(
+        _, created = create_unique(
+            "twitter",
             post_id=post_id,
             author_handle=author_handle,
             text=tweet_info["text"],
             author_name=tweet_info["author_name"],
+            http_validators=validators,
         )
+        if not created:
+            return already_added(request, "twitter")
         messages.success(request, f"Added post from @{author_handle}")
     else:
         # Save with placeholder text
-        TwitterPost.objects.create(
+        _, created = create_unique(
+            "twitter",
             post_id=post_id,
             author_handle=author_handle,
-            text=f"Post {post_id[:10]}...",
+            text=TwitterPost.placeholder_text(post_id),
             author_name=author_handle,
         )
+        if not created:
+            return already_added(request, "twitter")
         messages.warning(
             request,
             f"Added post from @{author_handle} (info fetch failed - post saved with placeholder)",
@@ -203,20 +513,27 @@ def handle_arxiv_add(request):
         return redirect("collections_list", collection_type="arxiv")
 
     if ArxivPaper.objects.filter(arxiv_id=arxiv_id).exists():
-        messages.warning(request, "This paper is already in your list")
-        return redirect("collections_list", collection_type="arxiv")
+        return already_added(request, "arxiv")
+
+    if settings.ASYNC_FETCH:
+        return queue_placeholder(request, "arxiv", arxiv_id=arxiv_id, title=f"arXiv:{arxiv_id}")
 
-    metadata = fetch_arxiv_metadata(arxiv_id)
+    validators = {}
+    metadata = fetch_arxiv_metadata(arxiv_id, validators)
     if not metadata:
         messages.error(request, "Could not fetch arXiv metadata")
         return redirect("collections_list", collection_type="arxiv")
 
-    ArxivPaper.objects.create(
+    _, created = create_unique(
+        "arxiv",
         arxiv_id=arxiv_id,
         title=metadata["title"],
         summary=metadata["summary"],
         authors=metadata["authors"],
+        http_validators=validators,
     )
+    if not created:
+        return already_added(request, "arxiv")
     messages.success(request, f"Added arXiv paper {arxiv_id}")
     return redirect("collections_list", collection_type="arxiv")
 
@@ -235,237 +552,25 @@ def handle_github_add(request):
         return redirect("collections_list", collection_type="github")
 
     full_name = "/".join(repo_ref)
-    if GithubRepo.objects.filter(full_name__iexact=full_name).exists():
-        messages.warning(request, "This repository is already in your list")
-        return redirect("collections_list", collection_type="github")
+    if GithubRepo.objects.filter(full_name_normalized=full_name.lower()).exists():
+        return already_added(request, "github")
+
+    if settings.ASYNC_FETCH:
+        return queue_placeholder(request, "github", full_name=full_name)
 
-    repo_info = fetch_github_repo_info(*repo_ref)
+    validators = {}
+    repo_info = fetch_github_repo_info(*repo_ref, validators)
     if not repo_info:
         messages.error(request, "Could not fetch repository information")
         return redirect("collections_list", collection_type="github")
 
-    GithubRepo.objects.create(
-        full_name=repo_info["full_name"],
-        description=repo_info["description"],
-        stars=repo_info["stars"],
-        language=repo_info["language"],
-        homepage=repo_info["homepage"],
-    )
+    _, created = create_unique("github", http_validators=validators, **repo_fields(repo_info))
+    if not created:
+        return already_added(request, "github")
     messages.success(request, f"Added {repo_info['full_name']}")
     return redirect("collections_list", collection_type="github")
 
 
-def extract_video_id(url):
-    """Extract YouTube video ID from various URL formats."""
-    # Remove whitespace
-    url = url.strip()
-
-    # Pattern for different YouTube URL formats
-    patterns = [
-        r"(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})",
-        r"youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-
-    # If no pattern matches, check if it's just the video ID
-    if re.match(r"^[a-zA-Z0-9_-]{11}$", url):
-        return url
-
-    return None
-
-
-def get_video_title(video_id):
-    """Fetch video title from YouTube using oEmbed API."""
-    try:
-        url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        print(f"Fetching video title from: {url}")
-        response = requests.get(url, timeout=5)
-        print(f"YouTube API Response Status: {response.status_code}")
-        if response.status_code == 200:
-            data = response.json()
-            title = data.get("title")
-            print(f"✓ Successfully fetched video: {title}")
-            return title
-        print(f"YouTube API error: Status {response.status_code}, Response: {response.text}")
-    except requests.exceptions.RequestException as e:
-        print(f"Network error fetching video title: {e}")
-    except Exception as e:
-        print(f"Unexpected error in get_video_title: {e}")
-    return None
-
-
-def extract_arxiv_id(value):
-    """Extract arXiv ID from various link formats."""
-    value = value.strip()
-    print(f"Attempting to extract arXiv ID from: {value}")
-
-    if not value:
-        print("❌ Empty value provided")
-        return None
-
-    # If it's already an ID
-    if re.match(r"^\d{4}\.\d{4,5}(v\d+)?$", value):
-        print(f"✓ Direct arXiv ID detected: {value}")
-        return value
-
-    parsed = urlparse(value)
-    path_segments = [seg for seg in parsed.path.split("/") if seg]
-    print(f"Parsed URL - netloc: {parsed.netloc}, path segments: {path_segments}")
-
-    if (
-        parsed.netloc
-        and "arxiv.org" in parsed.netloc
-        and path_segments
-        and path_segments[0] in {"abs", "pdf"}
-        and len(path_segments) >= 2
-    ):
-        arxiv_id = path_segments[1]
-        if path_segments[0] == "pdf" and arxiv_id.endswith(".pdf"):
-            arxiv_id = arxiv_id[:-4]
-        arxiv_id = arxiv_id.replace(".pdf", "")
-        if re.match(r"^\d{4}\.\d{4,5}(v\d+)?$", arxiv_id):
-            print(f"✓ Extracted arXiv ID from URL: {arxiv_id}")
-            return arxiv_id
-        print(f"❌ Extracted ID '{arxiv_id}' doesn't match arXiv ID format")
-
-    print("❌ Could not extract valid arXiv ID")
-    return None
-
-
-def fetch_arxiv_metadata(arxiv_id):
-    """Fetch metadata for an arXiv paper."""
-    try:
-        # Check if SSL verification should be disabled (for development/proxy issues)
-        verify_ssl = os.getenv("ARXIV_VERIFY_SSL", "true").lower() != "false"
-
-        # Suppress SSL warnings if verification is disabled
-        if not verify_ssl:
-            import urllib3
-
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            print("Warning: SSL verification disabled for arXiv API")
-
-        api_url = f"https://export.arxiv.org/api/query?id_list={arxiv_id}"
-        print(f"Fetching arXiv metadata from: {api_url}")
-        headers = {"User-Agent": "MindTreeLog/1.0 (Django app)"}
-        response = requests.get(api_url, headers=headers, verify=verify_ssl, timeout=10)
-        print(f"arXiv API Response Status: {response.status_code}")
-
-        if response.status_code != 200:
-            print(f"❌ arXiv API error {response.status_code}: {response.text[:200]}")
-            return None
-
-        root = ET.fromstring(response.text)
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        entry = root.find("atom:entry", ns)
-        if entry is None:
-            print("❌ arXiv API returned no entry for this ID")
-            print(f"Response preview: {response.text[:500]}")
-            return None
-
-        title = entry.findtext("atom:title", default="", namespaces=ns).strip()
-        summary = entry.findtext("atom:summary", default="", namespaces=ns).strip()
-        authors = [author.text.strip() for author in entry.findall("atom:author/atom:name", ns) if author.text]
-
-        print(f"✓ Successfully fetched arXiv paper: {title[:80]}...")
-        return {
-            "title": title or f"arXiv:{arxiv_id}",
-            "summary": summary,
-            "authors": ", ".join(authors),
-        }
-    except ET.ParseError as exc:
-        print(f"❌ Failed to parse arXiv XML response: {exc}")
-        if "response" in locals():
-            print(f"Response text: {response.text[:500]}")
-        return None
-    except requests.exceptions.SSLError as exc:
-        print(f"❌ SSL Error: {exc}")
-        print("Try setting ARXIV_VERIFY_SSL=false in .env file (development only)")
-        return None
-    except requests.exceptions.RequestException as exc:
-        print(f"❌ Network error fetching arXiv metadata: {exc}")
-        return None
-    except Exception as exc:
-        print(f"❌ Unexpected error fetching arXiv metadata: {exc}")
-        return None
-
-
-def extract_github_repo_ref(value):
-    """Extract owner and repo from GitHub URLs or refs."""
-    value = value.strip()
-    if not value:
-        return None
-
-    if re.match(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$", value):
-        owner, repo = value.split("/", 1)
-        return owner, repo
-
-    parsed = urlparse(value)
-    if "github.com" in parsed.netloc:
-        parts = [p for p in parsed.path.split("/") if p]
-        if len(parts) >= 2:
-            return parts[0], parts[1]
-    return None
-
-
-def fetch_github_repo_info(owner, repo):
-    """Fetch repository information from GitHub API."""
-    try:
-        # Check if SSL verification should be disabled (for development/proxy issues)
-        verify_ssl = os.getenv("GITHUB_VERIFY_SSL", "true").lower() != "false"
-
-        # Suppress SSL warnings if verification is disabled
-        if not verify_ssl:
-            import urllib3
-
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            print("Warning: SSL verification disabled for GitHub API")
-
-        api_url = f"https://api.github.com/repos/{owner}/{repo}"
-        print(f"Fetching GitHub repo info from: {api_url}")
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "MindTreeLog/1.0",
-        }
-        token = os.getenv("GITHUB_TOKEN")
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-            print("Using GitHub token for authentication")
-        else:
-            print("No GitHub token - using unauthenticated requests (rate limited)")
-
-        response = requests.get(api_url, headers=headers, verify=verify_ssl, timeout=10)
-        print(f"GitHub API Response Status: {response.status_code}")
-
-        if response.status_code != 200:
-            print(f"❌ GitHub API error {response.status_code}: {response.text[:200]}")
-            return None
-
-        data = response.json()
-        print(f"✓ Successfully fetched GitHub repo: {data.get('full_name')}")
-        return {
-            "full_name": data.get("full_name", f"{owner}/{repo}"),
-            "description": data.get("description") or "",
-            "stars": data.get("stargazers_count", 0),
-            "language": data.get("language") or "",
-            "homepage": data.get("homepage") or "",
-        }
-    except requests.exceptions.SSLError as exc:
-        print(f"❌ SSL Error: {exc}")
-        print("Try setting GITHUB_VERIFY_SSL=false in .env file (development only)")
-        return None
-    except requests.exceptions.RequestException as exc:
-        print(f"❌ Network error fetching GitHub repo info: {exc}")
-        return None
-    except Exception as exc:
-        print(f"❌ Unexpected error fetching GitHub repo info: {exc}")
-        return None
-
-
 def video_list(request):
     """Legacy redirect to unified collections view."""
     return redirect("collections_list", collection_type="youtube")
@@ -483,17 +588,16 @@ def video_delete(request, video_id):
     return redirect("collections_list", collection_type="youtube")
 
 
+@interactive_fetch
 def video_resync(request, video_id):
     """Resync YouTube video information from API."""
     try:
         video = YouTubeVideo.objects.get(id=video_id)
-
-        # Fetch fresh title from YouTube
-        title = get_video_title(video.video_id)
-        if title:
-            video.title = title
-            video.save()
-            messages.success(request, f"Resynced: {title}")
+        if settings.ASYNC_FETCH:
+            enqueue_fetch(video, bypass_cache=True)
+            messages.success(request, f"Resync queued: {video.title}")
+        elif save_refreshed(video, refresh_video(video, bypass_cache=True)):
+            messages.success(request, f"Resynced: {video.title}")
         else:
             messages.error(request, "Could not fetch updated video information")
     except YouTubeVideo.DoesNotExist:
@@ -501,125 +605,6 @@ def video_resync(request, video_id):
     return redirect("collections_list", collection_type="youtube")
 
 
-def extract_tweet_id_and_handle(url):
-    """Extract tweet ID and author handle from various X/Twitter URL formats."""
-    # Remove whitespace
-    url = url.strip()
-
-    # Pattern for different X/Twitter URL formats
-    # https://x.com/username/status/1234567890
-    # https://twitter.com/username/status/1234567890
-    patterns = [
-        r"(?:x\.com|twitter\.com)/([a-zA-Z0-9_]+)/status/(\d+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1), match.group(2)  # handle, post_id
-
-    return None
-
-
-def get_tweet_info(post_id, author_handle):
-    """Fetch tweet information from Twitter API v2."""
-    try:
-        # Get bearer token from environment
-        bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
-
-        if not bearer_token:
-            # No API credentials configured, return None
-            return None
-
-        # Check if SSL verification should be disabled (for development/proxy issues)
-        verify_ssl = os.getenv("TWITTER_VERIFY_SSL", "true").lower() != "false"
-
-        # Suppress SSL warnings if verification is disabled
-        if not verify_ssl:
-            import urllib3
-
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            print("Warning: SSL verification disabled for Twitter API")
-
-        # Use requests directly with proper SSL configuration
-        headers = {
-            "Authorization": f"Bearer {bearer_token}",
-            "User-Agent": "MindTreeLog/1.0",
-        }
-
-        url = (
-            f"https://api.twitter.com/2/tweets/{post_id}"
-            f"?tweet.fields=text,author_id"
-            f"&expansions=author_id"
-            f"&user.fields=name,username"
-        )
-
-        # Make request with SSL verification control
-        response = requests.get(url, headers=headers, verify=verify_ssl, timeout=10)
-
-        # Debug logging
-        print(f"Twitter API Response Status: {response.status_code}")
-
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Twitter API Response: {data}")
-
-            # Extract tweet data
-            if "data" in data:
-                tweet = data["data"]
-                text = tweet.get("text", "")
-
-                # Truncate if too long
-                if len(text) > 500:
-                    text = text[:497] + "..."
-
-                # Extract author info from includes
-                author_name = author_handle
-                if "includes" in data and "users" in data["includes"]:
-                    users = data["includes"]["users"]
-                    if users:
-                        author_name = users[0].get("name", author_handle)
-
-                print(f"✅ Successfully fetched tweet: {text[:50]}...")
-                return {"author_name": author_name, "text": text}
-            print(f"⚠️ No 'data' field in response: {data}")
-
-        elif response.status_code == 401:
-            print("❌ Twitter API authentication error: Check your bearer token")
-            try:
-                error_data = response.json()
-                print(f"Error details: {error_data}")
-            except Exception:
-                pass
-        elif response.status_code == 429:
-            print("⚠️ Twitter API rate limit exceeded (Free tier: 1,500 tweets/month)")
-            print("💡 Tip: Posts are still saved with placeholder text. Edit in admin or wait for limit reset.")
-        elif response.status_code == 403:
-            print("❌ Twitter API Forbidden (403): Your app may not have the required permissions")
-            try:
-                error_data = response.json()
-                print(f"Error details: {error_data}")
-            except Exception:
-                pass
-        else:
-            print(f"❌ Twitter API error: Status {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"Error details: {error_data}")
-            except Exception:
-                print(f"Response text: {response.text[:200]}")
-
-    except requests.exceptions.SSLError as e:
-        print(f"SSL Error: {e}")
-        print("Try setting TWITTER_VERIFY_SSL=false in .env file (development only)")
-    except requests.exceptions.RequestException as e:
-        print(f"Network error fetching tweet info: {e}")
-    except Exception as e:
-        print(f"Error fetching tweet info: {e}")
-
-    return None
-
-
 def twitter_list(request):
     """Legacy redirect to unified collections view."""
     return redirect("collections_list", collection_type="twitter")
@@ -637,17 +622,15 @@ def twitter_delete(request, post_id):
     return redirect("collections_list", collection_type="twitter")
 
 
+@interactive_fetch
 def twitter_resync(request, post_id):
     """Resync Twitter post information from API."""
     try:
         post = TwitterPost.objects.get(id=post_id)
-
-        # Fetch fresh data from Twitter
-        post_info = get_tweet_info(post.post_id, post.author_handle)
-        if post_info:
-            post.author_name = post_info["author_name"]
-            post.text = post_info["text"]
-            post.save()
+        if settings.ASYNC_FETCH:
+            enqueue_fetch(post, bypass_cache=True)
+            messages.success(request, f"Resync queued for post from @{post.author_handle}")
+        elif save_refreshed(post, refresh_post(post, bypass_cache=True)):
             messages.success(request, f"Resynced post from @{post.author_handle}")
         else:
             messages.warning(
@@ -671,16 +654,15 @@ def arxiv_delete(request, paper_id):
     return redirect("collections_list", collection_type="arxiv")
 
 
+@interactive_fetch
 def arxiv_resync(request, paper_id):
     """Refresh metadata for an arXiv paper."""
     try:
         paper = ArxivPaper.objects.get(id=paper_id)
-        metadata = fetch_arxiv_metadata(paper.arxiv_id)
-        if metadata:
-            paper.title = metadata["title"]
-            paper.summary = metadata["summary"]
-            paper.authors = metadata["authors"]
-            paper.save()
+        if settings.ASYNC_FETCH:
+            enqueue_fetch(paper, bypass_cache=True)
+            messages.success(request, f"Resync queued for arXiv:{paper.arxiv_id}")
+        elif save_refreshed(paper, refresh_paper(paper, bypass_cache=True)):
             messages.success(request, f"Resynced arXiv:{paper.arxiv_id}")
         else:
             messages.error(request, "Could not fetch arXiv metadata")
@@ -700,117 +682,23 @@ def github_delete(request, repo_id):
     return redirect("collections_list", collection_type="github")
 
 
+@interactive_fetch
 def github_resync(request, repo_id):
     """Refresh metadata for a GitHub repository."""
     try:
         repo = GithubRepo.objects.get(id=repo_id)
-        owner, name = repo.full_name.split("/", 1)
-        repo_info = fetch_github_repo_info(owner, name)
-        if repo_info:
-            repo.description = repo_info["description"]
-            repo.stars = repo_info["stars"]
-            repo.language = repo_info["language"]
-            repo.homepage = repo_info["homepage"]
-            repo.save()
+        if settings.ASYNC_FETCH:
+            enqueue_fetch(repo, bypass_cache=True)
+            messages.success(request, f"Resync queued for {repo.full_name}")
+        elif save_refreshed(repo, refresh_repo(repo, bypass_cache=True)):
             messages.success(request, f"Resynced {repo.full_name}")
         else:
             messages.error(request, "Could not fetch repository info")
-    except (GithubRepo.DoesNotExist, ValueError):
+    except GithubRepo.DoesNotExist:
         messages.error(request, "Repository not found")
     return redirect("collections_list", collection_type="github")
 
 
-def fetch_link_metadata(url):
-    """Fetch metadata (title and description) from a webpage."""
-    try:
-        # Check if SSL verification should be disabled (for development/proxy issues)
-        verify_ssl = os.getenv("LINK_VERIFY_SSL", "true").lower() != "false"
-
-        # Suppress SSL warnings if verification is disabled
-        if not verify_ssl:
-            import urllib3
-
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            print("Warning: SSL verification disabled for link metadata fetching")
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        print(f"Fetching link metadata from: {url}")
-        response = requests.get(url, headers=headers, verify=verify_ssl, timeout=10, allow_redirects=True)
-        print(f"Link metadata Response Status: {response.status_code}")
-
-        if response.status_code != 200:
-            print(f"❌ Link metadata error {response.status_code}")
-            return None
-
-        html = response.text
-
-        # Extract title
-        title_match = re.search(r"<title[^>]*>([^<]+)</title>", html, re.IGNORECASE | re.DOTALL)
-        title = title_match.group(1).strip() if title_match else None
-        if title:
-            # Clean up title (remove extra whitespace, newlines)
-            title = re.sub(r"\s+", " ", title)
-            # Truncate if too long
-            if len(title) > 300:
-                title = title[:297] + "..."
-
-        # Extract meta description
-        description = None
-        meta_desc_match = re.search(
-            r'<meta[^>]*name=["\']description["\'][^>]*content=["\']([^"\']+)["\']',
-            html,
-            re.IGNORECASE,
-        )
-        if meta_desc_match:
-            description = meta_desc_match.group(1).strip()
-        else:
-            # Try Open Graph description
-            og_desc_match = re.search(
-                r'<meta[^>]*property=["\']og:description["\'][^>]*content=["\']([^"\']+)["\']',
-                html,
-                re.IGNORECASE,
-            )
-            if og_desc_match:
-                description = og_desc_match.group(1).strip()
-
-        # If no meta description, try to extract first paragraph
-        if not description:
-            # Look for first <p> tag with substantial content
-            p_match = re.search(r"<p[^>]*>([^<]{50,500})</p>", html, re.IGNORECASE | re.DOTALL)
-            if p_match:
-                description = p_match.group(1).strip()
-                # Remove HTML tags
-                description = re.sub(r"<[^>]+>", "", description)
-                # Clean up whitespace
-                description = re.sub(r"\s+", " ", description)
-                # Truncate
-                if len(description) > 500:
-                    description = description[:497] + "..."
-
-        # If still no title, use URL domain as fallback
-        if not title:
-            parsed = urlparse(url)
-            title = parsed.netloc or url[:50]
-
-        print(f"✓ Successfully fetched link metadata: {title[:50]}...")
-        return {
-            "title": title,
-            "description": description or "",
-        }
-    except requests.exceptions.SSLError as exc:
-        print(f"❌ SSL Error: {exc}")
-        print("Try setting LINK_VERIFY_SSL=false in .env file (development only)")
-        return None
-    except requests.exceptions.RequestException as exc:
-        print(f"❌ Network error fetching link metadata: {exc}")
-        return None
-    except Exception as exc:
-        print(f"❌ Unexpected error fetching link metadata: {exc}")
-        return None
-
-
 def handle_link_add(request):
     """Handle adding a link/bookmark."""
     link_url = request.POST.get("item_url", "").strip()
@@ -819,52 +707,42 @@ def handle_link_add(request):
         messages.error(request, "Please enter a URL")
         return redirect("collections_list", collection_type="links")
 
-    # Validate URL format
-    parsed = urlparse(link_url)
-    if not parsed.scheme or not parsed.netloc:
-        # Try adding https:// if no scheme
-        if not link_url.startswith(("http://", "https://")):
-            link_url = "https://" + link_url
-            parsed = urlparse(link_url)
-            if not parsed.netloc:
-                messages.error(request, "Invalid URL format")
-                return redirect("collections_list", collection_type="links")
-        else:
-            messages.error(request, "Invalid URL format")
-            return redirect("collections_list", collection_type="links")
-
-    # Normalize URL (remove trailing slash, etc.)
-    link_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    if parsed.query:
-        link_url += "?" + parsed.query
-    if parsed.fragment:
-        link_url += "#" + parsed.fragment
+    # Validate and normalize URL format
+    link_url = normalize_link_url(link_url)
+    if not link_url:
+        messages.error(request, "Invalid URL format")
+        return redirect("collections_list", collection_type="links")
 
     # Check if link already exists
-    if Link.objects.filter(url=link_url).exists():
-        messages.warning(request, "This link is already in your list")
-        return redirect("collections_list", collection_type="links")
+    if Link.objects.filter(url_hash=url_hash(link_url)).exists():
+        return already_added(request, "links")
+
+    if settings.ASYNC_FETCH:
+        return queue_placeholder(request, "links", url=link_url, title=urlparse(link_url).netloc or link_url[:50])
 
     # Fetch metadata (optional)
-    metadata = fetch_link_metadata(link_url)
+    validators = {}
+    metadata = fetch_link_metadata(link_url, validators)
 
-    # Create link
+    # Create link, under the page's canonical URL when it declares one
     if metadata:
-        Link.objects.create(
-            url=link_url,
+        _, created = create_unique(
+            "links",
+            url=canonical_link_url(link_url, metadata),
             title=metadata["title"],
             description=metadata["description"],
+            http_validators=validators,
         )
+        if not created:
+            return already_added(request, "links")
         messages.success(request, f"Added: {metadata['title']}")
     else:
         # Save with URL as title if fetch failed
         parsed = urlparse(link_url)
         default_title = parsed.netloc or link_url[:50]
-        Link.objects.create(
-            url=link_url,
-            title=default_title,
-            description="",
-        )
+        _, created = create_unique("links", url=link_url, title=default_title, description="")
+        if not created:
+            return already_added(request, "links")
         messages.warning(
             request,
             f"Added link (metadata fetch failed - saved with default title: {default_title})",
@@ -885,16 +763,16 @@ def link_delete(request, link_id):
     return redirect("collections_list", collection_type="links")
 
 
+@interactive_fetch
 def link_resync(request, link_id):
     """Refresh metadata for a link."""
     try:
         link = Link.objects.get(id=link_id)
-        metadata = fetch_link_metadata(link.url)
-        if metadata:
-            link.title = metadata["title"]
-            link.description = metadata["description"]
-            link.save()
-            messages.success(request, f"Resynced: {metadata['title']}")
+        if settings.ASYNC_FETCH:
+            enqueue_fetch(link, bypass_cache=True)
+            messages.success(request, f"Resync queued: {link.title}")
+        elif save_refreshed(link, refresh_link(link, bypass_cache=True)):
+            messages.success(request, f"Resynced: {link.title}")
         else:
             messages.error(request, "Could not fetch link metadata")
     except Link.DoesNotExist: